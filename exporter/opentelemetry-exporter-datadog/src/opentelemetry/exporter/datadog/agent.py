@@ -0,0 +1,365 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import http.client
+import logging
+import os
+import platform
+import random
+import socket
+import threading
+import time
+import typing
+import weakref
+from urllib.parse import ParseResult, urlparse
+
+from opentelemetry.exporter.datadog.encoder import DatadogTrace
+from opentelemetry.exporter.datadog.version import __version__
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGENT_PORT = 8126
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+def parse_agent_url(agent_url: str) -> ParseResult:
+    """Parse the url of the Datadog Agent, either an HTTP(S) url or the path
+    of a Unix domain socket with the ``unix`` scheme."""
+    url_parsed = urlparse(agent_url)
+    if url_parsed.scheme not in ("http", "https", "unix"):
+        raise ValueError(
+            "Unknown scheme `%s` for agent URL" % url_parsed.scheme
+        )
+    return url_parsed
+
+
+class _UDSHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection to a server listening on a Unix domain socket."""
+
+    def __init__(self, uds_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.uds_path = uds_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.uds_path)
+        self.sock = sock
+
+
+class AgentClient:
+    """Sends traces encoded with ``encoder`` to the trace endpoint of the
+    Datadog Agent at ``agent_url``.
+
+    Args:
+        agent_url: The url of the Datadog Agent
+        encoder: One of the encoders of `opentelemetry.exporter.datadog.encoder`
+        timeout: Timeout in seconds of the requests to the Datadog Agent
+    """
+
+    def __init__(self, agent_url: str, encoder, timeout: float = 2):
+        self.url = parse_agent_url(agent_url)
+        self.encoder = encoder
+        self.timeout = timeout
+        self._headers = {
+            "Content-Type": encoder.content_type,
+            "Datadog-Meta-Lang": "python",
+            "Datadog-Meta-Lang-Version": platform.python_version(),
+            "Datadog-Meta-Lang-Interpreter": platform.python_implementation(),
+            "Datadog-Meta-Tracer-Version": __version__,
+        }
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.url.scheme == "unix":
+            return _UDSHTTPConnection(self.url.path, self.timeout)
+        if self.url.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.url.hostname,
+                self.url.port or DEFAULT_AGENT_PORT,
+                timeout=self.timeout,
+            )
+        return http.client.HTTPConnection(
+            self.url.hostname,
+            self.url.port or DEFAULT_AGENT_PORT,
+            timeout=self.timeout,
+        )
+
+    def send(self, traces: typing.Sequence[DatadogTrace]) -> int:
+        """Encodes and sends traces in a single payload, returning the HTTP
+        status of the response of the Datadog Agent.
+
+        Raises `OSError` or `http.client.HTTPException` if the Datadog Agent
+        cannot be reached.
+        """
+        return self.send_payload(
+            self.encoder.encode_traces(traces), len(traces)
+        )
+
+    def send_payload(self, payload: bytes, trace_count: int) -> int:
+        """Sends a payload of ``trace_count`` encoded traces, returning the
+        HTTP status of the response of the Datadog Agent."""
+        headers = dict(self._headers)
+        headers["X-Datadog-Trace-Count"] = str(trace_count)
+
+        conn = self._connect()
+        try:
+            conn.request("PUT", self.encoder.endpoint, payload, headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+
+
+class TraceSender:
+    """Sends traces to the Datadog Agent from a background thread.
+
+    Traces are appended to a buffer holding at most ``max_queue_size`` traces.
+    The sender thread swaps it with an empty buffer before encoding and sending
+    its content, so producers only wait for the time of an append while a
+    payload is being sent. When the buffer is full, ``drop_policy`` decides
+    whether the oldest traces are dropped, the new traces are dropped, or the
+    producer blocks for up to ``block_timeout_millis`` before dropping them.
+
+    Payloads failing with a connection error or a 408, 429 or 5xx status are
+    retried up to ``max_retries`` times with an exponential backoff starting
+    at ``retry_backoff_millis``, with full jitter.
+    """
+
+    _RETRY_STATUSES = (408, 429)
+
+    def __init__(
+        self,
+        client: AgentClient,
+        max_queue_size: int = 2048,
+        drop_policy: str = DROP_OLDEST,
+        block_timeout_millis: float = 1000,
+        max_retries: int = 3,
+        retry_backoff_millis: float = 100,
+    ):
+        if max_queue_size <= 0:
+            raise ValueError("max_queue_size must be a positive integer.")
+
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(
+                "drop_policy must be one of %s." % ", ".join(DROP_POLICIES)
+            )
+
+        self.client = client
+        self.max_queue_size = max_queue_size
+        self.drop_policy = drop_policy
+        self.block_timeout_millis = block_timeout_millis
+        self.max_retries = max_retries
+        self.retry_backoff_millis = retry_backoff_millis
+
+        self._init_state()
+        self._done = False
+
+        if hasattr(os, "register_at_fork"):
+            weak_reinit = weakref.WeakMethod(self._init_state)
+
+            def after_in_child():
+                reinit = weak_reinit()
+                if reinit is not None:
+                    reinit()
+
+            os.register_at_fork(after_in_child=after_in_child)
+
+    def _init_state(self):
+        """Initializes the queue, locks and statistics of the sender.
+
+        Also called in a child process after a fork, where the sender thread
+        of the parent does not exist and the locks may have been held when
+        forking, so that the child starts its own sender thread on its first
+        traces. Traces queued in the parent are left for the parent to send.
+        """
+        self._lock = threading.Lock()
+        # notified when traces are queued or on shutdown
+        self._not_empty = threading.Condition(self._lock)
+        # notified when the sender thread takes the queued traces
+        self._not_full = threading.Condition(self._lock)
+        # notified when the sender thread is done sending all queued traces
+        self._idle = threading.Condition(self._lock)
+        self._queue = collections.deque()  # type: typing.Deque[DatadogTrace]
+        self._sending = False
+        # interrupts retry backoffs on shutdown
+        self._shutdown_event = threading.Event()
+        self._thread = None  # type: typing.Optional[threading.Thread]
+
+        self._stats = {
+            "queued_traces": 0,
+            "sent_traces": 0,
+            "dropped_traces": 0,
+            "retries": 0,
+            "payloads": 0,
+            "payload_bytes": 0,
+            "last_flush_latency_millis": 0.0,
+        }
+
+    def put(self, traces: typing.Sequence[DatadogTrace]) -> bool:
+        """Queues traces to be sent, returns ``False`` if any of them was
+        dropped because the queue is full."""
+        with self._lock:
+            if self._done:
+                logger.warning("Already shutdown, dropping traces.")
+                self._stats["dropped_traces"] += len(traces)
+                return False
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, daemon=True
+                )
+                self._thread.start()
+
+            queued = True
+            deadline = time.monotonic() + self.block_timeout_millis / 1e3
+            for index, trace in enumerate(traces):
+                if len(self._queue) >= self.max_queue_size:
+                    if self.drop_policy == DROP_OLDEST:
+                        self._queue.popleft()
+                        self._stats["dropped_traces"] += 1
+                        queued = False
+                    elif self.drop_policy == BLOCK:
+                        self._not_full.wait_for(
+                            lambda: len(self._queue) < self.max_queue_size
+                            or self._done,
+                            deadline - time.monotonic(),
+                        )
+
+                    if len(self._queue) >= self.max_queue_size or self._done:
+                        self._stats["dropped_traces"] += len(traces) - index
+                        queued = False
+                        break
+
+                self._queue.append(trace)
+                self._stats["queued_traces"] += 1
+
+            self._not_empty.notify()
+
+        if not queued:
+            logger.warning("Datadog trace queue is full, traces were dropped.")
+        return queued
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                self._not_empty.wait_for(lambda: self._queue or self._done)
+                if not self._queue:
+                    self._idle.notify_all()
+                    return
+                # swap the queue with an empty one so new traces can be
+                # queued while these are being sent
+                traces, self._queue = self._queue, collections.deque()
+                self._sending = True
+                self._not_full.notify_all()
+
+            try:
+                self._send(list(traces))
+            finally:
+                with self._lock:
+                    self._sending = False
+                    if not self._queue:
+                        self._idle.notify_all()
+
+    def _send(self, traces: typing.List[DatadogTrace]) -> None:
+        start = time.monotonic()
+        try:
+            payload = self.client.encoder.encode_traces(traces)
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Failed to encode traces for the Datadog Agent.")
+            self._count("dropped_traces", len(traces))
+            return
+
+        sent = self._send_payload(payload, len(traces))
+
+        with self._lock:
+            if sent:
+                self._stats["sent_traces"] += len(traces)
+                self._stats["payloads"] += 1
+                self._stats["payload_bytes"] += len(payload)
+            else:
+                self._stats["dropped_traces"] += len(traces)
+            self._stats["last_flush_latency_millis"] = (
+                time.monotonic() - start
+            ) * 1e3
+
+    def _send_payload(self, payload: bytes, trace_count: int) -> bool:
+        """Sends a payload, retrying on failures that may be transient.
+        Returns whether the Datadog Agent accepted the payload."""
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                self._count("retries")
+                backoff = self.retry_backoff_millis * 2 ** (attempt - 1)
+                if self._shutdown_event.wait(random.uniform(0, backoff) / 1e3):
+                    break
+
+            try:
+                status = self.client.send_payload(payload, trace_count)
+            except (OSError, http.client.HTTPException) as error:
+                logger.debug("Failed to send traces: %s", error)
+                continue
+
+            if status < 400:
+                return True
+
+            if status not in self._RETRY_STATUSES and status < 500:
+                logger.error(
+                    "Datadog Agent rejected traces with HTTP status %s.",
+                    status,
+                )
+                return False
+
+        logger.error(
+            "Failed to send %s traces to the Datadog Agent at %s.",
+            trace_count,
+            self.client.url.geturl(),
+        )
+        return False
+
+    def _count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += value
+
+    def force_flush(self, timeout_millis: float = 30000) -> bool:
+        """Waits until all queued traces were sent, or dropped after all
+        retries failed."""
+        with self._lock:
+            return self._idle.wait_for(
+                lambda: not self._queue and not self._sending,
+                timeout_millis / 1e3,
+            )
+
+    def shutdown(self, timeout_millis: float = 30000) -> None:
+        with self._lock:
+            self._done = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        thread = self._thread
+        if thread is not None:
+            # let queued traces be sent before interrupting retries
+            thread.join(timeout_millis / 1e3)
+            self._shutdown_event.set()
+            thread.join(timeout_millis / 1e3)
+
+    def stats(self) -> typing.Dict[str, typing.Union[int, float]]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queue_size"] = len(self._queue)
+        return stats
@@ -0,0 +1,103 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Encoders of traces into the msgpack payloads of the Datadog Agent trace API.
+
+Traces are lists of spans, each span being a dictionary with the same keys as
+the ones of ``ddtrace.span.Span.to_dict``.
+"""
+
+import typing
+
+import msgpack
+
+DatadogSpanDict = typing.Dict[str, typing.Any]
+DatadogTrace = typing.List[DatadogSpanDict]
+
+
+class TraceEncoderV04:
+    """Encodes traces for the ``/v0.4/traces`` endpoint, an array of traces
+    where each span is a map."""
+
+    api_version = "v0.4"
+    endpoint = "/v0.4/traces"
+    content_type = "application/msgpack"
+
+    @staticmethod
+    def encode_traces(traces: typing.Sequence[DatadogTrace]) -> bytes:
+        return msgpack.packb(traces, use_bin_type=True)
+
+
+class TraceEncoderV05:
+    """Encodes traces for the ``/v0.5/traces`` endpoint.
+
+    The payload is an array holding a table of all the strings of the payload
+    followed by the array of traces, where each span is an array in which
+    strings are replaced by their index in the string table.
+    """
+
+    api_version = "v0.5"
+    endpoint = "/v0.5/traces"
+    content_type = "application/msgpack"
+
+    @staticmethod
+    def encode_traces(traces: typing.Sequence[DatadogTrace]) -> bytes:
+        # the first string of the table must be the empty string
+        string_table = {"": 0}
+
+        def index(value):
+            if value is None:
+                return 0
+            string_index = string_table.get(value)
+            if string_index is None:
+                string_index = string_table[value] = len(string_table)
+            return string_index
+
+        encoded_traces = [
+            [
+                [
+                    index(span.get("service")),
+                    index(span.get("name")),
+                    index(span.get("resource")),
+                    span["trace_id"],
+                    span["span_id"],
+                    span.get("parent_id") or 0,
+                    span.get("start", 0),
+                    span.get("duration", 0),
+                    span.get("error", 0),
+                    {
+                        index(key): index(value)
+                        for key, value in span.get("meta", {}).items()
+                    },
+                    {
+                        index(key): value
+                        for key, value in span.get("metrics", {}).items()
+                    },
+                    index(span.get("type")),
+                ]
+                for span in trace
+            ]
+            for trace in traces
+        ]
+
+        # dictionaries preserve insertion order so keys are sorted by index
+        return msgpack.packb(
+            [list(string_table), encoded_traces], use_bin_type=True
+        )
+
+
+ENCODERS = {
+    encoder.api_version: encoder
+    for encoder in (TraceEncoderV04, TraceEncoderV05)
+}
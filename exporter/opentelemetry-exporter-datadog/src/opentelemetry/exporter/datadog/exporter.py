@@ -13,14 +13,29 @@
 # limitations under the License.
 
 import logging
+import math
 import os
-from urllib.parse import urlparse
-
+import weakref
+
+from ddtrace.constants import (
+    MANUAL_DROP_KEY,
+    MANUAL_KEEP_KEY,
+    NUMERIC_TAGS,
+    SERVICE_VERSION_KEY,
+    SPAN_MEASURED_KEY,
+)
 from ddtrace.ext import SpanTypes as DatadogSpanTypes
+from ddtrace.ext import net
 from ddtrace.internal.writer import AgentWriter
 from ddtrace.span import Span as DatadogSpan
 
 import opentelemetry.trace as trace_api
+from opentelemetry.exporter.datadog.agent import (
+    DROP_OLDEST,
+    AgentClient,
+    TraceSender,
+    parse_agent_url,
+)
 from opentelemetry.exporter.datadog.constants import (
     DD_ERROR_MSG_TAG_KEY,
     DD_ERROR_STACK_TAG_KEY,
@@ -35,6 +50,7 @@ from opentelemetry.exporter.datadog.constants import (
     SERVICE_NAME_TAG,
     VERSION_KEY,
 )
+from opentelemetry.exporter.datadog.encoder import ENCODERS
 from opentelemetry.sdk.trace import sampling
 from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
 from opentelemetry.semconv.trace import SpanAttributes
@@ -43,6 +59,9 @@ logger = logging.getLogger(__name__)
 
 
 DEFAULT_AGENT_URL = "http://localhost:8126"
+# upper bound on the number of entries of each translation cache, caches are
+# cleared once full
+_MAX_CACHE_SIZE = 256
 _INSTRUMENTATION_SPAN_TYPES = {
     "opentelemetry.instrumentation.aiohttp-client": DatadogSpanTypes.HTTP,
     "opentelemetry.instrumentation.asgi": DatadogSpanTypes.WEB,
@@ -72,10 +91,27 @@ class DatadogSpanExporter(SpanExporter):
         env: Set the application’s environment or use ``DD_ENV`` environment variable
         version: Set the application’s version or use ``DD_VERSION`` environment variable
         tags: A list (formatted as a comma-separated string) of default tags to be added to every span or use ``DD_TAGS`` environment variable
+        api_version: Version of the Datadog Agent trace API, ``v0.4`` or ``v0.5``, spans are encoded to directly instead of being written through a ``ddtrace`` ``AgentWriter``
+        max_queue_size: With ``api_version``, the maximum number of traces waiting to be sent to the Datadog Agent
+        drop_policy: With ``api_version``, what to do with new traces when the queue is full, ``drop_oldest``, ``drop_newest`` or ``block``
+        block_timeout_millis: With the ``block`` drop policy, how long to wait for room in the queue before dropping new traces
+        max_retries: With ``api_version``, the number of times sending a payload is retried on transient failures
+        retry_backoff_millis: With ``api_version``, the initial delay between retries, doubled after each retry and jittered
     """
 
     def __init__(
-        self, agent_url=None, service=None, env=None, version=None, tags=None
+        self,
+        agent_url=None,
+        service=None,
+        env=None,
+        version=None,
+        tags=None,
+        api_version=None,
+        max_queue_size=2048,
+        drop_policy=DROP_OLDEST,
+        block_timeout_millis=1000,
+        max_retries=3,
+        retry_backoff_millis=100,
     ):
         self.agent_url = (
             agent_url
@@ -86,41 +122,147 @@ class DatadogSpanExporter(SpanExporter):
         self.env = env or os.environ.get("DD_ENV")
         self.version = version or os.environ.get("DD_VERSION")
         self.tags = _parse_tags_str(tags or os.environ.get("DD_TAGS"))
+        if api_version is not None and api_version not in ENCODERS:
+            raise ValueError(
+                "Unsupported Datadog Agent API version `%s`" % api_version
+            )
+        self.api_version = api_version
+        self._agent_writer = None
+        self._trace_sender = None
+        if api_version is not None:
+            self._trace_sender = TraceSender(
+                AgentClient(self.agent_url, ENCODERS[api_version]),
+                max_queue_size=max_queue_size,
+                drop_policy=drop_policy,
+                block_timeout_millis=block_timeout_millis,
+                max_retries=max_retries,
+                retry_backoff_millis=retry_backoff_millis,
+            )
+        # resources and instrumentations are shared by most spans so the
+        # values derived from them are cached
+        self._resource_cache = {}
+        self._name_and_type_cache = {}
+
+        if hasattr(os, "register_at_fork"):
+            weak_reinit = weakref.WeakMethod(self._at_fork_reinit)
+
+            def after_in_child():
+                reinit = weak_reinit()
+                if reinit is not None:
+                    reinit()
+
+            os.register_at_fork(after_in_child=after_in_child)
+
+    def _at_fork_reinit(self):
+        # the thread of the agent writer does not survive the fork, a new agent
+        # writer is created for the child process on its first export
         self._agent_writer = None
 
     @property
     def agent_writer(self):
         if self._agent_writer is None:
-            url_parsed = urlparse(self.agent_url)
-            if url_parsed.scheme in ("http", "https"):
+            url_parsed = parse_agent_url(self.agent_url)
+            if url_parsed.scheme == "unix":
+                self._agent_writer = AgentWriter(uds_path=url_parsed.path)
+            else:
                 self._agent_writer = AgentWriter(
                     hostname=url_parsed.hostname,
                     port=url_parsed.port,
                     https=url_parsed.scheme == "https",
                 )
-            elif url_parsed.scheme == "unix":
-                self._agent_writer = AgentWriter(uds_path=url_parsed.path)
-            else:
-                raise ValueError(
-                    "Unknown scheme `%s` for agent URL" % url_parsed.scheme
-                )
         return self._agent_writer
 
     def export(self, spans):
-        datadog_spans = self._translate_to_datadog(spans)
+        """Exports a batch of spans, possibly belonging to several traces.
+
+        The spans are grouped by trace and every trace is written to the agent
+        writer, which sends all buffered traces to the agent in a single
+        payload on its next flush. If ``api_version`` is set, the traces are
+        instead queued to be encoded and sent to the agent in a single payload
+        from a background thread.
+        """
+        if self.api_version is not None:
+            return self._export_encoded(spans)
+
+        traces = {}
+        for datadog_span in self._translate_to_datadog(spans):
+            traces.setdefault(datadog_span.trace_id, []).append(datadog_span)
 
-        self.agent_writer.write(spans=datadog_spans)
+        for datadog_spans in traces.values():
+            self.agent_writer.write(spans=datadog_spans)
 
         return SpanExportResult.SUCCESS
 
+    def _export_encoded(self, spans):
+        traces = {}
+        for datadog_span in self._translate_to_datadog_dicts(spans):
+            traces.setdefault(datadog_span["trace_id"], []).append(
+                datadog_span
+            )
+
+        if not self._trace_sender.put(list(traces.values())):
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis=30000):
+        """Waits until the traces queued with ``api_version`` set are sent."""
+        if self._trace_sender is None:
+            return True
+        return self._trace_sender.force_flush(timeout_millis)
+
+    def stats(self):
+        """Returns counters of the traces queued, sent and dropped, retries,
+        payloads and payload bytes sent, the latency of the last flush and the
+        current queue size, when ``api_version`` is set."""
+        if self._trace_sender is None:
+            return {}
+        return self._trace_sender.stats()
+
     def shutdown(self):
-        if self.agent_writer.started:
+        if self._trace_sender is not None:
+            self._trace_sender.shutdown()
+        if self._agent_writer is not None and self._agent_writer.started:
             self.agent_writer.stop()
             self.agent_writer.join(self.agent_writer.exit_timeout)
 
+    def _get_resource_tags(self, resource):
+        """Returns the tags and service name of a resource, keyed by identity
+        as resources are immutable."""
+        cached = self._resource_cache.get(id(resource))
+        # the resource is kept in the entry so that its id is not reused
+        if cached is None or cached[0] is not resource:
+            if len(self._resource_cache) >= _MAX_CACHE_SIZE:
+                self._resource_cache.clear()
+            cached = (resource, *_extract_tags_from_resource(resource))
+            self._resource_cache[id(resource)] = cached
+        return cached[1], cached[2]
+
+    def _get_span_name_and_type(self, span):
+        """Returns the Datadog span name and type, which only depend on the
+        instrumentation and kind of the span unless there is none."""
+        instrumentation_name = (
+            span.instrumentation_info.name
+            if span.instrumentation_info
+            else None
+        )
+        if not (instrumentation_name and span.kind):
+            return span.name, _get_span_type(span)
+
+        key = (instrumentation_name, span.kind)
+        cached = self._name_and_type_cache.get(key)
+        if cached is None:
+            if len(self._name_and_type_cache) >= _MAX_CACHE_SIZE:
+                self._name_and_type_cache.clear()
+            cached = self._name_and_type_cache[key] = (
+                _get_span_name(span),
+                _get_span_type(span),
+            )
+        return cached
+
     # pylint: disable=too-many-locals
     def _translate_to_datadog(self, spans):
         datadog_spans = []
+        sampler_rate = _get_sampler_rate()
 
         for span in spans:
             trace_id, parent_id, span_id = _get_trace_ids(span)
@@ -132,17 +274,17 @@ class DatadogSpanExporter(SpanExporter):
             tracer = None
 
             # extract resource attributes to be used as tags as well as potential service name
-            [
-                resource_tags,
-                resource_service_name,
-            ] = _extract_tags_from_resource(span.resource)
+            resource_tags, resource_service_name = self._get_resource_tags(
+                span.resource
+            )
+            span_name, span_type = self._get_span_name_and_type(span)
 
             datadog_span = DatadogSpan(
                 tracer,
-                _get_span_name(span),
+                span_name,
                 service=resource_service_name or self.service,
                 resource=_get_resource(span),
-                span_type=_get_span_type(span),
+                span_type=span_type,
                 trace_id=trace_id,
                 span_id=span_id,
                 parent_id=parent_id,
@@ -155,16 +297,14 @@ class DatadogSpanExporter(SpanExporter):
                 # loop over events and look for exception events, extract info.
                 # https://github.com/open-telemetry/opentelemetry-python/blob/71e3a7a192c0fc8a7503fac967ada36a74b79e58/opentelemetry-sdk/src/opentelemetry/sdk/trace/__init__.py#L810-L819
                 if span.events:
-                    _extract_tags_from_exception_events(
-                        span.events, datadog_span
+                    datadog_span.set_tags(
+                        _get_tags_from_exception_events(span.events)
                     )
 
-            # combine resource attributes and span attributes, don't modify existing span attributes
-            combined_span_tags = {}
-            combined_span_tags.update(resource_tags)
-            combined_span_tags.update(span.attributes)
-
-            datadog_span.set_tags(combined_span_tags)
+            # set resource attributes then span attributes so that span
+            # attributes take precedence, without modifying either of them
+            datadog_span.set_tags(resource_tags)
+            datadog_span.set_tags(span.attributes)
 
             # add configured env tag
             if self.env is not None:
@@ -182,9 +322,11 @@ class DatadogSpanExporter(SpanExporter):
             if origin and parent_id == 0:
                 datadog_span.set_tag(DD_ORIGIN, origin)
 
-            sampling_rate = _get_sampling_rate(span)
-            if sampling_rate is not None:
-                datadog_span.set_metric(SAMPLE_RATE_METRIC_KEY, sampling_rate)
+            if (
+                sampler_rate is not None
+                and span.get_span_context().trace_flags.sampled
+            ):
+                datadog_span.set_metric(SAMPLE_RATE_METRIC_KEY, sampler_rate)
 
             # span events and span links are not supported except for extracting exception event context
 
@@ -192,6 +334,129 @@ class DatadogSpanExporter(SpanExporter):
 
         return datadog_spans
 
+    # pylint: disable=too-many-locals
+    def _translate_to_datadog_dicts(self, spans):
+        """Translates spans to dictionaries with the same content as the
+        ``to_dict`` representation of the spans of `_translate_to_datadog`,
+        without creating ``ddtrace`` spans."""
+        datadog_spans = []
+        sampler_rate = _get_sampler_rate()
+
+        for span in spans:
+            trace_id, parent_id, span_id = _get_trace_ids(span)
+            resource_tags, resource_service_name = self._get_resource_tags(
+                span.resource
+            )
+            span_name, span_type = self._get_span_name_and_type(span)
+
+            datadog_span = {
+                "trace_id": trace_id,
+                "parent_id": parent_id,
+                "span_id": span_id,
+                "service": resource_service_name or self.service,
+                "resource": _get_resource(span),
+                "name": span_name,
+                "error": 0,
+                "start": span.start_time,
+                "duration": span.end_time - span.start_time,
+                "meta": {},
+                "metrics": {},
+            }
+            if span_type:
+                datadog_span["type"] = span_type.value
+
+            if not span.status.is_ok:
+                datadog_span["error"] = 1
+                if span.events:
+                    _set_tags(
+                        datadog_span,
+                        _get_tags_from_exception_events(span.events),
+                    )
+
+            _set_tags(datadog_span, resource_tags)
+            _set_tags(datadog_span, span.attributes)
+
+            if self.env is not None:
+                _set_tag(datadog_span, ENV_KEY, self.env)
+
+            if self.version is not None and parent_id == 0:
+                _set_tag(datadog_span, VERSION_KEY, self.version)
+
+            _set_tags(datadog_span, self.tags)
+
+            origin = _get_origin(span)
+            if origin and parent_id == 0:
+                _set_tag(datadog_span, DD_ORIGIN, origin)
+
+            if (
+                sampler_rate is not None
+                and span.get_span_context().trace_flags.sampled
+            ):
+                datadog_span["metrics"][SAMPLE_RATE_METRIC_KEY] = sampler_rate
+
+            if not datadog_span["meta"]:
+                del datadog_span["meta"]
+            if not datadog_span["metrics"]:
+                del datadog_span["metrics"]
+
+            datadog_spans.append(datadog_span)
+
+        return datadog_spans
+
+
+def _set_tags(datadog_span, tags):
+    for key, value in tags.items():
+        _set_tag(datadog_span, key, value)
+
+
+def _set_tag(datadog_span, key, value):
+    """Set a tag on a span dictionary the same way ``ddtrace.span.Span.set_tag``
+    sets it on a ``ddtrace`` span"""
+    meta = datadog_span["meta"]
+    metrics = datadog_span["metrics"]
+
+    # http.status_code has to be in meta for metrics calculated in the agent
+    if key == SpanAttributes.HTTP_STATUS_CODE:
+        value = str(value)
+
+    is_an_int = isinstance(value, int) and not isinstance(value, bool)
+    if key == net.TARGET_PORT and not is_an_int:
+        try:
+            value = int(value)
+            is_an_int = True
+        except (ValueError, TypeError):
+            pass
+
+    if (
+        (is_an_int and abs(value) <= 2 ** 53)
+        or isinstance(value, float)
+        or key in NUMERIC_TAGS
+        or key == SPAN_MEASURED_KEY
+    ):
+        if key == SPAN_MEASURED_KEY:
+            value = 1 if value is None else int(bool(value))
+        elif not isinstance(value, (int, float)):
+            try:
+                value = float(value)
+            except (ValueError, TypeError):
+                return
+        # don't allow nan or inf
+        if not (math.isnan(value) or math.isinf(value)):
+            metrics[key] = value
+            meta.pop(key, None)
+        return
+
+    if key in (MANUAL_KEEP_KEY, MANUAL_DROP_KEY):
+        # sampling decisions are made by the OpenTelemetry sampler
+        return
+    if key == SERVICE_NAME_TAG:
+        datadog_span["service"] = value
+    elif key == SERVICE_VERSION_KEY:
+        _set_tag(datadog_span, VERSION_KEY, value)
+
+    meta[key] = str(value)
+    metrics.pop(key, None)
+
 
 def _get_trace_ids(span):
     """Extract tracer ids from span"""
@@ -266,16 +531,14 @@ def _get_origin(span):
     return origin
 
 
-def _get_sampling_rate(span):
-    ctx = span.get_span_context()
+def _get_sampler_rate():
+    """Get the rate of the tracer provider sampler if it is trace id ratio
+    based"""
     tracer_provider = trace_api.get_tracer_provider()
-    if not hasattr(tracer_provider, "sampler"):
-        return None
-    sampler = tracer_provider.sampler
+    sampler = getattr(tracer_provider, "sampler", None)
     return (
         sampler.rate
-        if ctx.trace_flags.sampled
-        and isinstance(sampler, sampling.TraceIdRatioBased)
+        if isinstance(sampler, sampling.TraceIdRatioBased)
         else None
     )
 
@@ -328,15 +591,17 @@ def _extract_tags_from_resource(resource):
     return [tags, service_name]
 
 
-def _extract_tags_from_exception_events(events, datadog_span):
+def _get_tags_from_exception_events(events):
     """Parse error tags from exception events, error.msg error.type
     and error.stack have special significance within datadog"""
+    tags = {}
     for event in events:
         if event.name is not None and event.name == EVENT_NAME_EXCEPTION:
             for key, value in event.attributes.items():
                 if key == EXCEPTION_TYPE_ATTR_KEY:
-                    datadog_span.set_tag(DD_ERROR_TYPE_TAG_KEY, value)
+                    tags[DD_ERROR_TYPE_TAG_KEY] = value
                 elif key == EXCEPTION_MSG_ATTR_KEY:
-                    datadog_span.set_tag(DD_ERROR_MSG_TAG_KEY, value)
+                    tags[DD_ERROR_MSG_TAG_KEY] = value
                 elif key == EXCEPTION_STACK_ATTR_KEY:
-                    datadog_span.set_tag(DD_ERROR_STACK_TAG_KEY, value)
+                    tags[DD_ERROR_STACK_TAG_KEY] = value
+    return tags
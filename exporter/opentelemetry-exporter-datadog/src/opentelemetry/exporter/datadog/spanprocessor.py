@@ -14,8 +14,10 @@
 
 import collections
 import logging
+import os
 import threading
 import typing
+import weakref
 
 from opentelemetry.context import Context, attach, detach, set_value
 from opentelemetry.instrumentation.utils import _SUPPRESS_INSTRUMENTATION_KEY
@@ -26,6 +28,63 @@ from opentelemetry.util._time import _time_ns
 
 logger = logging.getLogger(__name__)
 
+# number of evicted traces per shard whose spans still in progress are
+# remembered, so that they are dropped when they end
+_MAX_EVICTED_TRACES = 1024
+
+
+class _Trace:
+    """Spans buffered for a single trace along with the number of started and
+    ended spans for that trace.
+    """
+
+    __slots__ = ("spans", "started", "ended", "timestamp", "dropped_span_ids")
+
+    def __init__(self, timestamp: int):
+        # list of spans where the first span is the first opened span for the
+        # trace
+        self.spans = []  # type: typing.List[Span]
+        self.started = 0
+        self.ended = 0
+        # time the trace was first buffered or last partially flushed
+        self.timestamp = timestamp
+        # ids of spans that were not buffered because of the buffer limits
+        self.dropped_span_ids = None  # type: typing.Optional[typing.Set[int]]
+
+    def is_exportable(self) -> bool:
+        return self.started - self.ended <= 0
+
+
+class _TraceShard:
+    """A partition of the buffered traces guarded by its own lock."""
+
+    __slots__ = (
+        "lock",
+        "traces",
+        "evicted_traces",
+        "span_count",
+        "dropped_spans",
+        "dropped_traces",
+        "partial_flushed_traces",
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # dictionary of trace_ids to the buffered trace, ordered from the least
+        # to the most recently used trace
+        self.traces = (
+            collections.OrderedDict()
+        )  # type: typing.Dict[int, _Trace]
+        # dictionary of the trace_ids of the recently evicted traces to their
+        # number of spans in progress, ordered from the least recently evicted
+        self.evicted_traces = (
+            collections.OrderedDict()
+        )  # type: typing.Dict[int, int]
+        self.span_count = 0
+        self.dropped_spans = 0
+        self.dropped_traces = 0
+        self.partial_flushed_traces = 0
+
 
 class DatadogExportSpanProcessor(SpanProcessor):
     """Datadog exporter span processor
@@ -34,6 +93,19 @@ class DatadogExportSpanProcessor(SpanProcessor):
     batches all opened spans into a list per trace. When all spans for a trace
     are ended, the trace is queues up for export. This is required for exporting
     to the Datadog Agent which expects to received list of spans for each trace.
+
+    Traces are buffered in ``shard_count`` shards selected by the trace id,
+    each one guarded by its own lock, so that spans of different traces can be
+    started and ended concurrently without contending on a single lock.
+
+    The number of buffered spans is bounded by ``max_buffered_spans``, split
+    evenly across shards. When the budget of a shard is exhausted, its least
+    recently used traces that still have spans in progress are dropped to make
+    room for new spans. The spans of a dropped trace started or ended later on
+    are dropped as well, as the trace is incomplete. If
+    ``partial_flush_age_millis`` is set, the ended spans of traces buffered for
+    longer than that are exported as a partial trace so long-running traces do
+    not hold all of their spans in memory.
     """
 
     _FLUSH_TOKEN = INVALID_TRACE_ID
@@ -43,6 +115,9 @@ class DatadogExportSpanProcessor(SpanProcessor):
         span_exporter: SpanExporter,
         schedule_delay_millis: float = 5000,
         max_trace_size: int = 4096,
+        shard_count: int = 16,
+        max_buffered_spans: int = 100000,
+        partial_flush_age_millis: typing.Optional[float] = None,
     ):
         if max_trace_size <= 0:
             raise ValueError("max_queue_size must be a positive integer.")
@@ -50,6 +125,18 @@ class DatadogExportSpanProcessor(SpanProcessor):
         if schedule_delay_millis <= 0:
             raise ValueError("schedule_delay_millis must be positive.")
 
+        if shard_count <= 0:
+            raise ValueError("shard_count must be a positive integer.")
+
+        if max_buffered_spans <= 0:
+            raise ValueError("max_buffered_spans must be a positive integer.")
+
+        if (
+            partial_flush_age_millis is not None
+            and partial_flush_age_millis <= 0
+        ):
+            raise ValueError("partial_flush_age_millis must be positive.")
+
         self.span_exporter = span_exporter
 
         # queue trace_ids for traces with recently ended spans for worker thread to check
@@ -58,14 +145,8 @@ class DatadogExportSpanProcessor(SpanProcessor):
             collections.deque()
         )  # type: typing.Deque[int]
 
-        self.traces_lock = threading.Lock()
-        # dictionary of trace_ids to a list of spans where the first span is the
-        # first opened span for the trace
-        self.traces = collections.defaultdict(list)
-        # counter to keep track of the number of spans and ended spans for a
-        # trace_id
-        self.traces_spans_count = collections.Counter()
-        self.traces_spans_ended_count = collections.Counter()
+        self._shards = [_TraceShard() for _ in range(shard_count)]
+        self._max_shard_spans = -(-max_buffered_spans // shard_count)
 
         self.worker_thread = threading.Thread(target=self.worker, daemon=True)
 
@@ -79,26 +160,86 @@ class DatadogExportSpanProcessor(SpanProcessor):
         self.max_trace_size = max_trace_size
         self._spans_dropped = False
         self.schedule_delay_millis = schedule_delay_millis
+        self.partial_flush_age_millis = partial_flush_age_millis
         self.done = False
         self.worker_thread.start()
 
+        if hasattr(os, "register_at_fork"):
+            weak_reinit = weakref.WeakMethod(self._at_fork_reinit)
+
+            def after_in_child():
+                reinit = weak_reinit()
+                if reinit is not None:
+                    reinit()
+
+            os.register_at_fork(after_in_child=after_in_child)
+
+    def _at_fork_reinit(self):
+        """Reinitializes the processor in a child process.
+
+        Only the thread that forked survives in the child, so the worker thread
+        is restarted and the locks, possibly held by threads of the parent when
+        forking, are recreated. Traces buffered in the parent are dropped as
+        the parent exports them.
+        """
+        self.check_traces_queue = collections.deque()
+        self._shards = [_TraceShard() for _ in range(len(self._shards))]
+        self.condition = threading.Condition(threading.Lock())
+        self.flush_condition = threading.Condition(threading.Lock())
+        self._flushing = False
+
+        if not self.done:
+            self.worker_thread = threading.Thread(
+                target=self.worker, daemon=True
+            )
+            self.worker_thread.start()
+
+    def _get_shard(self, trace_id: int) -> _TraceShard:
+        return self._shards[trace_id % len(self._shards)]
+
     def on_start(
         self, span: Span, parent_context: typing.Optional[Context] = None
     ) -> None:
         ctx = span.get_span_context()
         trace_id = ctx.trace_id
+        shard = self._get_shard(trace_id)
+
+        with shard.lock:
+            if trace_id in shard.evicted_traces:
+                shard.evicted_traces[trace_id] += 1
+                self._spans_dropped = True
+                shard.dropped_spans += 1
+                return
+
+            trace = shard.traces.get(trace_id)
 
-        with self.traces_lock:
             # check upper bound on number of spans for trace before adding new
             # span
-            if self.traces_spans_count[trace_id] == self.max_trace_size:
+            if trace is not None and trace.started == self.max_trace_size:
                 logger.warning("Max spans for trace, spans will be dropped.")
-                self._spans_dropped = True
+                self._drop_span(shard, trace, ctx.span_id)
                 return
 
+            # check upper bound on number of spans buffered in the shard,
+            # making room by dropping least recently used traces
+            if shard.span_count >= self._max_shard_spans:
+                self._evict_traces(shard, trace_id)
+                if shard.span_count >= self._max_shard_spans:
+                    logger.warning(
+                        "Max buffered spans, spans will be dropped."
+                    )
+                    self._drop_span(shard, trace, ctx.span_id)
+                    return
+
+            if trace is None:
+                trace = shard.traces[trace_id] = _Trace(_time_ns())
+            else:
+                shard.traces.move_to_end(trace_id)
+
             # add span to end of list for a trace and update the counter
-            self.traces[trace_id].append(span)
-            self.traces_spans_count[trace_id] += 1
+            trace.spans.append(span)
+            trace.started += 1
+            shard.span_count += 1
 
     def on_end(self, span: Span) -> None:
         if self.done:
@@ -107,11 +248,78 @@ class DatadogExportSpanProcessor(SpanProcessor):
 
         ctx = span.get_span_context()
         trace_id = ctx.trace_id
-
-        with self.traces_lock:
-            self.traces_spans_ended_count[trace_id] += 1
-            if self.is_trace_exportable(trace_id):
+        shard = self._get_shard(trace_id)
+
+        with shard.lock:
+            trace = shard.traces.get(trace_id)
+            if trace is None:
+                # span of an evicted trace, or started before this processor
+                # was registered
+                in_progress = shard.evicted_traces.get(trace_id)
+                if in_progress == 1:
+                    del shard.evicted_traces[trace_id]
+                elif in_progress is not None:
+                    shard.evicted_traces[trace_id] = in_progress - 1
+                return
+            if (
+                trace.dropped_span_ids
+                and ctx.span_id in trace.dropped_span_ids
+            ):
+                trace.dropped_span_ids.remove(ctx.span_id)
+                return
+            trace.ended += 1
+            if trace.is_exportable():
                 self.check_traces_queue.appendleft(trace_id)
+            else:
+                shard.traces.move_to_end(trace_id)
+
+    def _drop_span(
+        self, shard: _TraceShard, trace: typing.Optional[_Trace], span_id: int,
+    ) -> None:
+        """Records a span that is not buffered so that ending it does not
+        count towards the ended spans of its trace."""
+        self._spans_dropped = True
+        shard.dropped_spans += 1
+        if trace is not None:
+            if trace.dropped_span_ids is None:
+                trace.dropped_span_ids = set()
+            trace.dropped_span_ids.add(span_id)
+
+    def _evict_traces(self, shard: _TraceShard, trace_id: int) -> None:
+        """Drops least recently used traces from a shard until there is room
+        for a new span.
+
+        Traces with all their spans ended are about to be exported so they are
+        never dropped, neither is the trace the new span belongs to. The
+        evicted traces are remembered until their spans in progress end. Must
+        be called while holding the lock of the shard.
+        """
+        evicted_trace_ids = []
+        span_count = shard.span_count
+        for evicted_trace_id, trace in shard.traces.items():
+            if span_count < self._max_shard_spans:
+                break
+            if evicted_trace_id == trace_id or trace.is_exportable():
+                continue
+            evicted_trace_ids.append(evicted_trace_id)
+            span_count -= len(trace.spans)
+
+        for evicted_trace_id in evicted_trace_ids:
+            trace = shard.traces.pop(evicted_trace_id)
+            shard.span_count -= len(trace.spans)
+            shard.dropped_spans += len(trace.spans)
+            shard.dropped_traces += 1
+            in_progress = trace.started - trace.ended
+            if trace.dropped_span_ids:
+                in_progress += len(trace.dropped_span_ids)
+            if in_progress > 0:
+                shard.evicted_traces[evicted_trace_id] = in_progress
+                if len(shard.evicted_traces) > _MAX_EVICTED_TRACES:
+                    shard.evicted_traces.popitem(last=False)
+            logger.warning(
+                "Max buffered spans, trace %032x will be dropped.",
+                evicted_trace_id,
+            )
 
     def worker(self):
         timeout = self.schedule_delay_millis / 1e3
@@ -119,7 +327,10 @@ class DatadogExportSpanProcessor(SpanProcessor):
             if not self._flushing:
                 with self.condition:
                     self.condition.wait(timeout)
-                    if not self.check_traces_queue:
+                    if (
+                        not self.check_traces_queue
+                        and self.partial_flush_age_millis is None
+                    ):
                         # spurious notification, let's wait again, reset timeout
                         timeout = self.schedule_delay_millis / 1e3
                         continue
@@ -138,54 +349,110 @@ class DatadogExportSpanProcessor(SpanProcessor):
         self._drain_queue()
 
     def is_trace_exportable(self, trace_id):
-        return (
-            self.traces_spans_count[trace_id]
-            - self.traces_spans_ended_count[trace_id]
-            <= 0
-        )
+        """Returns whether all started spans of a trace have ended.
+
+        Must be called while holding the lock of the shard of the trace.
+        """
+        trace = self._get_shard(trace_id).traces.get(trace_id)
+        return trace is not None and trace.is_exportable()
 
     def export(self) -> None:
-        """Exports traces with finished spans."""
+        """Exports traces with finished spans.
+
+        All the traces ready to be exported are removed from the buffer and
+        handed to the span exporter in a single call, outside of the shard
+        locks.
+        """
         notify_flush = False
-        export_trace_ids = []
+        export_spans = []
 
         while self.check_traces_queue:
             trace_id = self.check_traces_queue.pop()
             if trace_id is self._FLUSH_TOKEN:
                 notify_flush = True
             else:
-                with self.traces_lock:
+                shard = self._get_shard(trace_id)
+                with shard.lock:
                     # check whether trace is exportable again in case that new
                     # spans were started since we last concluded trace was
                     # exportable
                     if self.is_trace_exportable(trace_id):
-                        export_trace_ids.append(trace_id)
-                        del self.traces_spans_count[trace_id]
-                        del self.traces_spans_ended_count[trace_id]
-
-        if len(export_trace_ids) > 0:
+                        trace = shard.traces.pop(trace_id)
+                        shard.span_count -= len(trace.spans)
+                        # spans of an evicted trace which is no longer
+                        # remembered ending after new spans of the same trace
+                        # were buffered make it exportable while some of its
+                        # spans are still in progress
+                        ended = [span for span in trace.spans if span.end_time]
+                        dropped = len(trace.spans) - len(ended)
+                        if dropped:
+                            self._spans_dropped = True
+                            shard.dropped_spans += dropped
+                        export_spans.extend(ended)
+
+        if self.partial_flush_age_millis is not None:
+            self._collect_partial_traces(export_spans)
+
+        if len(export_spans) > 0:
             token = attach(set_value(_SUPPRESS_INSTRUMENTATION_KEY, True))
-
-            for trace_id in export_trace_ids:
-                with self.traces_lock:
-                    try:
-                        # Ignore type b/c the Optional[None]+slicing is too "clever"
-                        # for mypy
-                        self.span_exporter.export(self.traces[trace_id])  # type: ignore
-                    # pylint: disable=broad-except
-                    except Exception:
-                        logger.exception(
-                            "Exception while exporting Span batch."
-                        )
-                    finally:
-                        del self.traces[trace_id]
-
-            detach(token)
+            try:
+                self.span_exporter.export(export_spans)
+            # pylint: disable=broad-except
+            except Exception:
+                logger.exception("Exception while exporting Span batch.")
+            finally:
+                detach(token)
 
         if notify_flush:
             with self.flush_condition:
                 self.flush_condition.notify()
 
+    def _collect_partial_traces(self, export_spans: typing.List[Span]) -> None:
+        """Moves the ended spans of traces buffered for longer than
+        ``partial_flush_age_millis`` to ``export_spans``."""
+        now = _time_ns()
+        max_age_ns = self.partial_flush_age_millis * 1e6
+
+        for shard in self._shards:
+            with shard.lock:
+                for trace in shard.traces.values():
+                    if now - trace.timestamp < max_age_ns:
+                        continue
+                    if trace.is_exportable():
+                        # already queued for export as a whole
+                        continue
+                    ended = [span for span in trace.spans if span.end_time]
+                    if not ended:
+                        continue
+                    trace.spans = [
+                        span for span in trace.spans if not span.end_time
+                    ]
+                    # spans ended right before calling on_end are accounted
+                    # for when on_end increments the ended counter
+                    trace.started -= len(ended)
+                    trace.ended -= len(ended)
+                    trace.timestamp = now
+                    shard.span_count -= len(ended)
+                    shard.partial_flushed_traces += 1
+                    export_spans.extend(ended)
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Returns the number of buffered spans and counters of the spans and
+        traces dropped or partially flushed because of the buffer limits."""
+        stats = {
+            "buffered_spans": 0,
+            "dropped_spans": 0,
+            "dropped_traces": 0,
+            "partial_flushed_traces": 0,
+        }
+        for shard in self._shards:
+            with shard.lock:
+                stats["buffered_spans"] += shard.span_count
+                stats["dropped_spans"] += shard.dropped_spans
+                stats["dropped_traces"] += shard.dropped_traces
+                stats["partial_flushed_traces"] += shard.partial_flushed_traces
+        return stats
+
     def _drain_queue(self):
         """Export all elements until queue is empty.
 
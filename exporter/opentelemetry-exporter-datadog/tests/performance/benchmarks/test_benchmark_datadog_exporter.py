@@ -0,0 +1,63 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry import trace as trace_api
+from opentelemetry.exporter.datadog import DatadogSpanExporter
+from opentelemetry.sdk import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
+
+SPAN_COUNT = 1000
+
+resource = Resource(
+    attributes={
+        "service.name": "benchmark",
+        "host.name": "localhost",
+        "process.pid": 1234,
+    }
+)
+instrumentation_info = InstrumentationInfo(
+    "opentelemetry.instrumentation.requests", "0"
+)
+
+
+def create_spans():
+    spans = []
+    for index in range(SPAN_COUNT):
+        span = trace._Span(  # pylint: disable=protected-access
+            name="GET",
+            context=trace_api.SpanContext(
+                trace_id=0x000000000000000000000000DEADBEEF,
+                span_id=index + 1,
+                is_remote=False,
+                trace_flags=trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED),
+            ),
+            kind=trace_api.SpanKind.CLIENT,
+            attributes={"http.method": "GET", "http.status_code": 200},
+            instrumentation_info=instrumentation_info,
+            resource=resource,
+        )
+        span.start()
+        span.end()
+        spans.append(span)
+    return spans
+
+
+exporter = DatadogSpanExporter()
+spans = create_spans()
+
+
+def test_translate_to_datadog(benchmark):
+    # pylint: disable=protected-access
+    benchmark(exporter._translate_to_datadog, spans)
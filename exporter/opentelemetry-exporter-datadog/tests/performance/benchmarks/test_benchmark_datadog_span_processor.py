@@ -0,0 +1,62 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from opentelemetry.exporter.datadog import DatadogExportSpanProcessor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+TRACE_COUNT = 3200
+
+
+class NoOpSpanExporter(SpanExporter):
+    def export(self, spans):
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+span_processor = DatadogExportSpanProcessor(NoOpSpanExporter())
+tracer_provider = TracerProvider()
+tracer_provider.add_span_processor(span_processor)
+tracer = tracer_provider.get_tracer(__name__)
+
+
+def create_traces(count):
+    for _ in range(count):
+        with tracer.start_as_current_span("root"):
+            with tracer.start_span("child"):
+                pass
+
+
+def run_threads(thread_count):
+    threads = [
+        threading.Thread(
+            target=create_traces, args=(TRACE_COUNT // thread_count,)
+        )
+        for _ in range(thread_count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.parametrize("thread_count", [1, 8, 32])
+def test_span_processor_contention(benchmark, thread_count):
+    benchmark(run_threads, thread_count)
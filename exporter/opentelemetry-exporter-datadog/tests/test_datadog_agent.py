@@ -0,0 +1,465 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.server
+import os
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import msgpack
+
+from opentelemetry import trace as trace_api
+from opentelemetry.exporter import datadog
+from opentelemetry.exporter.datadog.agent import (
+    BLOCK,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    AgentClient,
+    TraceSender,
+    parse_agent_url,
+)
+from opentelemetry.sdk import trace
+from opentelemetry.sdk.trace import Resource
+from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
+from opentelemetry.semconv.trace import SpanAttributes
+from opentelemetry.trace.status import Status, StatusCode
+
+
+class FakeAgentHandler(http.server.BaseHTTPRequestHandler):
+    def do_PUT(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.path, self.headers, body))
+        self.send_response(self.server.status)
+        self.end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class FakeAgent(http.server.HTTPServer):
+    def __init__(self):
+        super().__init__(("localhost", 0), FakeAgentHandler)
+        self.requests = []
+        self.status = 200
+        self.url = "http://localhost:%s" % self.server_port
+
+
+class UnixFakeAgent(socketserver.UnixStreamServer):
+    def __init__(self, uds_path):
+        super().__init__(uds_path, FakeAgentHandler)
+        self.requests = []
+        self.status = 200
+        self.url = "unix://" + uds_path
+
+
+def create_spans():
+    resource = Resource(
+        attributes={
+            "key_resource": "some_resource",
+            "service.name": "resource_service_name",
+        }
+    )
+    instrumentation_info = InstrumentationInfo(
+        "opentelemetry.instrumentation.requests", "0"
+    )
+    root = trace._Span(  # pylint: disable=protected-access
+        name="root",
+        context=trace_api.SpanContext(
+            trace_id=0x6E0C63257DE34C926F9EFCD03927272E,
+            span_id=0x34BF92DEEFC58C92,
+            is_remote=False,
+        ),
+        parent=None,
+        kind=trace_api.SpanKind.CLIENT,
+        instrumentation_info=instrumentation_info,
+        resource=resource,
+        attributes={
+            SpanAttributes.HTTP_METHOD: "GET",
+            SpanAttributes.HTTP_STATUS_CODE: 500,
+            "int_attribute": 42,
+            "float_attribute": 0.5,
+            "bool_attribute": True,
+        },
+    )
+    child = trace._Span(  # pylint: disable=protected-access
+        name="child",
+        context=trace_api.SpanContext(
+            trace_id=0x6E0C63257DE34C926F9EFCD03927272E,
+            span_id=0x1111111111111111,
+            is_remote=False,
+        ),
+        parent=root.get_span_context(),
+        resource=Resource({}),
+    )
+    other = trace._Span(  # pylint: disable=protected-access
+        name="other",
+        context=trace_api.SpanContext(
+            trace_id=0xDEADBEEF, span_id=0x2222222222222222, is_remote=False,
+        ),
+        parent=None,
+        resource=Resource({}),
+    )
+
+    root.start(start_time=683647322 * 10 ** 9)
+    child.start(start_time=683647322 * 10 ** 9 + 10)
+    try:
+        raise ValueError("bar")
+    except ValueError as error:
+        child.record_exception(error)
+        child.set_status(Status(StatusCode.ERROR, "ValueError: bar"))
+    child.end(end_time=683647322 * 10 ** 9 + 20)
+    root.end(end_time=683647322 * 10 ** 9 + 30)
+    other.start()
+    other.end()
+    return [root, child, other]
+
+
+class TestDatadogAgentExport(unittest.TestCase):
+    def setUp(self):
+        self.agent = FakeAgent()
+        threading.Thread(target=self.agent.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.agent.shutdown()
+        self.agent.server_close()
+
+    def test_unsupported_api_version(self):
+        with self.assertRaises(ValueError):
+            datadog.DatadogSpanExporter(api_version="v0.1")
+
+    @mock.patch.dict(
+        "os.environ",
+        {"DD_SERVICE": "test-service", "DD_ENV": "test", "DD_VERSION": "1"},
+    )
+    def test_translate_to_datadog_dicts(self):
+        """Test that spans translated without ddtrace spans match the ddtrace
+        spans representation"""
+        spans = create_spans()
+        exporter = datadog.DatadogSpanExporter(tags="team:testers")
+
+        # pylint: disable=protected-access
+        expected = [
+            span.to_dict() for span in exporter._translate_to_datadog(spans)
+        ]
+        actual = exporter._translate_to_datadog_dicts(spans)
+
+        self.assertEqual(actual, expected)
+
+    def test_export_v04(self):
+        spans = create_spans()
+        exporter = datadog.DatadogSpanExporter(
+            agent_url=self.agent.url, api_version="v0.4"
+        )
+
+        self.assertEqual(exporter.export(spans), SpanExportResult.SUCCESS)
+        self.assertTrue(exporter.force_flush())
+
+        self.assertEqual(len(self.agent.requests), 1)
+        path, headers, body = self.agent.requests[0]
+        self.assertEqual(path, "/v0.4/traces")
+        self.assertEqual(headers["Content-Type"], "application/msgpack")
+        self.assertEqual(headers["X-Datadog-Trace-Count"], "2")
+
+        # pylint: disable=protected-access
+        expected = exporter._translate_to_datadog_dicts(spans)
+        self.assertEqual(
+            msgpack.unpackb(body, raw=False), [expected[:2], expected[2:]],
+        )
+
+    def test_export_v05(self):
+        spans = create_spans()
+        exporter = datadog.DatadogSpanExporter(
+            agent_url=self.agent.url, api_version="v0.5"
+        )
+
+        self.assertEqual(exporter.export(spans), SpanExportResult.SUCCESS)
+        self.assertTrue(exporter.force_flush())
+
+        self.assertEqual(len(self.agent.requests), 1)
+        path, headers, body = self.agent.requests[0]
+        self.assertEqual(path, "/v0.5/traces")
+        self.assertEqual(headers["X-Datadog-Trace-Count"], "2")
+
+        string_table, traces = msgpack.unpackb(
+            body, raw=False, strict_map_key=False
+        )
+        self.assertEqual(string_table[0], "")
+        self.assertEqual(len(string_table), len(set(string_table)))
+
+        def decode_span(span):
+            decoded = {
+                "service": string_table[span[0]],
+                "name": string_table[span[1]],
+                "resource": string_table[span[2]],
+                "trace_id": span[3],
+                "span_id": span[4],
+                "parent_id": span[5],
+                "start": span[6],
+                "duration": span[7],
+                "error": span[8],
+            }
+            if span[9]:
+                decoded["meta"] = {
+                    string_table[key]: string_table[value]
+                    for key, value in span[9].items()
+                }
+            if span[10]:
+                decoded["metrics"] = {
+                    string_table[key]: value for key, value in span[10].items()
+                }
+            if span[11]:
+                decoded["type"] = string_table[span[11]]
+            return decoded
+
+        # pylint: disable=protected-access
+        expected = exporter._translate_to_datadog_dicts(spans)
+        # missing strings are encoded as the empty string
+        for span in expected:
+            span["service"] = span["service"] or ""
+        self.assertEqual(
+            [[decode_span(span) for span in trace] for trace in traces],
+            [expected[:2], expected[2:]],
+        )
+
+    def test_export_uds(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            agent = UnixFakeAgent(os.path.join(tmp_dir, "apm.socket"))
+            threading.Thread(target=agent.serve_forever, daemon=True).start()
+            try:
+                exporter = datadog.DatadogSpanExporter(
+                    agent_url=agent.url, api_version="v0.4"
+                )
+                self.assertEqual(
+                    exporter.export(create_spans()), SpanExportResult.SUCCESS
+                )
+                self.assertTrue(exporter.force_flush())
+            finally:
+                agent.shutdown()
+                agent.server_close()
+
+        self.assertEqual(len(agent.requests), 1)
+        self.assertEqual(agent.requests[0][0], "/v0.4/traces")
+
+    def test_export_agent_error(self):
+        self.agent.status = 404
+        exporter = datadog.DatadogSpanExporter(
+            agent_url=self.agent.url, api_version="v0.5"
+        )
+
+        with self.assertLogs(level="ERROR"):
+            exporter.export(create_spans())
+            self.assertTrue(exporter.force_flush())
+
+        stats = exporter.stats()
+        self.assertEqual(stats["dropped_traces"], 2)
+        self.assertEqual(stats["retries"], 0)
+        exporter.shutdown()
+
+    def test_export_agent_unreachable(self):
+        exporter = datadog.DatadogSpanExporter(
+            agent_url="unix:///does/not/exist",
+            api_version="v0.4",
+            max_retries=2,
+            retry_backoff_millis=1,
+        )
+
+        with self.assertLogs(level="ERROR"):
+            exporter.export(create_spans())
+            self.assertTrue(exporter.force_flush())
+
+        stats = exporter.stats()
+        self.assertEqual(stats["dropped_traces"], 2)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["sent_traces"], 0)
+        exporter.shutdown()
+
+    def test_export_stats(self):
+        exporter = datadog.DatadogSpanExporter(
+            agent_url=self.agent.url, api_version="v0.4"
+        )
+        exporter.export(create_spans())
+        self.assertTrue(exporter.force_flush())
+
+        stats = exporter.stats()
+        self.assertEqual(stats["queued_traces"], 2)
+        self.assertEqual(stats["sent_traces"], 2)
+        self.assertEqual(stats["dropped_traces"], 0)
+        self.assertEqual(stats["payloads"], 1)
+        self.assertEqual(
+            stats["payload_bytes"], len(self.agent.requests[0][2])
+        )
+        self.assertEqual(stats["queue_size"], 0)
+        self.assertGreater(stats["last_flush_latency_millis"], 0)
+        exporter.shutdown()
+
+    @unittest.skipUnless(
+        hasattr(os, "register_at_fork"), "fork hooks are not supported"
+    )
+    def test_export_after_fork(self):
+        exporter = datadog.DatadogSpanExporter(
+            agent_url=self.agent.url, api_version="v0.4"
+        )
+        span_processor = datadog.DatadogExportSpanProcessor(
+            exporter, schedule_delay_millis=10
+        )
+        tracer_provider = trace.TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        # start the worker and sender threads before forking
+        with tracer.start_as_current_span("parent"):
+            pass
+        self.assertTrue(span_processor.force_flush())
+        self.assertTrue(exporter.force_flush())
+
+        with tracer.start_as_current_span("unfinished"):
+            pid = os.fork()
+            if pid == 0:  # pragma: no cover
+                exit_code = 1
+                try:
+                    # the parent of this span is buffered in the parent
+                    with tracer.start_as_current_span("child"):
+                        pass
+                    if span_processor.force_flush(
+                        5000
+                    ) and exporter.force_flush(5000):
+                        exit_code = 0
+                finally:
+                    os._exit(exit_code)  # pylint: disable=protected-access
+
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(os.WEXITSTATUS(status), 0)
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertTrue(exporter.force_flush())
+        tracer_provider.shutdown()
+
+        resources = [
+            [span["resource"] for span in datadog_trace]
+            for _, _, body in self.agent.requests
+            for datadog_trace in msgpack.unpackb(body, raw=False)
+        ]
+        self.assertEqual(
+            sorted(resources), [["child"], ["parent"], ["unfinished"]]
+        )
+
+
+class TestTraceSender(unittest.TestCase):
+    def setUp(self):
+        self.send_event = threading.Event()
+        self.client = mock.Mock(spec=AgentClient)
+        self.client.url = parse_agent_url("http://localhost:8126")
+        self.client.encoder = mock.Mock()
+        self.client.encoder.encode_traces.side_effect = repr
+        self.client.send_payload.side_effect = self.send_payload
+
+    def send_payload(self, payload, trace_count):
+        self.send_event.wait()
+        return 200
+
+    def create_blocked_sender(self, **kwargs):
+        """Creates a sender with a full queue of two traces while its thread
+        is sending the first trace"""
+        sender = TraceSender(self.client, max_queue_size=2, **kwargs)
+        self.assertTrue(sender.put(["first"]))
+        while sender.stats()["queue_size"]:
+            time.sleep(0.001)
+        self.assertTrue(sender.put(["second", "third"]))
+        return sender
+
+    def sent_traces(self):
+        return [
+            call_args[0][0]
+            for call_args in self.client.encoder.encode_traces.call_args_list
+        ]
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TraceSender(self.client, max_queue_size=0)
+        with self.assertRaises(ValueError):
+            TraceSender(self.client, drop_policy="drop_random")
+
+    def test_drop_oldest(self):
+        sender = self.create_blocked_sender(drop_policy=DROP_OLDEST)
+
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(sender.put(["fourth"]))
+
+        self.send_event.set()
+        self.assertTrue(sender.force_flush())
+        self.assertEqual(self.sent_traces(), [["first"], ["third", "fourth"]])
+        self.assertEqual(sender.stats()["dropped_traces"], 1)
+        sender.shutdown()
+
+    def test_drop_newest(self):
+        sender = self.create_blocked_sender(drop_policy=DROP_NEWEST)
+
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(sender.put(["fourth", "fifth"]))
+
+        self.send_event.set()
+        self.assertTrue(sender.force_flush())
+        self.assertEqual(self.sent_traces(), [["first"], ["second", "third"]])
+        self.assertEqual(sender.stats()["dropped_traces"], 2)
+        sender.shutdown()
+
+    def test_block(self):
+        sender = self.create_blocked_sender(
+            drop_policy=BLOCK, block_timeout_millis=10
+        )
+
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(sender.put(["fourth"]))
+
+        # room is made while the producer is blocked
+        threading.Timer(0.01, self.send_event.set).start()
+        sender.block_timeout_millis = 5000
+        self.assertTrue(sender.put(["fifth"]))
+
+        self.assertTrue(sender.force_flush())
+        self.assertEqual(
+            self.sent_traces(), [["first"], ["second", "third"], ["fifth"]]
+        )
+        self.assertEqual(sender.stats()["dropped_traces"], 1)
+        sender.shutdown()
+
+    def test_retry(self):
+        self.client.send_payload.side_effect = [OSError(), 503, 200]
+        sender = TraceSender(
+            self.client, max_retries=3, retry_backoff_millis=1
+        )
+
+        self.assertTrue(sender.put(["first"]))
+        self.assertTrue(sender.force_flush())
+
+        stats = sender.stats()
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["sent_traces"], 1)
+        self.assertEqual(stats["dropped_traces"], 0)
+        sender.shutdown()
+
+    def test_shutdown(self):
+        sender = TraceSender(self.client)
+        self.send_event.set()
+        self.assertTrue(sender.put(["first"]))
+        sender.shutdown()
+
+        self.assertEqual(self.sent_traces(), [["first"]])
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(sender.put(["second"]))
@@ -14,6 +14,7 @@
 
 import itertools
 import logging
+import threading
 import time
 import unittest
 from unittest import mock
@@ -283,6 +284,62 @@ class TestDatadogSpanExporter(unittest.TestCase):
 
         self.assertEqual(datadog_spans, expected_spans)
 
+    def test_translate_to_datadog_cache(self):
+        """Test that values derived from resources and instrumentations are
+        computed once"""
+        resource = Resource(
+            attributes={
+                "key_resource": "some_resource",
+                "service.name": "resource_service_name",
+            }
+        )
+        instrumentation_info = InstrumentationInfo(
+            "opentelemetry.instrumentation.redis", "0"
+        )
+        otel_spans = []
+        for index in range(3):
+            span = trace._Span(
+                name=str(index),
+                context=trace_api.SpanContext(
+                    trace_id=0x000000000000000000000000DEADBEEF,
+                    span_id=index + 1,
+                    is_remote=False,
+                ),
+                kind=trace_api.SpanKind.CLIENT,
+                instrumentation_info=instrumentation_info,
+                resource=resource,
+            )
+            span.start()
+            span.end()
+            otel_spans.append(span)
+
+        exporter = datadog.DatadogSpanExporter()
+        with mock.patch(
+            "opentelemetry.exporter.datadog.exporter._extract_tags_from_resource",
+            wraps=datadog.exporter._extract_tags_from_resource,
+        ) as mock_extract, mock.patch(
+            "opentelemetry.exporter.datadog.exporter._get_span_name",
+            wraps=datadog.exporter._get_span_name,
+        ) as mock_name:
+            # pylint: disable=protected-access
+            datadog_spans = [
+                span.to_dict()
+                for span in exporter._translate_to_datadog(otel_spans)
+            ]
+
+        self.assertEqual(mock_extract.call_count, 1)
+        self.assertEqual(mock_name.call_count, 1)
+        for datadog_span in datadog_spans:
+            self.assertEqual(
+                datadog_span["name"],
+                "opentelemetry.instrumentation.redis.CLIENT",
+            )
+            self.assertEqual(datadog_span["type"], "redis")
+            self.assertEqual(datadog_span["service"], "resource_service_name")
+            self.assertEqual(
+                datadog_span["meta"], {"key_resource": "some_resource"}
+            )
+
     def test_export(self):
         """Test that agent and/or collector are invoked"""
         # create and save span to be used in tests
@@ -428,6 +485,30 @@ class TestDatadogSpanExporter(unittest.TestCase):
         actual1 = [span.get("resource") for span in datadog_spans]
         self.assertListEqual(span_names0 + span_names1, actual1)
 
+    def test_span_processor_batch_export(self):
+        """Test that traces ready at the same time are exported in a single
+        call to the exporter and written to the agent per trace"""
+        span_names = ["xxx", "bar", "foo"]
+
+        for name in span_names:
+            with self.tracer.start_as_current_span(name):
+                with self.tracer.start_span("child"):
+                    pass
+
+        with mock.patch.object(
+            self.exporter, "export", wraps=self.exporter.export
+        ) as mock_export:
+            self.assertTrue(self.span_processor.force_flush())
+
+        self.assertEqual(mock_export.call_count, 1)
+        self.assertEqual(len(mock_export.call_args[0][0]), 6)
+
+        write_calls = self.exporter.agent_writer.write.call_args_list
+        self.assertEqual(len(write_calls), 3)
+        for name, write_call in zip(span_names, write_calls):
+            resources = [span.resource for span in write_call[1]["spans"]]
+            self.assertEqual(resources, [name, "child"])
+
     def test_span_processor_lossless(self):
         """Test that no spans are lost when sending max_trace_size spans"""
         span_processor = datadog.DatadogExportSpanProcessor(
@@ -469,6 +550,189 @@ class TestDatadogSpanExporter(unittest.TestCase):
         self.assertEqual(len(datadog_spans), 128)
         tracer_provider.shutdown()
 
+    def test_span_processor_invalid_shard_count(self):
+        with self.assertRaises(ValueError):
+            datadog.DatadogExportSpanProcessor(self.exporter, shard_count=0)
+
+    def test_span_processor_concurrent_traces(self):
+        """Test that no spans are lost when traces are created from several
+        threads at the same time"""
+        span_processor = datadog.DatadogExportSpanProcessor(
+            self.exporter, shard_count=4
+        )
+        tracer_provider = trace.TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        def create_traces():
+            for _ in range(50):
+                with tracer.start_as_current_span("root"):
+                    with tracer.start_span("child"):
+                        pass
+
+        threads = [threading.Thread(target=create_traces) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(span_processor.force_flush())
+        datadog_spans = get_spans(tracer, self.exporter)
+        self.assertEqual(len(datadog_spans), 8 * 50 * 2)
+        # pylint: disable=protected-access
+        self.assertTrue(
+            all(not shard.traces for shard in span_processor._shards)
+        )
+        tracer_provider.shutdown()
+
+    def test_span_processor_invalid_buffer_limits(self):
+        with self.assertRaises(ValueError):
+            datadog.DatadogExportSpanProcessor(
+                self.exporter, max_buffered_spans=0
+            )
+        with self.assertRaises(ValueError):
+            datadog.DatadogExportSpanProcessor(
+                self.exporter, partial_flush_age_millis=0
+            )
+
+    def test_span_processor_evicts_least_recently_used_trace(self):
+        """Test that the least recently used trace is dropped when exceeding
+        max_buffered_spans"""
+        span_processor = datadog.DatadogExportSpanProcessor(
+            self.exporter, shard_count=1, max_buffered_spans=4
+        )
+        tracer_provider = trace.TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        roots = []
+        children = []
+        for name in ("first", "second"):
+            root = tracer.start_span(name)
+            roots.append(root)
+            children.append(
+                tracer.start_span(
+                    name + "-child",
+                    context=trace_api.set_span_in_context(root),
+                )
+            )
+
+        with self.assertLogs(level=logging.WARNING):
+            roots.append(tracer.start_span("third"))
+
+        self.assertEqual(
+            span_processor.stats(),
+            {
+                "buffered_spans": 3,
+                "dropped_spans": 2,
+                "dropped_traces": 1,
+                "partial_flushed_traces": 0,
+            },
+        )
+
+        for span in children + roots:
+            span.end()
+
+        self.assertTrue(span_processor.force_flush())
+        datadog_spans = get_spans(tracer, self.exporter)
+        actual = [span["resource"] for span in datadog_spans]
+        self.assertEqual(actual, ["second", "second-child", "third"])
+        tracer_provider.shutdown()
+
+    def test_span_processor_evicted_trace_spans_ending_late(self):
+        """Test that spans of an evicted trace started or ended after its
+        eviction are dropped rather than exported as a complete trace"""
+        span_processor = datadog.DatadogExportSpanProcessor(
+            self.exporter, shard_count=1, max_buffered_spans=2
+        )
+        tracer_provider = trace.TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        root = tracer.start_span("root")
+        root_context = trace_api.set_span_in_context(root)
+        child = tracer.start_span("child", context=root_context)
+        with self.assertLogs(level=logging.WARNING):
+            other = tracer.start_span("other")
+        self.assertEqual(span_processor.stats()["dropped_traces"], 1)
+
+        # the evicted trace is not buffered again by its late spans
+        tracer.start_span("late-child", context=root_context).end()
+        child.end()
+        tracer.start_span("late-sibling", context=root_context).end()
+        root.end()
+        other.end()
+
+        self.assertTrue(span_processor.force_flush())
+        datadog_spans = get_spans(tracer, self.exporter)
+        actual = [span["resource"] for span in datadog_spans]
+        self.assertEqual(actual, ["other"])
+        self.assertEqual(
+            span_processor.stats(),
+            {
+                "buffered_spans": 0,
+                "dropped_spans": 4,
+                "dropped_traces": 1,
+                "partial_flushed_traces": 0,
+            },
+        )
+        # pylint: disable=protected-access
+        self.assertFalse(span_processor._shards[0].evicted_traces)
+        tracer_provider.shutdown()
+
+    def test_span_processor_budget_dropped_spans(self):
+        """Test that spans of the only buffered trace are dropped when
+        exceeding max_buffered_spans and the trace is still exported once
+        complete"""
+        span_processor = datadog.DatadogExportSpanProcessor(
+            self.exporter, shard_count=1, max_buffered_spans=2
+        )
+        tracer_provider = trace.TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        with tracer.start_as_current_span("root"):
+            with tracer.start_as_current_span("child"):
+                with self.assertLogs(level=logging.WARNING):
+                    with tracer.start_span("one-too-many"):
+                        pass
+
+        self.assertTrue(span_processor.force_flush())
+        datadog_spans = get_spans(tracer, self.exporter)
+        actual = [span["resource"] for span in datadog_spans]
+        self.assertEqual(actual, ["root", "child"])
+        self.assertEqual(span_processor.stats()["dropped_spans"], 1)
+        tracer_provider.shutdown()
+
+    def test_span_processor_partial_flush(self):
+        """Test that ended spans of old traces are exported before the trace
+        is complete"""
+        span_processor = datadog.DatadogExportSpanProcessor(
+            self.exporter, partial_flush_age_millis=1
+        )
+        tracer_provider = trace.TracerProvider()
+        tracer_provider.add_span_processor(span_processor)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        with tracer.start_as_current_span("root"):
+            with tracer.start_span("child"):
+                pass
+
+            time.sleep(0.01)
+            self.assertTrue(span_processor.force_flush())
+            datadog_spans = get_spans(tracer, self.exporter, shutdown=False)
+            actual = [span["resource"] for span in datadog_spans]
+            self.assertEqual(actual, ["child"])
+
+        self.assertTrue(span_processor.force_flush())
+        datadog_spans = get_spans(tracer, self.exporter)
+        actual = [span["resource"] for span in datadog_spans]
+        self.assertEqual(actual, ["child", "root"])
+        # the root span may be partially flushed by the worker thread between
+        # setting its end time and ending it in the processor
+        self.assertIn(span_processor.stats()["partial_flushed_traces"], (1, 2))
+        tracer_provider.shutdown()
+
     def test_span_processor_scheduled_delay(self):
         """Test that spans are exported each schedule_delay_millis"""
         delay = 300
@@ -72,6 +72,7 @@ class AiopgInstrumentor(BaseInstrumentor):
         """
 
         tracer_provider = kwargs.get("tracer_provider")
+        statement_sanitizer = kwargs.get("statement_sanitizer")
 
         wrappers.wrap_connect(
             __name__,
@@ -79,6 +80,7 @@ class AiopgInstrumentor(BaseInstrumentor):
             self._CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
         )
 
         wrappers.wrap_create_pool(
@@ -87,6 +89,7 @@ class AiopgInstrumentor(BaseInstrumentor):
             self._CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
         )
 
     # pylint:disable=no-self-use
@@ -96,13 +99,17 @@ class AiopgInstrumentor(BaseInstrumentor):
         wrappers.unwrap_create_pool()
 
     # pylint:disable=no-self-use
-    def instrument_connection(self, connection, tracer_provider=None):
+    def instrument_connection(
+        self, connection, tracer_provider=None, statement_sanitizer=None
+    ):
         """Enable instrumentation in a aiopg connection.
 
         Args:
             connection: The connection to instrument.
             tracer_provider: The optional tracer provider to use. If omitted
                 the current globally configured one is used.
+            statement_sanitizer: Optional callable returning the value of the
+                db.statement attribute from the executed statement.
 
         Returns:
             An instrumented connection.
@@ -114,6 +121,7 @@ class AiopgInstrumentor(BaseInstrumentor):
             self._CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
         )
 
     def uninstrument_connection(self, connection):
@@ -8,6 +8,12 @@ from opentelemetry.instrumentation.dbapi import (
     DatabaseApiIntegration,
 )
 from opentelemetry.trace import SpanKind
+from opentelemetry.trace.status import Status, StatusCode
+
+# attribute of the pooled connections holding their proxy, the proxy and the
+# connection reference each other so that they are collected together once
+# the pool drops the connection
+_CONNECTION_PROXY_KEY = "_otel_connection_proxy"
 
 
 # pylint: disable=abstract-method
@@ -30,6 +36,10 @@ class AsyncProxyObject(wrapt.ObjectProxy):
 
 
 class AiopgIntegration(DatabaseApiIntegration):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cursor_tracer = AsyncCursorTracer(self)
+
     async def wrapped_connection(
         self,
         connect_method: typing.Callable[..., typing.Any],
@@ -50,103 +60,139 @@ class AiopgIntegration(DatabaseApiIntegration):
         return get_traced_pool_proxy(pool, self)
 
 
+# pylint: disable=abstract-method
+class TracedConnectionProxy(AsyncProxyObject):
+    __slots__ = ("_self_db_api_integration",)
+
+    # pylint: disable=unused-argument
+    def __init__(self, connection, db_api_integration, *args, **kwargs):
+        super().__init__(connection)
+        self._self_db_api_integration = db_api_integration
+
+    def cursor(self, *args, **kwargs):
+        coro = self._cursor(*args, **kwargs)
+        return _ContextManager(coro)
+
+    async def _cursor(self, *args, **kwargs):
+        # pylint: disable=protected-access
+        cursor = await self.__wrapped__._cursor(*args, **kwargs)
+        return get_traced_cursor_proxy(cursor, self._self_db_api_integration)
+
+
 def get_traced_connection_proxy(
     connection, db_api_integration, *args, **kwargs
 ):
-    # pylint: disable=abstract-method
-    class TracedConnectionProxy(AsyncProxyObject):
-        # pylint: disable=unused-argument
-        def __init__(self, connection, *args, **kwargs):
-            super().__init__(connection)
+    return TracedConnectionProxy(
+        connection, db_api_integration, *args, **kwargs
+    )
 
-        def cursor(self, *args, **kwargs):
-            coro = self._cursor(*args, **kwargs)
-            return _ContextManager(coro)
 
-        async def _cursor(self, *args, **kwargs):
-            # pylint: disable=protected-access
-            cursor = await self.__wrapped__._cursor(*args, **kwargs)
-            return get_traced_cursor_proxy(cursor, db_api_integration)
+# pylint: disable=abstract-method
+class TracedPoolProxy(AsyncProxyObject):
+    __slots__ = ("_self_db_api_integration",)
 
-    return TracedConnectionProxy(connection, *args, **kwargs)
+    # pylint: disable=unused-argument
+    def __init__(self, pool, db_api_integration, *args, **kwargs):
+        super().__init__(pool)
+        self._self_db_api_integration = db_api_integration
 
+    def acquire(self):
+        """Acquire free connection from the pool."""
+        coro = self._acquire()
+        return _PoolAcquireContextManager(coro, self)
 
-def get_traced_pool_proxy(pool, db_api_integration, *args, **kwargs):
-    # pylint: disable=abstract-method
-    class TracedPoolProxy(AsyncProxyObject):
-        # pylint: disable=unused-argument
-        def __init__(self, pool, *args, **kwargs):
-            super().__init__(pool)
-
-        def acquire(self):
-            """Acquire free connection from the pool."""
-            coro = self._acquire()
-            return _PoolAcquireContextManager(coro, self)
-
-        async def _acquire(self):
-            # pylint: disable=protected-access
-            connection = await self.__wrapped__._acquire()
-            if not isinstance(connection, AsyncProxyObject):
-                connection = get_traced_connection_proxy(
-                    connection, db_api_integration, *args, **kwargs
-                )
+    async def _acquire(self):
+        # pylint: disable=protected-access
+        connection = await self.__wrapped__._acquire()
+        if isinstance(connection, AsyncProxyObject):
             return connection
+        # the proxies of the pooled connections are reused on every acquire
+        # as the connections of a pool share their attributes
+        proxy = getattr(connection, _CONNECTION_PROXY_KEY, None)
+        if (
+            proxy is None
+            or proxy._self_db_api_integration
+            is not self._self_db_api_integration
+        ):
+            proxy = get_traced_connection_proxy(
+                connection, self._self_db_api_integration
+            )
+            try:
+                setattr(connection, _CONNECTION_PROXY_KEY, proxy)
+            except AttributeError:
+                pass
+        return proxy
 
-    return TracedPoolProxy(pool, *args, **kwargs)
+
+def get_traced_pool_proxy(pool, db_api_integration, *args, **kwargs):
+    return TracedPoolProxy(pool, db_api_integration, *args, **kwargs)
 
 
 class AsyncCursorTracer(CursorTracer):
-    async def traced_execution(
-        self,
-        cursor,
-        query_method: typing.Callable[..., typing.Any],
-        *args: typing.Tuple[typing.Any, typing.Any],
-        **kwargs: typing.Dict[typing.Any, typing.Any]
+    # traced_execution and traced_executemany return the coroutine
+    async def _traced_execution(
+        self, cursor, query_method, args, kwargs, many=False
     ):
-        name = ""
-        if args:
-            name = self.get_operation_name(cursor, args)
-
-        if not name:
-            name = (
-                self._db_api_integration.database
-                if self._db_api_integration.database
-                else self._db_api_integration.name
-            )
-
-        with self._db_api_integration._tracer.start_as_current_span(
-            name, kind=SpanKind.CLIENT
-        ) as span:
-            self._populate_span(span, cursor, *args)
+        name, attributes = self._get_span_details(cursor, args)
+        db_api_integration = self._db_api_integration
+
+        # the span is not made current: the query does not create spans and
+        # attaching a context around an await is unsafe when the coroutine
+        # is cancelled
+        span = db_api_integration._tracer.start_span(
+            name, kind=SpanKind.CLIENT, attributes=attributes
+        )
+        try:
+            if (
+                db_api_integration.capture_parameters
+                and len(args) > 1
+                and span.is_recording()
+            ):
+                self._set_parameters_attributes(span, args, many=many)
             return await query_method(*args, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            if span.is_recording():
+                span.record_exception(exc)
+                span.set_status(
+                    Status(
+                        StatusCode.ERROR,
+                        "{}: {}".format(type(exc).__name__, exc),
+                    )
+                )
+            raise
+        finally:
+            span.end()
 
 
-def get_traced_cursor_proxy(cursor, db_api_integration, *args, **kwargs):
-    _traced_cursor = AsyncCursorTracer(db_api_integration)
-
-    # pylint: disable=abstract-method
-    class AsyncCursorTracerProxy(AsyncProxyObject):
-
-        # pylint: disable=unused-argument
-        def __init__(self, cursor, *args, **kwargs):
-            super().__init__(cursor)
+# pylint: disable=abstract-method
+class AsyncCursorTracerProxy(AsyncProxyObject):
+    __slots__ = ("_self_cursor_tracer",)
+
+    # pylint: disable=unused-argument
+    def __init__(self, cursor, cursor_tracer, *args, **kwargs):
+        super().__init__(cursor)
+        self._self_cursor_tracer = cursor_tracer
+
+    async def execute(self, *args, **kwargs):
+        result = await self._self_cursor_tracer.traced_execution(
+            self, self.__wrapped__.execute, *args, **kwargs
+        )
+        return result
 
-        async def execute(self, *args, **kwargs):
-            result = await _traced_cursor.traced_execution(
-                self, self.__wrapped__.execute, *args, **kwargs
-            )
-            return result
+    async def executemany(self, *args, **kwargs):
+        result = await self._self_cursor_tracer.traced_executemany(
+            self, self.__wrapped__.executemany, *args, **kwargs
+        )
+        return result
 
-        async def executemany(self, *args, **kwargs):
-            result = await _traced_cursor.traced_execution(
-                self, self.__wrapped__.executemany, *args, **kwargs
-            )
-            return result
+    async def callproc(self, *args, **kwargs):
+        result = await self._self_cursor_tracer.traced_execution(
+            self, self.__wrapped__.callproc, *args, **kwargs
+        )
+        return result
 
-        async def callproc(self, *args, **kwargs):
-            result = await _traced_cursor.traced_execution(
-                self, self.__wrapped__.callproc, *args, **kwargs
-            )
-            return result
 
-    return AsyncCursorTracerProxy(cursor, *args, **kwargs)
+def get_traced_cursor_proxy(cursor, db_api_integration, *args, **kwargs):
+    return AsyncCursorTracerProxy(
+        cursor, db_api_integration._cursor_tracer, *args, **kwargs
+    )
@@ -55,6 +55,7 @@ def trace_integration(
     database_system: str,
     connection_attributes: typing.Dict = None,
     tracer_provider: typing.Optional[TracerProvider] = None,
+    statement_sanitizer: typing.Optional[typing.Callable[[str], str]] = None,
 ):
     """Integrate with aiopg library.
     based on dbapi integration, where replaced sync wrap methods to async
@@ -66,6 +67,8 @@ def trace_integration(
             user in Connection object.
         tracer_provider: The :class:`opentelemetry.trace.TracerProvider` to
             use. If omitted the current configured one is used.
+        statement_sanitizer: Optional callable returning the value of the
+            db.statement attribute from the executed statement.
     """
 
     wrap_connect(
@@ -74,6 +77,7 @@ def trace_integration(
         connection_attributes,
         __version__,
         tracer_provider,
+        statement_sanitizer,
     )
 
 
@@ -83,6 +87,7 @@ def wrap_connect(
     connection_attributes: typing.Dict = None,
     version: str = "",
     tracer_provider: typing.Optional[TracerProvider] = None,
+    statement_sanitizer: typing.Optional[typing.Callable[[str], str]] = None,
 ):
     """Integrate with aiopg library.
     https://github.com/aio-libs/aiopg
@@ -96,6 +101,8 @@ def wrap_connect(
         version: Version of opentelemetry extension for aiopg.
         tracer_provider: The :class:`opentelemetry.trace.TracerProvider` to
             use. If omitted the current configured one is used.
+        statement_sanitizer: Optional callable returning the value of the
+            db.statement attribute from the executed statement.
     """
 
     # pylint: disable=unused-argument
@@ -111,6 +118,7 @@ def wrap_connect(
             connection_attributes=connection_attributes,
             version=version,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
         )
         return _ContextManager(  # pylint: disable=no-value-for-parameter
             db_integration.wrapped_connection(wrapped, args, kwargs)
@@ -137,6 +145,7 @@ def instrument_connection(
     connection_attributes: typing.Dict = None,
     version: str = "",
     tracer_provider: typing.Optional[TracerProvider] = None,
+    statement_sanitizer: typing.Optional[typing.Callable[[str], str]] = None,
 ):
     """Enable instrumentation in a database connection.
 
@@ -150,6 +159,8 @@ def instrument_connection(
         version: Version of opentelemetry extension for aiopg.
         tracer_provider: The :class:`opentelemetry.trace.TracerProvider` to
             use. If omitted the current configured one is used.
+        statement_sanitizer: Optional callable returning the value of the
+            db.statement attribute from the executed statement.
 
     Returns:
         An instrumented connection.
@@ -164,6 +175,7 @@ def instrument_connection(
         connection_attributes=connection_attributes,
         version=version,
         tracer_provider=tracer_provider,
+        statement_sanitizer=statement_sanitizer,
     )
     db_integration.get_connection_attributes(connection)
     return get_traced_connection_proxy(connection, db_integration)
@@ -191,6 +203,7 @@ def wrap_create_pool(
     connection_attributes: typing.Dict = None,
     version: str = "",
     tracer_provider: typing.Optional[TracerProvider] = None,
+    statement_sanitizer: typing.Optional[typing.Callable[[str], str]] = None,
 ):
     # pylint: disable=unused-argument
     def wrap_create_pool_(
@@ -205,6 +218,7 @@ def wrap_create_pool(
             connection_attributes=connection_attributes,
             version=version,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
         )
         return _PoolContextManager(
             db_integration.wrapped_pool(wrapped, args, kwargs)
@@ -0,0 +1,98 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from aiopg.utils import (  # pylint: disable=no-name-in-module
+    _ContextManager,
+    _PoolAcquireContextManager,
+)
+
+from opentelemetry.instrumentation.aiopg.aiopg_integration import (
+    AiopgIntegration,
+)
+from opentelemetry.sdk.trace import TracerProvider
+
+QUERY_COUNT = 1000
+
+
+class Cursor:
+    async def execute(self, query, params=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class Connection:
+    class _conn:  # pylint: disable=invalid-name
+        class info:  # pylint: disable=invalid-name
+            dbname = "database"
+            port = 5432
+            host = "localhost"
+            user = "user"
+
+    def cursor(self):
+        return _ContextManager(self._cursor())
+
+    async def _cursor(self):
+        return Cursor()
+
+
+class Pool:
+    def __init__(self):
+        self.connections = [Connection() for _ in range(10)]
+        self.index = 0
+
+    def acquire(self):
+        return _PoolAcquireContextManager(self._acquire(), self)
+
+    async def _acquire(self):
+        self.index = (self.index + 1) % len(self.connections)
+        return self.connections[self.index]
+
+    async def release(self, connection):
+        pass
+
+
+async def create_pool():
+    return Pool()
+
+
+db_integration = AiopgIntegration(
+    __name__,
+    "postgresql",
+    {
+        "database": "info.dbname",
+        "port": "info.port",
+        "host": "info.host",
+        "user": "info.user",
+    },
+    tracer_provider=TracerProvider(),
+)
+loop = asyncio.new_event_loop()
+pool = loop.run_until_complete(
+    db_integration.wrapped_pool(create_pool, (), {})
+)
+
+
+async def acquire_and_execute():
+    for _ in range(QUERY_COUNT):
+        async with pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute("SELECT * FROM users WHERE id = %s", (1,))
+
+
+def test_pool_acquire_and_execute(benchmark):
+    benchmark(lambda: loop.run_until_complete(acquire_and_execute()))
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
+import gc
 import logging
+import weakref
 from unittest import mock
 from unittest.mock import MagicMock
 
@@ -28,6 +30,7 @@ from opentelemetry.instrumentation.aiopg import AiopgInstrumentor, wrappers
 from opentelemetry.instrumentation.aiopg.aiopg_integration import (
     AiopgIntegration,
 )
+from opentelemetry.instrumentation.sql import SqlSanitizer
 from opentelemetry.sdk import resources
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.test.test_base import TestBase
@@ -250,6 +253,21 @@ class TestAiopgInstrumentor(TestBase):
         )
         self.assertIs(span.resource, resource)
 
+    def test_statement_sanitizer_instrument_connection(self):
+        cnx = async_call(aiopg.connect(database="test"))
+        cnx = AiopgInstrumentor().instrument_connection(
+            cnx, statement_sanitizer=SqlSanitizer()
+        )
+        cursor = async_call(cnx.cursor())
+        async_call(cursor.execute("SELECT * FROM test WHERE id IN (1, 2)"))
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 1)
+        self.assertEqual(
+            spans_list[0].attributes[SpanAttributes.DB_STATEMENT],
+            "SELECT * FROM test WHERE id IN (?)",
+        )
+
     def test_uninstrument_connection(self):
         AiopgInstrumentor().instrument()
         cnx = async_call(aiopg.connect(database="test"))
@@ -406,6 +424,80 @@ class TestAiopgIntegration(TestBase):
             "Test stored procedure",
         )
 
+    def test_pool_connection_proxies_reused(self):
+        async def acquire_and_execute(pool):
+            async with pool.acquire() as connection:
+                cursor = await connection.cursor()
+                await cursor.execute("Test query")
+            return connection
+
+        db_integration = AiopgIntegration(self.tracer, "testcomponent")
+        pool = async_call(
+            db_integration.wrapped_pool(
+                mock_create_single_connection_pool,
+                (),
+                {"database": "testdatabase"},
+            )
+        )
+        first_connection = async_call(acquire_and_execute(pool))
+        second_connection = async_call(acquire_and_execute(pool))
+
+        self.assertIs(first_connection, second_connection)
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 2)
+        for span in spans_list:
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_NAME], "testdatabase"
+            )
+
+    def test_dropped_pool_connection_collected(self):
+        async def acquire_and_execute(pool):
+            async with pool.acquire() as connection:
+                cursor = await connection.cursor()
+                await cursor.execute("Test query")
+
+        db_integration = AiopgIntegration(self.tracer, "testcomponent")
+        pool = async_call(
+            db_integration.wrapped_pool(
+                mock_create_single_connection_pool,
+                (),
+                {"database": "testdatabase"},
+            )
+        )
+        async_call(acquire_and_execute(pool))
+        connection = weakref.ref(pool.connection)
+
+        # the pool replaces its connection, as when it is recycled or broken
+        pool.connection = MockConnection("testdatabase", None, None, None)
+        gc.collect()
+
+        self.assertIsNone(connection())
+        async_call(acquire_and_execute(pool))
+        self.assertEqual(len(self.memory_exporter.get_finished_spans()), 2)
+
+    def test_span_not_current(self):
+        current_spans = []
+
+        # pylint: disable=unused-argument
+        async def execute(cursor, *args, **kwargs):
+            current_spans.append(trace_api.get_current_span())
+
+        db_integration = AiopgIntegration(self.tracer, "testcomponent")
+        mock_connection = async_call(
+            db_integration.wrapped_connection(mock_connect, {}, {})
+        )
+        cursor = async_call(mock_connection.cursor())
+        with self.tracer.start_as_current_span("parent") as parent:
+            with mock.patch.object(MockCursor, "execute", execute):
+                async_call(cursor.execute("Test query"))
+
+        self.assertEqual(current_spans, [parent])
+        span = self.memory_exporter.get_finished_spans()[0]
+        self.assertEqual(span.name, "Test")
+        self.assertEqual(
+            span.parent.span_id, parent.get_span_context().span_id
+        )
+
     def test_wrap_connect(self):
         aiopg_mock = AiopgMock()
         with mock.patch("aiopg.connect", aiopg_mock.connect):
@@ -500,6 +592,11 @@ async def mock_create_pool(*args, **kwargs):
     return MockPool(database, server_port, server_host, user)
 
 
+# pylint: disable=unused-argument
+async def mock_create_single_connection_pool(*args, **kwargs):
+    return MockSingleConnectionPool(kwargs.get("database"), None, None, None)
+
+
 class MockPool:
     def __init__(self, database, server_port, server_host, user):
         self.database = database
@@ -528,6 +625,17 @@ class MockPool:
         pass
 
 
+class MockSingleConnectionPool(MockPool):
+    def __init__(self, database, server_port, server_host, user):
+        super().__init__(database, server_port, server_host, user)
+        self.connection = MockConnection(
+            database, server_port, server_host, user
+        )
+
+    async def _acquire(self):
+        return self.connection
+
+
 class MockPsycopg2Connection:
     def __init__(self, database, server_port, server_host, user):
         self.database = database
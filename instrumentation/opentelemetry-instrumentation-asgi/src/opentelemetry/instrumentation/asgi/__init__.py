@@ -34,6 +34,36 @@ from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace.status import Status, StatusCode
 from opentelemetry.util.http import remove_url_credentials
 
+_HEADER_INDEX_KEY = "opentelemetry-instrumentation-asgi.header_index"
+
+_RECEIVE_MESSAGES = "asgi.receive.messages"
+_RECEIVE_BYTES = "asgi.receive.bytes"
+_SEND_MESSAGES = "asgi.send.messages"
+_SEND_BYTES = "asgi.send.bytes"
+
+
+def _get_header_index(scope: dict) -> typing.Dict[bytes, typing.List[bytes]]:
+    """Returns the headers of the scope indexed by lower case name.
+
+    The index is built on the first lookup and cached in the scope along with
+    the header list it was built from, so that it is rebuilt if the headers
+    are replaced.
+    """
+    headers = scope.get("headers")
+    cached = scope.get(_HEADER_INDEX_KEY)
+    if (
+        cached is not None
+        and cached[0] is headers
+        and cached[1] == len(headers)
+    ):
+        return cached[2]
+
+    index = {}
+    for key, value in headers:
+        index.setdefault(key.lower(), []).append(value)
+    scope[_HEADER_INDEX_KEY] = (headers, len(headers), index)
+    return index
+
 
 class ASGIGetter(Getter):
     def get(
@@ -49,23 +79,16 @@ class ASGIGetter(Getter):
             A list with a single string with the header value if it exists,
                 else None.
         """
-        headers = carrier.get("headers")
-        if not headers:
+        if not carrier.get("headers"):
             return None
 
-        # asgi header keys are in lower case
-        key = key.lower()
-        decoded = [
-            _value.decode("utf8")
-            for (_key, _value) in headers
-            if _key.decode("utf8") == key
-        ]
-        if not decoded:
+        values = _get_header_index(carrier).get(key.lower().encode("utf8"))
+        if not values:
             return None
-        return decoded
+        return [value.decode("utf8") for value in values]
 
     def keys(self, carrier: dict) -> typing.List[str]:
-        return list(carrier.keys())
+        return [key for key in carrier.keys() if key != _HEADER_INDEX_KEY]
 
 
 asgi_getter = ASGIGetter()
@@ -156,6 +179,17 @@ def get_default_span_details(scope: dict) -> Tuple[str, dict]:
     return span_name, {}
 
 
+def _get_message_size(message):
+    """Returns the size in bytes of the body of a HTTP or websocket
+    message."""
+    body = message.get("body") or message.get("bytes")
+    if body:
+        return len(body)
+    text = message.get("text")
+    # text frames are sent encoded in UTF-8
+    return len(text.encode("utf-8")) if text else 0
+
+
 class OpenTelemetryMiddleware:
     """The ASGI application middleware.
 
@@ -170,6 +204,10 @@ class OpenTelemetryMiddleware:
             Optional: Defaults to get_default_span_details.
         tracer_provider: The optional tracer provider to use. If omitted
             the current globally configured one is used.
+        message_spans: Whether to create a span for every message received
+            or sent. If ``False``, the number of messages and bytes received
+            and sent are recorded as attributes of the server span instead.
+            Optional: Defaults to ``True``.
     """
 
     def __init__(
@@ -178,6 +216,7 @@ class OpenTelemetryMiddleware:
         excluded_urls=None,
         span_details_callback=None,
         tracer_provider=None,
+        message_spans=True,
     ):
         self.app = guarantee_single_callable(app)
         self.tracer = trace.get_tracer(__name__, __version__, tracer_provider)
@@ -185,6 +224,7 @@ class OpenTelemetryMiddleware:
             span_details_callback or get_default_span_details
         )
         self.excluded_urls = excluded_urls
+        self.message_spans = message_spans
 
     async def __call__(self, scope, receive, send):
         """The ASGI application
@@ -214,6 +254,15 @@ class OpenTelemetryMiddleware:
                     for key, value in attributes.items():
                         span.set_attribute(key, value)
 
+                if not self.message_spans:
+                    if span.is_recording():
+                        await self._call_with_message_stats(
+                            span, scope, receive, send
+                        )
+                    else:
+                        await self.app(scope, receive, send)
+                    return
+
                 @wraps(receive)
                 async def wrapped_receive():
                     with self.tracer.start_as_current_span(
@@ -245,3 +294,35 @@ class OpenTelemetryMiddleware:
                 await self.app(scope, wrapped_receive, wrapped_send)
         finally:
             context.detach(token)
+
+    async def _call_with_message_stats(self, span, scope, receive, send):
+        """Calls the application, counting the messages and bytes received
+        and sent as attributes of the server span."""
+        stats = {
+            _RECEIVE_MESSAGES: 0,
+            _RECEIVE_BYTES: 0,
+            _SEND_MESSAGES: 0,
+            _SEND_BYTES: 0,
+        }
+
+        @wraps(receive)
+        async def wrapped_receive():
+            message = await receive()
+            stats[_RECEIVE_MESSAGES] += 1
+            stats[_RECEIVE_BYTES] += _get_message_size(message)
+            return message
+
+        @wraps(send)
+        async def wrapped_send(message):
+            if message["type"] == "http.response.start":
+                set_status_code(span, message["status"])
+            elif message["type"] == "websocket.send":
+                set_status_code(span, 200)
+            stats[_SEND_MESSAGES] += 1
+            stats[_SEND_BYTES] += _get_message_size(message)
+            await send(message)
+
+        try:
+            await self.app(scope, wrapped_receive, wrapped_send)
+        finally:
+            span.set_attributes(stats)
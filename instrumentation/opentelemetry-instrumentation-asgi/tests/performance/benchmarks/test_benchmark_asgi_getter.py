@@ -0,0 +1,58 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from opentelemetry.baggage.propagation import W3CBaggagePropagator
+from opentelemetry.instrumentation.asgi import (
+    asgi_getter,
+    collect_request_attributes,
+)
+from opentelemetry.propagators.composite import CompositePropagator
+from opentelemetry.trace.propagation.tracecontext import (
+    TraceContextTextMapPropagator,
+)
+
+HEADERS = [
+    (b"host", b"example.com"),
+    (b"user-agent", b"benchmark/1.0"),
+    (
+        b"traceparent",
+        b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+    ),
+    (b"tracestate", b"congo=t61rcWkgMzE"),
+    (b"baggage", b"user=1,session=2"),
+] + [
+    (b"x-custom-header-%d" % index, b"value-%d" % index) for index in range(30)
+]
+
+PROPAGATORS = {
+    "tracecontext": CompositePropagator([TraceContextTextMapPropagator()]),
+    "baggage": CompositePropagator([W3CBaggagePropagator()]),
+    "tracecontext,baggage": CompositePropagator(
+        [TraceContextTextMapPropagator(), W3CBaggagePropagator()]
+    ),
+}
+
+
+@pytest.mark.parametrize("propagators", list(PROPAGATORS))
+def test_extract(benchmark, propagators):
+    propagator = PROPAGATORS[propagators]
+
+    def extract():
+        scope = {"type": "http", "headers": list(HEADERS)}
+        collect_request_attributes(scope)
+        propagator.extract(scope, getter=asgi_getter)
+
+    benchmark(extract)
@@ -0,0 +1,70 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from opentelemetry.instrumentation.asgi import OpenTelemetryMiddleware
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.test.asgitestutil import setup_testing_defaults
+
+CHUNK_COUNT = 2000
+CHUNK = b"*" * 1024
+
+
+async def streaming_app(scope, receive, send):
+    await receive()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [[b"content-type", b"text/plain"]],
+        }
+    )
+    for _ in range(CHUNK_COUNT):
+        await send(
+            {"type": "http.response.body", "body": CHUNK, "more_body": True}
+        )
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+@pytest.mark.parametrize(
+    "message_spans", [True, False], ids=["message_spans", "message_stats"]
+)
+def test_streaming_response(benchmark, message_spans):
+    app = OpenTelemetryMiddleware(
+        streaming_app,
+        tracer_provider=TracerProvider(),
+        message_spans=message_spans,
+    )
+    scope = {}
+    setup_testing_defaults(scope)
+    loop = asyncio.new_event_loop()
+
+    def handle_request():
+        loop.run_until_complete(app(dict(scope), receive, send))
+
+    try:
+        benchmark(handle_request)
+    finally:
+        loop.close()
@@ -359,6 +359,87 @@ class TestAsgiApplication(AsgiTestBase):
             self.assertEqual(span.kind, expected["kind"])
             self.assertDictEqual(dict(span.attributes), expected["attributes"])
 
+    def test_message_stats(self):
+        """Test that messages are counted on the server span instead of
+        creating a span for each of them."""
+        app = otel_asgi.OpenTelemetryMiddleware(
+            simple_asgi, message_spans=False
+        )
+        self.seed_app(app)
+        self.send_input({"type": "http.request", "body": b"request"})
+        outputs = self.get_all_output()
+        self.assertEqual(len(outputs), 2)
+
+        span_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(span_list), 1)
+        span = span_list[0]
+        self.assertEqual(span.name, "/")
+        self.assertEqual(span.kind, trace_api.SpanKind.SERVER)
+        self.assertEqual(span.attributes[SpanAttributes.HTTP_STATUS_CODE], 200)
+        self.assertEqual(span.attributes["asgi.receive.messages"], 1)
+        self.assertEqual(span.attributes["asgi.receive.bytes"], 7)
+        self.assertEqual(span.attributes["asgi.send.messages"], 2)
+        self.assertEqual(span.attributes["asgi.send.bytes"], 1)
+
+    def test_websocket_message_stats(self):
+        self.scope = {
+            "type": "websocket",
+            "http_version": "1.1",
+            "scheme": "ws",
+            "path": "/",
+            "query_string": b"",
+            "headers": [],
+            "client": ("127.0.0.1", 32767),
+            "server": ("127.0.0.1", 80),
+        }
+        app = otel_asgi.OpenTelemetryMiddleware(
+            simple_asgi, message_spans=False
+        )
+        self.seed_app(app)
+        self.send_input({"type": "websocket.connect"})
+        self.send_input({"type": "websocket.receive", "text": "ping"})
+        self.send_input({"type": "websocket.disconnect"})
+        self.get_all_output()
+
+        span_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(span_list), 1)
+        span = span_list[0]
+        self.assertEqual(span.attributes[SpanAttributes.HTTP_STATUS_CODE], 200)
+        self.assertEqual(span.attributes["asgi.receive.messages"], 3)
+        self.assertEqual(span.attributes["asgi.receive.bytes"], 4)
+        self.assertEqual(span.attributes["asgi.send.messages"], 2)
+        self.assertEqual(span.attributes["asgi.send.bytes"], 4)
+
+    def test_message_size(self):
+        for message, size in (
+            ({"type": "http.request", "body": b"abc"}, 3),
+            ({"type": "http.request", "body": b""}, 0),
+            ({"type": "websocket.receive", "bytes": b"\xc3\xa9"}, 2),
+            ({"type": "websocket.receive", "text": "ping"}, 4),
+            ({"type": "websocket.send", "text": "déjà vu"}, 9),
+            ({"type": "websocket.send", "bytes": None, "text": None}, 0),
+        ):
+            with self.subTest(message=message):
+                self.assertEqual(otel_asgi._get_message_size(message), size)
+
+    def test_message_stats_not_recording(self):
+        mock_tracer = mock.Mock()
+        mock_span = mock.Mock()
+        mock_span.is_recording.return_value = False
+        mock_tracer.start_as_current_span.return_value = mock_span
+        mock_tracer.start_as_current_span.return_value.__enter__ = mock_span
+        mock_tracer.start_as_current_span.return_value.__exit__ = mock_span
+        with mock.patch("opentelemetry.trace.get_tracer") as tracer:
+            tracer.return_value = mock_tracer
+            app = otel_asgi.OpenTelemetryMiddleware(
+                simple_asgi, message_spans=False
+            )
+            self.seed_app(app)
+            self.send_default_request()
+            self.assertEqual(len(self.get_all_output()), 2)
+            self.assertEqual(mock_tracer.start_as_current_span.call_count, 1)
+            self.assertFalse(mock_span.set_attributes.called)
+
     def test_lifespan(self):
         self.scope["type"] = "lifespan"
         app = otel_asgi.OpenTelemetryMiddleware(simple_asgi)
@@ -44,7 +44,39 @@ class TestASGIGetter(TestCase):
             "Should be case insensitive",
         )
 
+    def test_get_multiple_values(self):
+        getter = ASGIGetter()
+        carrier = {
+            "headers": [
+                (b"x-forwarded-for", b"1.2.3.4"),
+                (b"host", b"example.com"),
+                (b"X-Forwarded-For", b"5.6.7.8"),
+            ]
+        }
+        self.assertEqual(
+            getter.get(carrier, "X-Forwarded-For"), ["1.2.3.4", "5.6.7.8"]
+        )
+        self.assertEqual(getter.get(carrier, "host"), ["example.com"])
+        self.assertIsNone(getter.get(carrier, "user-agent"))
+
+    def test_get_replaced_headers(self):
+        getter = ASGIGetter()
+        carrier = {"headers": [(b"test-key", b"val")]}
+        self.assertEqual(getter.get(carrier, "test-key"), ["val"])
+
+        carrier["headers"] = [(b"test-key", b"new-val")]
+        self.assertEqual(getter.get(carrier, "test-key"), ["new-val"])
+
+        carrier["headers"].append((b"other-key", b"other-val"))
+        self.assertEqual(getter.get(carrier, "other-key"), ["other-val"])
+
     def test_keys(self):
         getter = ASGIGetter()
         keys = getter.keys({})
         self.assertEqual(keys, [])
+
+    def test_keys_after_get(self):
+        getter = ASGIGetter()
+        carrier = {"headers": [(b"test-key", b"val")]}
+        getter.get(carrier, "test-key")
+        self.assertEqual(getter.keys(carrier), ["headers"])
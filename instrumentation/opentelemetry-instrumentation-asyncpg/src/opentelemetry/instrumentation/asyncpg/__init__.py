@@ -34,6 +34,8 @@ API
 ---
 """
 
+import weakref
+from functools import partial
 from typing import Collection
 
 import asyncpg
@@ -44,6 +46,10 @@ from opentelemetry import trace
 from opentelemetry.instrumentation.asyncpg.package import _instruments
 from opentelemetry.instrumentation.asyncpg.version import __version__
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
+from opentelemetry.instrumentation.sql import (
+    DEFAULT_MAX_PARAMETERS_LENGTH,
+    get_parameters_attributes,
+)
 from opentelemetry.instrumentation.utils import unwrap
 from opentelemetry.semconv.trace import (
     DbSystemValues,
@@ -53,8 +59,38 @@ from opentelemetry.semconv.trace import (
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import Status, StatusCode
 
+# number of statements of a connection whose span name and attributes are
+# cached
+_MAX_CACHED_STATEMENTS = 128
+# longer statements are not cached as they are unlikely to be repeated
+_MAX_CACHED_STATEMENT_LENGTH = 8192
+
+# the methods and whether their parameters are a batch
+_CONNECTION_METHODS = (
+    ("execute", False),
+    ("executemany", True),
+    ("fetch", False),
+    ("fetchval", False),
+    ("fetchrow", False),
+)
+# methods missing from older versions of asyncpg are not instrumented
+_PREPARED_STATEMENT_METHODS = (
+    ("fetch", False),
+    ("fetchval", False),
+    ("fetchrow", False),
+    ("fetchmany", True),
+    ("executemany", True),
+)
+# the methods of the cursors making a round trip to the server
+_CURSOR_METHODS = (
+    ("BaseCursor", "_bind"),
+    ("BaseCursor", "_bind_exec"),
+    ("BaseCursor", "_exec"),
+    ("Cursor", "forward"),
+)
+
 
-def _hydrate_span_from_args(connection, query, parameters) -> dict:
+def _get_connection_attributes(connection) -> dict:
     """Get network and database attributes from connection."""
     span_attributes = {
         SpanAttributes.DB_SYSTEM: DbSystemValues.POSTGRESQL.value
@@ -86,20 +122,32 @@ def _hydrate_span_from_args(connection, query, parameters) -> dict:
             SpanAttributes.NET_TRANSPORT
         ] = NetTransportValues.UNIX.value
 
-    if query is not None:
-        span_attributes[SpanAttributes.DB_STATEMENT] = query
+    return span_attributes
 
-    if parameters is not None and len(parameters) > 0:
-        span_attributes["db.statement.parameters"] = str(parameters)
 
-    return span_attributes
+class _ConnectionDetails:
+    """The attributes of a connection and the span names and attributes of
+    its statements, computed once per connection."""
+
+    __slots__ = ("attributes", "statements")
+
+    def __init__(self, connection):
+        self.attributes = _get_connection_attributes(connection)
+        self.statements = {}
 
 
 class AsyncPGInstrumentor(BaseInstrumentor):
-    def __init__(self, capture_parameters=False):
+    def __init__(
+        self,
+        capture_parameters=False,
+        max_parameters_length=DEFAULT_MAX_PARAMETERS_LENGTH,
+    ):
         super().__init__()
         self.capture_parameters = capture_parameters
+        self.max_parameters_length = max_parameters_length
         self._tracer = None
+        self._statement_sanitizer = None
+        self._connection_details = weakref.WeakKeyDictionary()
 
     def instrumentation_dependencies(self) -> Collection[str]:
         return _instruments
@@ -107,53 +155,160 @@ class AsyncPGInstrumentor(BaseInstrumentor):
     def _instrument(self, **kwargs):
         tracer_provider = kwargs.get("tracer_provider")
         self._tracer = trace.get_tracer(__name__, __version__, tracer_provider)
+        self._statement_sanitizer = kwargs.get("statement_sanitizer")
+        self._connection_details = weakref.WeakKeyDictionary()
 
-        for method in [
-            "Connection.execute",
-            "Connection.executemany",
-            "Connection.fetch",
-            "Connection.fetchval",
-            "Connection.fetchrow",
-        ]:
+        for method, many in _CONNECTION_METHODS:
             wrapt.wrap_function_wrapper(
-                "asyncpg.connection", method, self._do_execute
+                "asyncpg.connection",
+                "Connection." + method,
+                partial(self._do_execute, many=many),
             )
+        wrapt.wrap_function_wrapper(
+            "asyncpg.connection", "Connection.prepare", self._do_prepare
+        )
+        wrapt.wrap_function_wrapper(
+            "asyncpg.connection",
+            "Connection.copy_records_to_table",
+            self._do_copy_records,
+        )
+
+        for method, many in _PREPARED_STATEMENT_METHODS:
+            if hasattr(asyncpg.prepared_stmt.PreparedStatement, method):
+                wrapt.wrap_function_wrapper(
+                    "asyncpg.prepared_stmt",
+                    "PreparedStatement." + method,
+                    partial(self._do_prepared_execute, many=many),
+                )
+
+        for cls, method in _CURSOR_METHODS:
+            if hasattr(getattr(asyncpg.cursor, cls), method):
+                wrapt.wrap_function_wrapper(
+                    "asyncpg.cursor",
+                    cls + "." + method,
+                    self._do_cursor_execute,
+                )
 
     def _uninstrument(self, **__):
-        for method in [
-            "execute",
-            "executemany",
-            "fetch",
-            "fetchval",
-            "fetchrow",
-        ]:
+        for method, _ in _CONNECTION_METHODS:
             unwrap(asyncpg.Connection, method)
+        unwrap(asyncpg.Connection, "prepare")
+        unwrap(asyncpg.Connection, "copy_records_to_table")
+        for method, _ in _PREPARED_STATEMENT_METHODS:
+            unwrap(asyncpg.prepared_stmt.PreparedStatement, method)
+        for cls, method in _CURSOR_METHODS:
+            unwrap(getattr(asyncpg.cursor, cls), method)
+        self._connection_details = weakref.WeakKeyDictionary()
+
+    def _get_connection_details(self, connection) -> _ConnectionDetails:
+        try:
+            details = self._connection_details.get(connection)
+        except TypeError:
+            # the connection cannot be weakly referenced
+            return _ConnectionDetails(connection)
+        if details is None:
+            details = self._connection_details[
+                connection
+            ] = _ConnectionDetails(connection)
+        return details
 
-    async def _do_execute(self, func, instance, args, kwargs):
+    def _get_statement_details(self, connection, query):
+        """Returns the span name and attributes of a statement executed on a
+        connection, cached per connection so that they are built once."""
+        if query is not None and len(query) > _MAX_CACHED_STATEMENT_LENGTH:
+            return self._build_statement_details(connection, query)
+        statements = self._get_connection_details(connection).statements
+        details = statements.get(query)
+        if details is None:
+            if len(statements) >= _MAX_CACHED_STATEMENTS:
+                del statements[next(iter(statements))]
+            details = statements[query] = self._build_statement_details(
+                connection, query
+            )
+        return details
 
-        exception = None
-        params = getattr(instance, "_params", {})
-        name = args[0] if args[0] else params.get("database", "postgresql")
+    def _build_statement_details(self, connection, query):
+        attributes = dict(self._get_connection_details(connection).attributes)
+        if query:
+            name = query
+            if self._statement_sanitizer:
+                query = self._statement_sanitizer(query)
+            attributes[SpanAttributes.DB_STATEMENT] = query
+        else:
+            name = attributes.get(SpanAttributes.DB_NAME, "postgresql")
+            if query is not None:
+                attributes[SpanAttributes.DB_STATEMENT] = query
+        return name, attributes
 
+    async def _trace(
+        self, name, attributes, parameters, many, func, args, kwargs
+    ):
         with self._tracer.start_as_current_span(
-            name, kind=SpanKind.CLIENT
+            name, kind=SpanKind.CLIENT, attributes=attributes
         ) as span:
-            if span.is_recording():
-                span_attributes = _hydrate_span_from_args(
-                    instance,
-                    args[0],
-                    args[1:] if self.capture_parameters else None,
+            if self.capture_parameters and parameters and span.is_recording():
+                span.set_attributes(
+                    get_parameters_attributes(
+                        parameters[0] if many else parameters,
+                        many=many,
+                        max_length=self.max_parameters_length,
+                    )
                 )
-                for attribute, value in span_attributes.items():
-                    span.set_attribute(attribute, value)
-
             try:
-                result = await func(*args, **kwargs)
-            except Exception as exc:  # pylint: disable=W0703
-                exception = exc
-                raise
-            finally:
-                if span.is_recording() and exception is not None:
+                return await func(*args, **kwargs)
+            except Exception:  # pylint: disable=W0703
+                if span.is_recording():
                     span.set_status(Status(StatusCode.ERROR))
+                raise
+
+    async def _do_execute(self, func, instance, args, kwargs, many=False):
+        name, attributes = self._get_statement_details(instance, args[0])
+        return await self._trace(
+            name, attributes, args[1:], many, func, args, kwargs
+        )
+
+    async def _do_prepare(self, func, instance, args, kwargs):
+        statement = await func(*args, **kwargs)
+        # the statement text is captured when the statement is prepared, so
+        # that its executions only start and end a span
+        self._get_statement_details(instance, statement.get_query())
+        return statement
+
+    async def _do_prepared_execute(
+        self, func, instance, args, kwargs, many=False
+    ):
+        # pylint: disable=protected-access
+        name, attributes = self._get_statement_details(
+            instance._connection, instance._query
+        )
+        return await self._trace(
+            name, attributes, args, many, func, args, kwargs
+        )
+
+    async def _do_cursor_execute(self, func, instance, args, kwargs):
+        # pylint: disable=protected-access
+        name, attributes = self._get_statement_details(
+            instance._connection, instance._query
+        )
+        return await self._trace(
+            name, attributes, instance._args, False, func, args, kwargs
+        )
+
+    async def _do_copy_records(self, func, instance, args, kwargs):
+        table_name = args[0] if args else kwargs.get("table_name")
+        schema_name = kwargs.get("schema_name")
+        if schema_name:
+            table_name = schema_name + "." + table_name
 
-        return result
+        attributes = dict(self._get_connection_details(instance).attributes)
+        attributes[SpanAttributes.DB_OPERATION] = "COPY"
+        attributes[SpanAttributes.DB_SQL_TABLE] = table_name
+        return await self._trace(
+            "COPY " + table_name,
+            attributes,
+            (kwargs.get("records"),),
+            True,
+            func,
+            args,
+            kwargs,
+        )
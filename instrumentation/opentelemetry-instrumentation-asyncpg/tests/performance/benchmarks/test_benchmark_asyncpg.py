@@ -0,0 +1,75 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from collections import namedtuple
+
+from opentelemetry.instrumentation.asyncpg import AsyncPGInstrumentor
+from opentelemetry.instrumentation.sql import SqlSanitizer
+from opentelemetry.sdk.trace import TracerProvider
+
+QUERY = "SELECT * FROM users WHERE id = $1 AND status = 'active'"
+QUERY_COUNT = 1000
+
+ConnectionParameters = namedtuple("ConnectionParameters", ("database", "user"))
+
+
+class Connection:
+    _params = ConnectionParameters("database", "user")
+    _addr = ("localhost", 5432)
+
+
+class PreparedStatement:
+    def __init__(self, connection, query):
+        self._connection = connection
+        self._query = query
+
+
+async def fetch(*args, **kwargs):
+    pass
+
+
+statement = PreparedStatement(Connection(), QUERY)
+loop = asyncio.new_event_loop()
+
+
+def instrument():
+    instrumentor = AsyncPGInstrumentor()
+    instrumentor.instrument(
+        tracer_provider=TracerProvider(), statement_sanitizer=SqlSanitizer()
+    )
+    return instrumentor
+
+
+async def execute_prepared(instrumentor):
+    for value in range(QUERY_COUNT):
+        await instrumentor._do_prepared_execute(fetch, statement, (value,), {})
+
+
+def test_prepared_statement_fetch(benchmark):
+    instrumentor = instrument()
+    benchmark(lambda: loop.run_until_complete(execute_prepared(instrumentor)))
+    instrumentor.uninstrument()
+
+
+async def execute(instrumentor):
+    connection = statement._connection
+    for value in range(QUERY_COUNT):
+        await instrumentor._do_execute(fetch, connection, (QUERY, value), {})
+
+
+def test_connection_fetch(benchmark):
+    instrumentor = instrument()
+    benchmark(lambda: loop.run_until_complete(execute(instrumentor)))
+    instrumentor.uninstrument()
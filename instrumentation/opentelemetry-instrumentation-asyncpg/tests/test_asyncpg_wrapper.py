@@ -1,9 +1,23 @@
+import asyncio
+from unittest import mock
+
 from asyncpg import Connection
+from asyncpg.cursor import BaseCursor
+from asyncpg.prepared_stmt import PreparedStatement
+from wrapt import ObjectProxy
 
 from opentelemetry.instrumentation.asyncpg import AsyncPGInstrumentor
+from opentelemetry.instrumentation.sql import SqlSanitizer
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.test.test_base import TestBase
 
 
+def async_call(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
 class TestAsyncPGInstrumentation(TestBase):
     def test_duplicated_instrumentation(self):
         AsyncPGInstrumentor().instrument()
@@ -26,3 +40,279 @@ class TestAsyncPGInstrumentation(TestBase):
             self.assertFalse(
                 hasattr(method, "_opentelemetry_ext_asyncpg_applied")
             )
+
+    def test_statement_sanitizer(self):
+        async def execute(*args, **kwargs):
+            return "result"
+
+        instrumentor = AsyncPGInstrumentor()
+        instrumentor.instrument(statement_sanitizer=SqlSanitizer())
+        self.addCleanup(instrumentor.uninstrument)
+
+        result = async_call(
+            instrumentor._do_execute(
+                execute,
+                mock.Mock(_params=None, _addr=None),
+                ("SELECT * FROM test WHERE id = 42",),
+                {},
+            )
+        )
+
+        self.assertEqual(result, "result")
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 1)
+        self.assertEqual(
+            spans_list[0].attributes[SpanAttributes.DB_STATEMENT],
+            "SELECT * FROM test WHERE id = ?",
+        )
+
+    def test_executemany_capture_parameters(self):
+        async def executemany(*args, **kwargs):
+            pass
+
+        instrumentor = AsyncPGInstrumentor(
+            capture_parameters=True, max_parameters_length=20
+        )
+        instrumentor.instrument()
+        self.addCleanup(instrumentor.uninstrument)
+
+        rows = [[index] for index in range(100)]
+        async_call(
+            instrumentor._do_execute(
+                executemany,
+                mock.Mock(_params=None, _addr=None),
+                ("INSERT INTO test VALUES ($1)", rows),
+                {},
+                many=True,
+            )
+        )
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 1)
+        attributes = spans_list[0].attributes
+        self.assertEqual(
+            attributes["db.statement.parameters"], "[[0], [1], [2], [..."
+        )
+        self.assertEqual(attributes["db.statement.parameters.batch_size"], 100)
+        # estimated from the length of the sampled rows
+        self.assertEqual(
+            attributes["db.statement.parameters.size"], 3 * 100 + 2 * 100
+        )
+
+    def test_parameters_not_formatted_when_not_recording(self):
+        async def execute(*args, **kwargs):
+            pass
+
+        instrumentor = AsyncPGInstrumentor(capture_parameters=True)
+        instrumentor.instrument(
+            tracer_provider=TracerProvider(sampler=ALWAYS_OFF)
+        )
+        self.addCleanup(instrumentor.uninstrument)
+
+        with mock.patch(
+            "opentelemetry.instrumentation.asyncpg.get_parameters_attributes"
+        ) as get_parameters_attributes:
+            async_call(
+                instrumentor._do_execute(
+                    execute,
+                    mock.Mock(_params=None, _addr=None),
+                    ("SELECT $1", 42),
+                    {},
+                )
+            )
+
+        self.assertFalse(get_parameters_attributes.called)
+
+    def test_long_statement_not_cached(self):
+        async def execute(*args, **kwargs):
+            pass
+
+        instrumentor = AsyncPGInstrumentor()
+        instrumentor.instrument()
+        self.addCleanup(instrumentor.uninstrument)
+
+        connection = mock.Mock(_params=None, _addr=None)
+        long_query = "INSERT INTO test VALUES " + ", ".join(["(1)"] * 3000)
+        for query in ("SELECT 1", long_query):
+            async_call(
+                instrumentor._do_execute(execute, connection, (query,), {})
+            )
+
+        self.assertEqual(
+            list(instrumentor._connection_details[connection].statements),
+            ["SELECT 1"],
+        )
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 2)
+        self.assertEqual(
+            spans_list[1].attributes[SpanAttributes.DB_STATEMENT], long_query
+        )
+
+    def test_uninstrument_prepared_statements_and_cursors(self):
+        AsyncPGInstrumentor().instrument()
+        self.assertIsInstance(PreparedStatement.fetch, ObjectProxy)
+        self.assertIsInstance(BaseCursor._exec, ObjectProxy)
+
+        AsyncPGInstrumentor().uninstrument()
+        for method in (
+            Connection.prepare,
+            Connection.copy_records_to_table,
+            PreparedStatement.fetch,
+            PreparedStatement.executemany,
+            BaseCursor._bind_exec,
+            BaseCursor._exec,
+        ):
+            self.assertNotIsInstance(method, ObjectProxy)
+
+    def test_prepared_statement(self):
+        async def prepare(query, **kwargs):
+            return mock.Mock(get_query=mock.Mock(return_value=query))
+
+        async def fetch(*args, **kwargs):
+            return "result"
+
+        sanitizer = mock.Mock(side_effect=SqlSanitizer())
+        instrumentor = AsyncPGInstrumentor(capture_parameters=True)
+        instrumentor.instrument(statement_sanitizer=sanitizer)
+        self.addCleanup(instrumentor.uninstrument)
+
+        connection = mock.Mock(_params=None, _addr=("localhost", 5432))
+        query = "SELECT * FROM test WHERE id = $1 AND active = 1"
+        async_call(instrumentor._do_prepare(prepare, connection, (query,), {}))
+        self.assertEqual(sanitizer.call_count, 1)
+
+        statement = mock.Mock(_connection=connection, _query=query)
+        for value in (1, 2):
+            result = async_call(
+                instrumentor._do_prepared_execute(
+                    fetch, statement, (value,), {}
+                )
+            )
+            self.assertEqual(result, "result")
+
+        # the statement was sanitized when it was prepared
+        self.assertEqual(sanitizer.call_count, 1)
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 2)
+        for span, value in zip(spans_list, (1, 2)):
+            self.assertEqual(span.name, query)
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_STATEMENT],
+                "SELECT * FROM test WHERE id = $1 AND active = ?",
+            )
+            self.assertEqual(
+                span.attributes[SpanAttributes.NET_PEER_NAME], "localhost"
+            )
+            self.assertEqual(
+                span.attributes["db.statement.parameters"],
+                "({},)".format(value),
+            )
+
+    def test_prepared_statement_fetchmany(self):
+        async def fetchmany(args, **kwargs):
+            pass
+
+        instrumentor = AsyncPGInstrumentor(capture_parameters=True)
+        instrumentor.instrument()
+        self.addCleanup(instrumentor.uninstrument)
+
+        statement = mock.Mock(
+            _connection=mock.Mock(_params=None, _addr=None),
+            _query="SELECT $1",
+        )
+        async_call(
+            instrumentor._do_prepared_execute(
+                fetchmany, statement, ([[1], [2]],), {}, many=True
+            )
+        )
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 1)
+        attributes = spans_list[0].attributes
+        self.assertEqual(attributes["db.statement.parameters"], "[[1], [2]]")
+        self.assertEqual(attributes["db.statement.parameters.batch_size"], 2)
+
+    def test_cursor(self):
+        async def _exec(n, timeout):
+            pass
+
+        instrumentor = AsyncPGInstrumentor(capture_parameters=True)
+        instrumentor.instrument()
+        self.addCleanup(instrumentor.uninstrument)
+
+        cursor = mock.Mock(
+            _connection=mock.Mock(_params=None, _addr=None),
+            _query="SELECT * FROM test WHERE id > $1",
+            _args=(42,),
+        )
+        async_call(
+            instrumentor._do_cursor_execute(_exec, cursor, (50, None), {})
+        )
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 1)
+        self.assertEqual(
+            spans_list[0].name, "SELECT * FROM test WHERE id > $1"
+        )
+        self.assertEqual(
+            spans_list[0].attributes[SpanAttributes.DB_STATEMENT],
+            "SELECT * FROM test WHERE id > $1",
+        )
+        self.assertEqual(
+            spans_list[0].attributes["db.statement.parameters"], "(42,)"
+        )
+
+    def test_copy_records_to_table(self):
+        async def copy_records_to_table(table_name, **kwargs):
+            pass
+
+        instrumentor = AsyncPGInstrumentor(capture_parameters=True)
+        instrumentor.instrument()
+        self.addCleanup(instrumentor.uninstrument)
+
+        records = [(index, "name") for index in range(20)]
+        async_call(
+            instrumentor._do_copy_records(
+                copy_records_to_table,
+                mock.Mock(_params=None, _addr=None),
+                ("users",),
+                {"records": records, "schema_name": "public"},
+            )
+        )
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 1)
+        self.assertEqual(spans_list[0].name, "COPY public.users")
+        attributes = spans_list[0].attributes
+        self.assertEqual(attributes[SpanAttributes.DB_OPERATION], "COPY")
+        self.assertEqual(
+            attributes[SpanAttributes.DB_SQL_TABLE], "public.users"
+        )
+        self.assertEqual(attributes["db.statement.parameters.batch_size"], 20)
+
+    def test_connection_attributes_cached(self):
+        async def execute(*args, **kwargs):
+            pass
+
+        instrumentor = AsyncPGInstrumentor()
+        instrumentor.instrument()
+        self.addCleanup(instrumentor.uninstrument)
+
+        connection = mock.Mock(_params=None, _addr="/tmp/.s.PGSQL.5432")
+        for query in ("SELECT 1", "SELECT 2"):
+            async_call(
+                instrumentor._do_execute(execute, connection, (query,), {})
+            )
+
+        connection._addr = ("localhost", 5432)
+        async_call(
+            instrumentor._do_execute(execute, connection, ("SELECT 3",), {})
+        )
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 3)
+        for span in spans_list:
+            self.assertEqual(
+                span.attributes[SpanAttributes.NET_PEER_NAME],
+                "/tmp/.s.PGSQL.5432",
+            )
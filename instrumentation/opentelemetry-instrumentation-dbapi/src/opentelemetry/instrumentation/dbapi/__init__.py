@@ -37,21 +37,33 @@ API
 ---
 """
 
+import collections
 import functools
 import logging
 import typing
+from types import MappingProxyType
 
 import wrapt
 
-from opentelemetry import trace as trace_api
+from opentelemetry import context as context_api
 from opentelemetry.instrumentation.dbapi.version import __version__
+from opentelemetry.instrumentation.sql import (
+    DEFAULT_MAX_PARAMETERS_LENGTH,
+    get_parameters_attributes,
+)
 from opentelemetry.instrumentation.utils import unwrap
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace import SpanKind, TracerProvider, get_tracer
 from opentelemetry.trace.status import Status, StatusCode
+from opentelemetry.util._time import _time_ns
 
 logger = logging.getLogger(__name__)
 
+_FETCH_ROWS = "db.fetch.rows"
+_FETCH_CALLS = "db.fetch.calls"
+# total duration of the fetch calls, in nanoseconds
+_FETCH_DURATION = "db.fetch.duration"
+
 
 def trace_integration(
     connect_module: typing.Callable[..., typing.Any],
@@ -61,6 +73,9 @@ def trace_integration(
     tracer_provider: typing.Optional[TracerProvider] = None,
     capture_parameters: bool = False,
     db_api_integration_factory=None,
+    statement_sanitizer: typing.Optional[typing.Callable[[str], str]] = None,
+    max_parameters_length: int = DEFAULT_MAX_PARAMETERS_LENGTH,
+    record_fetches: bool = False,
 ):
     """Integrate with DB API library.
     https://www.python.org/dev/peps/pep-0249/
@@ -75,6 +90,13 @@ def trace_integration(
         tracer_provider: The :class:`opentelemetry.trace.TracerProvider` to
             use. If omitted the current configured one is used.
         capture_parameters: Configure if db.statement.parameters should be captured.
+        statement_sanitizer: Optional callable returning the value of the
+            db.statement attribute from the executed statement, for instance
+            a :class:`opentelemetry.instrumentation.sql.SqlSanitizer`.
+        max_parameters_length: Maximum length in bytes of the captured
+            db.statement.parameters.
+        record_fetches: Whether the fetches of the results of a statement are
+            recorded in a span following the span of its execution.
     """
     wrap_connect(
         __name__,
@@ -86,6 +108,9 @@ def trace_integration(
         tracer_provider=tracer_provider,
         capture_parameters=capture_parameters,
         db_api_integration_factory=db_api_integration_factory,
+        statement_sanitizer=statement_sanitizer,
+        max_parameters_length=max_parameters_length,
+        record_fetches=record_fetches,
     )
 
 
@@ -99,6 +124,9 @@ def wrap_connect(
     tracer_provider: typing.Optional[TracerProvider] = None,
     capture_parameters: bool = False,
     db_api_integration_factory=None,
+    statement_sanitizer: typing.Optional[typing.Callable[[str], str]] = None,
+    max_parameters_length: int = DEFAULT_MAX_PARAMETERS_LENGTH,
+    record_fetches: bool = False,
 ):
     """Integrate with DB API library.
     https://www.python.org/dev/peps/pep-0249/
@@ -113,6 +141,13 @@ def wrap_connect(
         tracer_provider: The :class:`opentelemetry.trace.TracerProvider` to
             use. If omitted the current configured one is used.
         capture_parameters: Configure if db.statement.parameters should be captured.
+        statement_sanitizer: Optional callable returning the value of the
+            db.statement attribute from the executed statement, for instance
+            a :class:`opentelemetry.instrumentation.sql.SqlSanitizer`.
+        max_parameters_length: Maximum length in bytes of the captured
+            db.statement.parameters.
+        record_fetches: Whether the fetches of the results of a statement are
+            recorded in a span following the span of its execution.
 
     """
     db_api_integration_factory = (
@@ -133,6 +168,9 @@ def wrap_connect(
             version=version,
             tracer_provider=tracer_provider,
             capture_parameters=capture_parameters,
+            statement_sanitizer=statement_sanitizer,
+            max_parameters_length=max_parameters_length,
+            record_fetches=record_fetches,
         )
         return db_integration.wrapped_connection(wrapped, args, kwargs)
 
@@ -165,6 +203,9 @@ def instrument_connection(
     version: str = "",
     tracer_provider: typing.Optional[TracerProvider] = None,
     capture_parameters=False,
+    statement_sanitizer: typing.Optional[typing.Callable[[str], str]] = None,
+    max_parameters_length: int = DEFAULT_MAX_PARAMETERS_LENGTH,
+    record_fetches: bool = False,
 ):
     """Enable instrumentation in a database connection.
 
@@ -177,6 +218,13 @@ def instrument_connection(
         tracer_provider: The :class:`opentelemetry.trace.TracerProvider` to
             use. If omitted the current configured one is used.
         capture_parameters: Configure if db.statement.parameters should be captured.
+        statement_sanitizer: Optional callable returning the value of the
+            db.statement attribute from the executed statement, for instance
+            a :class:`opentelemetry.instrumentation.sql.SqlSanitizer`.
+        max_parameters_length: Maximum length in bytes of the captured
+            db.statement.parameters.
+        record_fetches: Whether the fetches of the results of a statement are
+            recorded in a span following the span of its execution.
     Returns:
         An instrumented connection.
     """
@@ -191,6 +239,9 @@ def instrument_connection(
         version=version,
         tracer_provider=tracer_provider,
         capture_parameters=capture_parameters,
+        statement_sanitizer=statement_sanitizer,
+        max_parameters_length=max_parameters_length,
+        record_fetches=record_fetches,
     )
     db_integration.get_connection_attributes(connection)
     return get_traced_connection_proxy(connection, db_integration)
@@ -213,6 +264,11 @@ def uninstrument_connection(connection):
 
 
 class DatabaseApiIntegration:
+    # number of statements for which the span name and attributes are cached
+    max_statement_cache_size = 512
+    # longer statements are not cached as they are unlikely to be repeated
+    max_cached_statement_length = 8192
+
     def __init__(
         self,
         name: str,
@@ -221,6 +277,11 @@ class DatabaseApiIntegration:
         version: str = "",
         tracer_provider: typing.Optional[TracerProvider] = None,
         capture_parameters: bool = False,
+        statement_sanitizer: typing.Optional[
+            typing.Callable[[str], str]
+        ] = None,
+        max_parameters_length: int = DEFAULT_MAX_PARAMETERS_LENGTH,
+        record_fetches: bool = False,
     ):
         self.connection_attributes = connection_attributes
         if self.connection_attributes is None:
@@ -238,11 +299,20 @@ class DatabaseApiIntegration:
             tracer_provider=tracer_provider,
         )
         self.capture_parameters = capture_parameters
+        self.statement_sanitizer = statement_sanitizer
+        self.max_parameters_length = max_parameters_length
+        self.record_fetches = record_fetches
         self.database_system = database_system
         self.connection_props = {}
         self.span_attributes = {}
         self.name = ""
         self.database = ""
+        # span name and attributes by statement, from the least to the most
+        # recently used
+        self._statement_cache = collections.OrderedDict()
+        self._connection_span_attributes = self._freeze_span_attributes()
+        # shared by the cursors of the connections of this integration
+        self._cursor_tracer = CursorTracer(self)
 
     def wrapped_connection(
         self,
@@ -256,6 +326,8 @@ class DatabaseApiIntegration:
         return get_traced_connection_proxy(connection, self)
 
     def get_connection_attributes(self, connection):
+        # cached span attributes include the connection attributes
+        self._statement_cache.clear()
         # Populate span fields using connection
         for key, value in self.connection_attributes.items():
             # Allow attributes nested in connection object
@@ -287,61 +359,110 @@ class DatabaseApiIntegration:
         port = self.connection_props.get("port")
         if port is not None:
             self.span_attributes[SpanAttributes.NET_PEER_PORT] = port
+        self._connection_span_attributes = self._freeze_span_attributes()
 
+    def _freeze_span_attributes(self) -> typing.Mapping[str, typing.Any]:
+        """Returns the attributes of the connection set on every span."""
+        attributes = {
+            SpanAttributes.DB_SYSTEM: self.database_system,
+            SpanAttributes.DB_NAME: self.database,
+        }
+        attributes.update(self.span_attributes)
+        return MappingProxyType(attributes)
 
-def get_traced_connection_proxy(
-    connection, db_api_integration, *args, **kwargs
-):
-    # pylint: disable=abstract-method
-    class TracedConnectionProxy(wrapt.ObjectProxy):
-        # pylint: disable=unused-argument
-        def __init__(self, connection, *args, **kwargs):
-            wrapt.ObjectProxy.__init__(self, connection)
-
-        def cursor(self, *args, **kwargs):
-            return get_traced_cursor_proxy(
-                self.__wrapped__.cursor(*args, **kwargs), db_api_integration
-            )
 
-        def __enter__(self):
-            self.__wrapped__.__enter__()
-            return self
+# pylint: disable=abstract-method
+class TracedConnectionProxy(wrapt.ObjectProxy):
+    __slots__ = ("_self_db_api_integration",)
+
+    # pylint: disable=unused-argument
+    def __init__(self, connection, db_api_integration, *args, **kwargs):
+        wrapt.ObjectProxy.__init__(self, connection)
+        self._self_db_api_integration = db_api_integration
+
+    def cursor(self, *args, **kwargs):
+        return get_traced_cursor_proxy(
+            self.__wrapped__.cursor(*args, **kwargs),
+            self._self_db_api_integration,
+        )
 
-        def __exit__(self, *args, **kwargs):
-            self.__wrapped__.__exit__(*args, **kwargs)
+    def __enter__(self):
+        self.__wrapped__.__enter__()
+        return self
 
-    return TracedConnectionProxy(connection, *args, **kwargs)
+    def __exit__(self, *args, **kwargs):
+        self.__wrapped__.__exit__(*args, **kwargs)
+
+
+def get_traced_connection_proxy(
+    connection, db_api_integration, *args, **kwargs
+):
+    return TracedConnectionProxy(
+        connection, db_api_integration, *args, **kwargs
+    )
 
 
 class CursorTracer:
     def __init__(self, db_api_integration: DatabaseApiIntegration):
         self._db_api_integration = db_api_integration
 
-    def _populate_span(
-        self,
-        span: trace_api.Span,
-        cursor,
-        *args: typing.Tuple[typing.Any, typing.Any]
-    ):
-        if not span.is_recording():
-            return
-        statement = self.get_statement(cursor, args)
-        span.set_attribute(
-            SpanAttributes.DB_SYSTEM, self._db_api_integration.database_system
-        )
-        span.set_attribute(
-            SpanAttributes.DB_NAME, self._db_api_integration.database
+    def _set_parameters_attributes(self, span, args, many=False):
+        span.set_attributes(
+            get_parameters_attributes(
+                args[1],
+                many=many,
+                max_length=self._db_api_integration.max_parameters_length,
+            )
         )
-        span.set_attribute(SpanAttributes.DB_STATEMENT, statement)
 
-        for (
-            attribute_key,
-            attribute_value,
-        ) in self._db_api_integration.span_attributes.items():
-            span.set_attribute(attribute_key, attribute_value)
+    def _get_span_details(
+        self, cursor, args
+    ) -> typing.Tuple[str, typing.Mapping[str, typing.Any]]:
+        """Returns the span name and the attributes of the span of an
+        execution of a statement.
+
+        They are cached by statement when it is a string which is not too
+        long, as they only depend on the statement and the connection.
+        """
+        statement = args[0] if args else None
+        db_api_integration = self._db_api_integration
+        max_length = db_api_integration.max_cached_statement_length
+        cacheable = (
+            isinstance(statement, (str, bytes))
+            and len(statement) <= max_length
+        )
+        if cacheable:
+            cache = db_api_integration._statement_cache
+            details = cache.get(statement)
+            if details is not None:
+                try:
+                    cache.move_to_end(statement)
+                except KeyError:  # evicted by another thread
+                    pass
+                return details
 
-        if self._db_api_integration.capture_parameters and len(args) > 1:
-            span.set_attribute("db.statement.parameters", str(args[1]))
+        name = self.get_operation_name(cursor, args)
+        if not name:
+            name = (
+                db_api_integration.database
+                if db_api_integration.database
+                else db_api_integration.name
+            )
+        db_statement = self.get_statement(cursor, args)
+        if db_api_integration.statement_sanitizer is not None:
+            db_statement = db_api_integration.statement_sanitizer(db_statement)
+        attributes = dict(db_api_integration._connection_span_attributes)
+        attributes[SpanAttributes.DB_STATEMENT] = db_statement
+        details = (name, MappingProxyType(attributes))
+
+        if cacheable:
+            cache[statement] = details
+            if len(cache) > db_api_integration.max_statement_cache_size:
+                try:
+                    cache.popitem(last=False)
+                except KeyError:  # evicted by another thread
+                    pass
+        return details
 
     def get_operation_name(self, cursor, args):  # pylint: disable=no-self-use
         if args and isinstance(args[0], str):
@@ -363,51 +484,248 @@ class CursorTracer:
         *args: typing.Tuple[typing.Any, typing.Any],
         **kwargs: typing.Dict[typing.Any, typing.Any]
     ):
-        name = self.get_operation_name(cursor, args)
-        if not name:
-            name = (
-                self._db_api_integration.database
-                if self._db_api_integration.database
-                else self._db_api_integration.name
-            )
+        return self._traced_execution(cursor, query_method, args, kwargs)
+
+    def traced_executemany(
+        self,
+        cursor,
+        query_method: typing.Callable[..., typing.Any],
+        *args: typing.Tuple[typing.Any, typing.Any],
+        **kwargs: typing.Dict[typing.Any, typing.Any]
+    ):
+        """Traces the execution of a statement with a batch of parameters,
+        of which only a sample is recorded."""
+        return self._traced_execution(
+            cursor, query_method, args, kwargs, many=True
+        )
+
+    def _traced_execution(
+        self, cursor, query_method, args, kwargs, many=False
+    ):
+        name, attributes = self._get_span_details(cursor, args)
 
         with self._db_api_integration._tracer.start_as_current_span(
-            name, kind=SpanKind.CLIENT
+            name, kind=SpanKind.CLIENT, attributes=attributes
         ) as span:
-            self._populate_span(span, cursor, *args)
+            if (
+                self._db_api_integration.capture_parameters
+                and len(args) > 1
+                and span.is_recording()
+            ):
+                self._set_parameters_attributes(span, args, many=many)
             return query_method(*args, **kwargs)
 
 
-def get_traced_cursor_proxy(cursor, db_api_integration, *args, **kwargs):
-    _cursor_tracer = CursorTracer(db_api_integration)
+# pylint: disable=abstract-method
+class TracedCursorProxy(wrapt.ObjectProxy):
+    __slots__ = ("_self_cursor_tracer",)
 
-    # pylint: disable=abstract-method
-    class TracedCursorProxy(wrapt.ObjectProxy):
+    # pylint: disable=unused-argument
+    def __init__(self, cursor, cursor_tracer, *args, **kwargs):
+        wrapt.ObjectProxy.__init__(self, cursor)
+        self._self_cursor_tracer = cursor_tracer
 
-        # pylint: disable=unused-argument
-        def __init__(self, cursor, *args, **kwargs):
-            wrapt.ObjectProxy.__init__(self, cursor)
+    def execute(self, *args, **kwargs):
+        return self._self_cursor_tracer.traced_execution(
+            self.__wrapped__, self.__wrapped__.execute, *args, **kwargs
+        )
 
-        def execute(self, *args, **kwargs):
-            return _cursor_tracer.traced_execution(
-                self.__wrapped__, self.__wrapped__.execute, *args, **kwargs
-            )
+    def executemany(self, *args, **kwargs):
+        return self._self_cursor_tracer.traced_executemany(
+            self.__wrapped__, self.__wrapped__.executemany, *args, **kwargs
+        )
 
-        def executemany(self, *args, **kwargs):
-            return _cursor_tracer.traced_execution(
-                self.__wrapped__, self.__wrapped__.executemany, *args, **kwargs
-            )
+    def callproc(self, *args, **kwargs):
+        return self._self_cursor_tracer.traced_execution(
+            self.__wrapped__, self.__wrapped__.callproc, *args, **kwargs
+        )
 
-        def callproc(self, *args, **kwargs):
-            return _cursor_tracer.traced_execution(
-                self.__wrapped__, self.__wrapped__.callproc, *args, **kwargs
-            )
+    def __enter__(self):
+        self.__wrapped__.__enter__()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.__wrapped__.__exit__(*args, **kwargs)
+
+
+class _FetchStats:
+    """Fetches of the results of a statement."""
+
+    __slots__ = (
+        "args",
+        "context",
+        "start_time",
+        "end_time",
+        "duration",
+        "rows",
+        "calls",
+    )
+
+    def __init__(self, args):
+        self.args = args
+        self.context = None
+        self.start_time = None
+        self.end_time = None
+        self.duration = 0
+        self.rows = 0
+        self.calls = 0
+
+
+_EXHAUSTED = object()
+
+
+# pylint: disable=abstract-method
+class TracedFetchCursorProxy(TracedCursorProxy):
+    """Cursor proxy also recording the fetches of the results of the
+    statements.
+
+    The duration of the fetch calls, the number of calls and the number of
+    rows fetched are accumulated and recorded in a single span once the
+    results are exhausted, another statement is executed or the cursor is
+    closed. The span starts with the first fetch and ends with the last one.
+    """
+
+    __slots__ = ("_self_fetch_stats",)
+
+    def __init__(self, cursor, cursor_tracer, *args, **kwargs):
+        TracedCursorProxy.__init__(self, cursor, cursor_tracer)
+        self._self_fetch_stats = None
+
+    def execute(self, *args, **kwargs):
+        return self._traced_execution(self.__wrapped__.execute, args, kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self._traced_execution(
+            self.__wrapped__.executemany, args, kwargs, many=True
+        )
+
+    def callproc(self, *args, **kwargs):
+        return self._traced_execution(self.__wrapped__.callproc, args, kwargs)
+
+    def fetchone(self, *args, **kwargs):
+        row = self._fetch(self.__wrapped__.fetchone, args, kwargs)
+        self._fetched(0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._fetch(self.__wrapped__.fetchmany, args, kwargs)
+        size = args[0] if args else kwargs.get("size")
+        if size is None:
+            size = getattr(self.__wrapped__, "arraysize", 1)
+        self._fetched(len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self, *args, **kwargs):
+        rows = self._fetch(self.__wrapped__.fetchall, args, kwargs)
+        self._fetched(len(rows), True)
+        return rows
+
+    def __iter__(self):
+        stats = self._self_fetch_stats
+        iterator = iter(self.__wrapped__)
+        if stats is None:
+            yield from iterator
+            return
 
-        def __enter__(self):
-            self.__wrapped__.__enter__()
+        # inlined fetches, this is called for every row
+        while True:
+            start_time = _time_ns()
+            row = next(iterator, _EXHAUSTED)
+            end_time = _time_ns()
+            if stats.start_time is None:
+                stats.start_time = start_time
+                stats.context = context_api.get_current()
+            stats.end_time = end_time
+            stats.duration += end_time - start_time
+            stats.calls += 1
+            if row is _EXHAUSTED:
+                if stats is self._self_fetch_stats:
+                    self._end_fetch()
+                return
+            stats.rows += 1
+            yield row
+
+    def close(self, *args, **kwargs):
+        self._end_fetch()
+        return self.__wrapped__.close(*args, **kwargs)
+
+    def __exit__(self, *args, **kwargs):
+        self._end_fetch()
+        self.__wrapped__.__exit__(*args, **kwargs)
+
+    def _traced_execution(self, query_method, args, kwargs, many=False):
+        self._end_fetch()
+        # pylint: disable=protected-access
+        result = self._self_cursor_tracer._traced_execution(
+            self.__wrapped__, query_method, args, kwargs, many=many
+        )
+        # only the statement is kept, the parameters may be large
+        self._self_fetch_stats = _FetchStats(args[:1])
+        # some drivers return the cursor to chain a fetch
+        if result is self.__wrapped__:
             return self
+        return result
+
+    def _fetch(self, fetch_method, args, kwargs):
+        stats = self._self_fetch_stats
+        if stats is None:
+            return fetch_method(*args, **kwargs)
+
+        start_time = _time_ns()
+        try:
+            return fetch_method(*args, **kwargs)
+        finally:
+            end_time = _time_ns()
+            if stats.start_time is None:
+                stats.start_time = start_time
+                stats.context = context_api.get_current()
+            stats.end_time = end_time
+            stats.duration += end_time - start_time
+            stats.calls += 1
+
+    def _fetched(self, rows, exhausted):
+        stats = self._self_fetch_stats
+        if stats is None:
+            return
+        stats.rows += rows
+        if exhausted:
+            self._end_fetch()
+
+    def _end_fetch(self):
+        stats = self._self_fetch_stats
+        if stats is None:
+            return
+        self._self_fetch_stats = None
+        if stats.start_time is None:
+            return
+
+        cursor_tracer = self._self_cursor_tracer
+        name, attributes = cursor_tracer._get_span_details(
+            self.__wrapped__, stats.args
+        )
+        span = cursor_tracer._db_api_integration._tracer.start_span(
+            name + " fetch",
+            context=stats.context,
+            kind=SpanKind.CLIENT,
+            attributes=attributes,
+            start_time=stats.start_time,
+        )
+        if span.is_recording():
+            span.set_attributes(
+                {
+                    _FETCH_ROWS: stats.rows,
+                    _FETCH_CALLS: stats.calls,
+                    _FETCH_DURATION: stats.duration,
+                }
+            )
+        span.end(end_time=stats.end_time)
 
-        def __exit__(self, *args, **kwargs):
-            self.__wrapped__.__exit__(*args, **kwargs)
 
-    return TracedCursorProxy(cursor, *args, **kwargs)
+def get_traced_cursor_proxy(cursor, db_api_integration, *args, **kwargs):
+    if db_api_integration.record_fetches:
+        return TracedFetchCursorProxy(
+            cursor, db_api_integration._cursor_tracer, *args, **kwargs
+        )
+    return TracedCursorProxy(
+        cursor, db_api_integration._cursor_tracer, *args, **kwargs
+    )
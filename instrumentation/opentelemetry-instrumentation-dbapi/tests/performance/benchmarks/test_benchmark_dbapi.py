@@ -0,0 +1,103 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+
+from opentelemetry.instrumentation.dbapi import instrument_connection
+from opentelemetry.sdk.trace import TracerProvider
+
+QUERY_COUNT = 1000
+
+connection = instrument_connection(
+    __name__,
+    sqlite3.connect(":memory:"),
+    "sqlite",
+    {"database": "database"},
+    tracer_provider=TracerProvider(),
+)
+cursor = connection.cursor()
+cursor.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+cursor.executemany(
+    "INSERT INTO users (id, name) VALUES (?, ?)",
+    [(index, "user%d" % index) for index in range(100)],
+)
+connection.commit()
+
+fetch_connection = instrument_connection(
+    __name__,
+    sqlite3.connect(":memory:"),
+    "sqlite",
+    {"database": "database"},
+    tracer_provider=TracerProvider(),
+    record_fetches=True,
+)
+fetch_connection.cursor().execute(
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)"
+)
+fetch_connection.cursor().executemany(
+    "INSERT INTO users (id, name) VALUES (?, ?)",
+    [(index, "user%d" % index) for index in range(100)],
+)
+
+# the same few statements executed over and over, as issued by an ORM
+STATEMENTS = [
+    ("SELECT id, name FROM users WHERE id = ?", (1,)),
+    ("SELECT COUNT(*) FROM users", ()),
+    ("UPDATE users SET name = ? WHERE id = ?", ("name", 2)),
+    ("SELECT name FROM users WHERE name LIKE ? LIMIT 10", ("user1%",)),
+]
+
+
+def test_execute(benchmark):
+    def execute():
+        for index in range(QUERY_COUNT):
+            statement, parameters = STATEMENTS[index % len(STATEMENTS)]
+            cursor.execute(statement, parameters)
+
+    benchmark(execute)
+
+
+def test_cursor_creation(benchmark):
+    def create_cursors():
+        for _ in range(QUERY_COUNT):
+            connection.cursor()
+
+    benchmark(create_cursors)
+
+
+def test_cursor_creation_and_execute(benchmark):
+    def execute():
+        for index in range(QUERY_COUNT):
+            statement, parameters = STATEMENTS[index % len(STATEMENTS)]
+            connection.cursor().execute(statement, parameters)
+
+    benchmark(execute)
+
+
+def _fetch(fetch_cursor):
+    for _ in range(QUERY_COUNT // 10):
+        fetch_cursor.execute("SELECT id, name FROM users")
+        fetch_cursor.fetchmany(10)
+        fetch_cursor.fetchall()
+        fetch_cursor.execute("SELECT id, name FROM users")
+        for _ in fetch_cursor:
+            pass
+
+
+def test_fetch(benchmark):
+    benchmark(_fetch, connection.cursor())
+
+
+def test_fetch_recorded(benchmark):
+    benchmark(_fetch, fetch_connection.cursor())
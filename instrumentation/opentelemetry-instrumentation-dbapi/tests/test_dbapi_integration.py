@@ -14,10 +14,12 @@
 
 
 import logging
+import sqlite3
 from unittest import mock
 
 from opentelemetry import trace as trace_api
 from opentelemetry.instrumentation import dbapi
+from opentelemetry.instrumentation.sql import SqlSanitizer
 from opentelemetry.sdk import resources
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.test.test_base import TestBase
@@ -93,6 +95,228 @@ class TestDBApiIntegration(TestBase):
         self.assertEqual(spans_list[1].name, "multi")
         self.assertEqual(spans_list[2].name, "tab")
 
+    def test_statement_cache(self):
+        db_integration = dbapi.DatabaseApiIntegration(
+            "testname", "testcomponent", {"database": "database"}
+        )
+        db_integration.max_statement_cache_size = 2
+        mock_connection = db_integration.wrapped_connection(
+            mock_connect, {}, {"database": "testdatabase"}
+        )
+        cursor = mock_connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.execute(b"UPDATE 2")
+        cursor.execute("SELECT 1")
+        cursor.execute("DELETE 3")
+
+        # pylint: disable=protected-access
+        self.assertEqual(
+            list(db_integration._statement_cache), ["SELECT 1", "DELETE 3"]
+        )
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(
+            [span.name for span in spans_list],
+            ["SELECT", "testdatabase", "SELECT", "DELETE"],
+        )
+        self.assertEqual(
+            [
+                span.attributes[SpanAttributes.DB_STATEMENT]
+                for span in spans_list
+            ],
+            ["SELECT 1", "UPDATE 2", "SELECT 1", "DELETE 3"],
+        )
+        for span in spans_list:
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_NAME], "testdatabase"
+            )
+
+    def test_long_statement_not_cached(self):
+        db_integration = dbapi.DatabaseApiIntegration(
+            "testname", "testcomponent"
+        )
+        db_integration.max_cached_statement_length = 20
+        mock_connection = db_integration.wrapped_connection(
+            mock_connect, {}, {}
+        )
+        cursor = mock_connection.cursor()
+        long_statement = "INSERT INTO test VALUES " + "(1), " * 10 + "(1)"
+        cursor.execute("SELECT 1")
+        cursor.execute(long_statement)
+        cursor.execute(long_statement)
+
+        # pylint: disable=protected-access
+        self.assertEqual(list(db_integration._statement_cache), ["SELECT 1"])
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 3)
+        for span in spans_list[1:]:
+            self.assertEqual(span.name, "INSERT")
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_STATEMENT], long_statement
+            )
+
+    def test_statement_cache_cleared_on_connect(self):
+        db_integration = dbapi.DatabaseApiIntegration(
+            "testname", "testcomponent", {"database": "database"}
+        )
+        cursor = db_integration.wrapped_connection(
+            mock_connect, {}, {"database": "first"}
+        ).cursor()
+        cursor.execute("SELECT 1")
+        cursor = db_integration.wrapped_connection(
+            mock_connect, {}, {"database": "second"}
+        ).cursor()
+        cursor.execute("SELECT 1")
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(
+            [span.attributes[SpanAttributes.DB_NAME] for span in spans_list],
+            ["first", "second"],
+        )
+
+    def test_cursor_proxies_shared(self):
+        db_integration = dbapi.DatabaseApiIntegration(
+            "testname", "testcomponent"
+        )
+        first_connection = db_integration.wrapped_connection(
+            mock_connect, {}, {}
+        )
+        second_connection = db_integration.wrapped_connection(
+            mock_connect, {}, {}
+        )
+        first_cursor = first_connection.cursor()
+        second_cursor = second_connection.cursor()
+
+        self.assertIs(type(first_connection), type(second_connection))
+        self.assertIs(type(first_cursor), type(second_cursor))
+        # pylint: disable=protected-access
+        self.assertIs(
+            first_cursor._self_cursor_tracer,
+            second_cursor._self_cursor_tracer,
+        )
+
+    def test_statement_sanitizer(self):
+        db_integration = dbapi.DatabaseApiIntegration(
+            "testname", "testcomponent", statement_sanitizer=SqlSanitizer(),
+        )
+        mock_connection = db_integration.wrapped_connection(
+            mock_connect, {}, {}
+        )
+        cursor = mock_connection.cursor()
+        cursor.execute("SELECT * FROM t WHERE a = 'x' AND b IN (1, 2)")
+        cursor.execute(b"UPDATE t SET a = 'y'")
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(
+            [
+                span.attributes[SpanAttributes.DB_STATEMENT]
+                for span in spans_list
+            ],
+            ["SELECT * FROM t WHERE a = ? AND b IN (?)", "UPDATE t SET a = ?"],
+        )
+        self.assertEqual(spans_list[0].name, "SELECT")
+
+    def _fetch_cursor(self):
+        connection = dbapi.instrument_connection(
+            "testname",
+            sqlite3.connect(":memory:"),
+            "sqlite",
+            record_fetches=True,
+        )
+        cursor = connection.cursor()
+        cursor.execute("CREATE TABLE test (id INTEGER)")
+        cursor.executemany(
+            "INSERT INTO test VALUES (?)", [(index,) for index in range(5)]
+        )
+        self.memory_exporter.clear()
+        return cursor
+
+    def _fetch_attributes(self, span):
+        return (
+            span.attributes["db.fetch.rows"],
+            span.attributes["db.fetch.calls"],
+        )
+
+    def test_record_fetches(self):
+        cursor = self._fetch_cursor()
+
+        cursor.execute("SELECT id FROM test")
+        self.assertEqual(cursor.fetchone(), (0,))
+        self.assertEqual(len(cursor.fetchmany(2)), 2)
+        self.assertEqual(len(cursor.fetchall()), 2)
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(
+            [span.name for span in spans_list], ["SELECT", "SELECT fetch"]
+        )
+        execute_span, fetch_span = spans_list
+        self.assertEqual(self._fetch_attributes(fetch_span), (5, 3))
+        self.assertGreater(fetch_span.attributes["db.fetch.duration"], 0)
+        self.assertLessEqual(
+            fetch_span.attributes["db.fetch.duration"],
+            fetch_span.end_time - fetch_span.start_time,
+        )
+        self.assertGreaterEqual(fetch_span.start_time, execute_span.end_time)
+        self.assertEqual(
+            fetch_span.attributes[SpanAttributes.DB_STATEMENT],
+            "SELECT id FROM test",
+        )
+
+    def test_record_fetches_iteration(self):
+        cursor = self._fetch_cursor()
+
+        # the cursor returned by execute is traced as well
+        rows = list(cursor.execute("SELECT id FROM test WHERE id < 3"))
+        self.assertEqual(rows, [(0,), (1,), (2,)])
+        while cursor.fetchone() is not None:
+            pass
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(
+            [span.name for span in spans_list], ["SELECT", "SELECT fetch"]
+        )
+        self.assertEqual(self._fetch_attributes(spans_list[1]), (3, 4))
+
+    def test_record_fetches_not_exhausted(self):
+        cursor = self._fetch_cursor()
+
+        cursor.execute("SELECT id FROM test")
+        cursor.fetchmany(2)
+        self.assertEqual(len(self.memory_exporter.get_finished_spans()), 1)
+        # ended by the next statement or closing the cursor
+        cursor.execute("SELECT id FROM test WHERE id = 1")
+        cursor.fetchone()
+        cursor.execute("SELECT id FROM test")
+        cursor.fetchone()
+        cursor.close()
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(
+            [span.name for span in spans_list],
+            [
+                "SELECT",
+                "SELECT fetch",
+                "SELECT",
+                "SELECT fetch",
+                "SELECT",
+                "SELECT fetch",
+            ],
+        )
+        self.assertEqual(self._fetch_attributes(spans_list[1]), (2, 1))
+        self.assertEqual(self._fetch_attributes(spans_list[3]), (1, 1))
+        self.assertEqual(self._fetch_attributes(spans_list[5]), (1, 1))
+
+    def test_record_fetches_disabled(self):
+        connection = dbapi.instrument_connection(
+            "testname", sqlite3.connect(":memory:"), "sqlite"
+        )
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+
+        self.assertNotIsInstance(cursor, dbapi.TracedFetchCursorProxy)
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual([span.name for span in spans_list], ["SELECT"])
+
     def test_span_succeeded_with_capture_of_statement_parameters(self):
         connection_props = {
             "database": "testdatabase",
@@ -228,6 +452,61 @@ class TestDBApiIntegration(TestBase):
             span.attributes[SpanAttributes.DB_STATEMENT], "Test query"
         )
 
+    def test_executemany_with_capture_of_statement_parameters(self):
+        db_integration = dbapi.DatabaseApiIntegration(
+            "testname",
+            "testcomponent",
+            capture_parameters=True,
+            max_parameters_length=40,
+        )
+        mock_connection = db_integration.wrapped_connection(
+            mock_connect, {}, {}
+        )
+        cursor = mock_connection.cursor()
+        rows = [("param%d" % index, index) for index in range(1000)]
+        cursor.executemany("Test query", rows)
+        cursor.execute("Test query", rows[0])
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 2)
+        attributes = spans_list[0].attributes
+        self.assertEqual(
+            attributes["db.statement.parameters"],
+            "[('param0', 0), ('param1', 1), ('para...",
+        )
+        self.assertEqual(
+            attributes["db.statement.parameters.batch_size"], 1000
+        )
+        # estimated from the length of the sampled rows
+        self.assertEqual(
+            attributes["db.statement.parameters.size"], 13 * 1000 + 2 * 1000
+        )
+        attributes = spans_list[1].attributes
+        self.assertEqual(
+            attributes["db.statement.parameters"], "('param0', 0)"
+        )
+        self.assertNotIn("db.statement.parameters.batch_size", attributes)
+
+    def test_traced_executemany_independent_of_method_name(self):
+        db_integration = dbapi.DatabaseApiIntegration(
+            "testname", "testcomponent", capture_parameters=True
+        )
+        cursor_tracer = dbapi.CursorTracer(db_integration)
+        cursor = MockCursor()
+
+        def insert_rows(query, params=None):
+            return cursor.executemany(query, params)
+
+        cursor_tracer.traced_executemany(
+            cursor, insert_rows, "Test query", [(1,), (2,)]
+        )
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans_list), 1)
+        attributes = spans_list[0].attributes
+        self.assertEqual(attributes["db.statement.parameters"], "[(1,), (2,)]")
+        self.assertEqual(attributes["db.statement.parameters.batch_size"], 2)
+
     def test_callproc(self):
         db_integration = dbapi.DatabaseApiIntegration(
             "testname", "testcomponent"
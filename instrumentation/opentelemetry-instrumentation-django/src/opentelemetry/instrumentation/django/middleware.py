@@ -101,6 +101,7 @@ class _DjangoMiddleware(MiddlewareMixin):
     _environ_token = "opentelemetry-instrumentor-django.token"
     _environ_span_key = "opentelemetry-instrumentor-django.span_key"
     _environ_exception_key = "opentelemetry-instrumentor-django.exception_key"
+    _environ_excluded_key = "opentelemetry-instrumentor-django.excluded_key"
 
     _traced_request_attrs = get_traced_request_attrs("DJANGO")
     _excluded_urls = get_excluded_urls("DJANGO")
@@ -133,12 +134,23 @@ class _DjangoMiddleware(MiddlewareMixin):
         except Resolver404:
             return "HTTP {}".format(request.method)
 
+    def _is_excluded(self, request):
+        """Returns whether the url of the request is excluded from tracing,
+        computed once per request and stored in its ``META``."""
+        excluded = request.META.get(self._environ_excluded_key)
+        if excluded is None:
+            excluded = self._excluded_urls.url_disabled(
+                request.build_absolute_uri("?")
+            )
+            request.META[self._environ_excluded_key] = excluded
+        return excluded
+
     def process_request(self, request):
         # request.META is a dictionary containing all available HTTP headers
         # Read more about request.META here:
         # https://docs.djangoproject.com/en/3.0/ref/request-response/#django.http.HttpRequest.META
 
-        if self._excluded_urls.url_disabled(request.build_absolute_uri("?")):
+        if self._is_excluded(request):
             return
 
         # pylint:disable=W0212
@@ -181,7 +193,7 @@ class _DjangoMiddleware(MiddlewareMixin):
     def process_view(self, request, view_func, *args, **kwargs):
         # Process view is executed before the view function, here we get the
         # route template from request.resolver_match.  It is not set yet in process_request
-        if self._excluded_urls.url_disabled(request.build_absolute_uri("?")):
+        if self._is_excluded(request):
             return
 
         if (
@@ -198,14 +210,14 @@ class _DjangoMiddleware(MiddlewareMixin):
                         span.set_attribute(SpanAttributes.HTTP_ROUTE, route)
 
     def process_exception(self, request, exception):
-        if self._excluded_urls.url_disabled(request.build_absolute_uri("?")):
+        if self._is_excluded(request):
             return
 
         if self._environ_activation_key in request.META.keys():
             request.META[self._environ_exception_key] = exception
 
     def process_response(self, request, response):
-        if self._excluded_urls.url_disabled(request.build_absolute_uri("?")):
+        if self._is_excluded(request):
             return response
 
         activation = request.META.pop(self._environ_activation_key, None)
@@ -0,0 +1,78 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import patch
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+from opentelemetry.instrumentation.django import _DjangoMiddleware
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.util.http import ExcludeList
+
+EXCLUDED_URLS = ["healthcheck%d" % index for index in range(25)] + [
+    r"/internal/%d/\d+" % index for index in range(25)
+]
+
+
+class ResolverMatch:
+    route = "users/<int:user_id>/"
+
+
+class Request:
+    """Stands for a Django request, so that the middleware can be run without
+    configuring Django settings."""
+
+    def __init__(self, path):
+        self.path = path
+        self.method = "GET"
+        self.resolver_match = ResolverMatch()
+        self.META = {"PATH_INFO": path, "REQUEST_METHOD": "GET"}
+        setup_testing_defaults(self.META)
+        self.environ = self.META
+
+    def build_absolute_uri(self, location):
+        return "http://127.0.0.1" + self.path
+
+
+class Response:
+    status_code = 200
+    reason_phrase = "OK"
+
+
+@pytest.mark.parametrize(
+    "excluded_urls,path",
+    [
+        ([], "/users/1/"),
+        (EXCLUDED_URLS, "/users/1/"),
+        (EXCLUDED_URLS, "/internal/1/2"),
+    ],
+    ids=["no_exclusions", "not_excluded", "excluded"],
+)
+def test_middleware(benchmark, excluded_urls, path):
+    middleware = _DjangoMiddleware(lambda request: Response())
+    response = Response()
+
+    def process():
+        request = Request(path)
+        middleware.process_request(request)
+        middleware.process_view(request, None)
+        middleware.process_response(request, response)
+
+    with patch.object(
+        _DjangoMiddleware, "_excluded_urls", ExcludeList(excluded_urls)
+    ), patch.object(
+        _DjangoMiddleware, "_tracer", TracerProvider().get_tracer(__name__),
+    ):
+        benchmark(process)
@@ -245,6 +245,23 @@ class TestMiddleware(TestBase, WsgiTestBase):
         span_list = self.memory_exporter.get_finished_spans()
         self.assertEqual(len(span_list), 1)
 
+    def test_exclude_lists_checked_once_per_request(self):
+        excluded_urls = _DjangoMiddleware._excluded_urls
+        with patch.object(
+            excluded_urls, "url_disabled", wraps=excluded_urls.url_disabled
+        ) as url_disabled:
+            with self.assertRaises(ValueError):
+                Client().get("/error/")
+            url_disabled.assert_called_once_with("http://testserver/error/")
+
+            url_disabled.reset_mock()
+            Client().get("/excluded_arg/123")
+            url_disabled.assert_called_once_with(
+                "http://testserver/excluded_arg/123"
+            )
+
+        self.assertEqual(len(self.memory_exporter.get_finished_spans()), 1)
+
     def test_span_name(self):
         # test no query_string
         Client().get("/span_name/1234/")
@@ -17,12 +17,11 @@ from typing import Collection
 
 import fastapi
 from starlette import middleware
-from starlette.routing import Match
 
 from opentelemetry.instrumentation.asgi import OpenTelemetryMiddleware
 from opentelemetry.instrumentation.asgi.package import _instruments
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
-from opentelemetry.semconv.trace import SpanAttributes
+from opentelemetry.instrumentation.starlette import _get_route_details
 from opentelemetry.util.http import get_excluded_urls, parse_excluded_urls
 
 _excluded_urls_from_env = get_excluded_urls("FASTAPI")
@@ -103,29 +102,3 @@ class _InstrumentedFastAPI(fastapi.FastAPI):
             span_details_callback=_get_route_details,
             tracer_provider=_InstrumentedFastAPI._tracer_provider,
         )
-
-
-def _get_route_details(scope):
-    """Callback to retrieve the fastapi route being served.
-
-    TODO: there is currently no way to retrieve http.route from
-    a starlette application from scope.
-
-    See: https://github.com/encode/starlette/pull/804
-    """
-    app = scope["app"]
-    route = None
-    for starlette_route in app.routes:
-        match, _ = starlette_route.matches(scope)
-        if match == Match.FULL:
-            route = starlette_route.path
-            break
-        if match == Match.PARTIAL:
-            route = starlette_route.path
-    # method only exists for http, if websocket
-    # leave it blank.
-    span_name = route or scope.get("method", "")
-    attributes = {}
-    if route:
-        attributes[SpanAttributes.HTTP_ROUTE] = route
-    return span_name, attributes
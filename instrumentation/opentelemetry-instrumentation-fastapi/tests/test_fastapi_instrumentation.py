@@ -123,6 +123,27 @@ class TestFastAPIManualInstrumentation(TestBase):
             spans[-1].attributes[SpanAttributes.HTTP_FLAVOR], "1.1"
         )
 
+    def test_fastapi_route_added_after_request(self):
+        """Ensure that routes added after a request are used as span name."""
+        self._client.get("/items/1")
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(spans[-1].name, "GET")
+
+        router = fastapi.APIRouter()
+
+        @router.get("/items/{item_id}")
+        async def _(item_id: int):
+            return {"message": item_id}
+
+        self._app.include_router(router)
+        self.memory_exporter.clear()
+        self._client.get("/items/1")
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(spans[-1].name, "/items/{item_id}")
+        self.assertEqual(
+            spans[-1].attributes[SpanAttributes.HTTP_ROUTE], "/items/{item_id}"
+        )
+
     def test_fastapi_excluded_urls(self):
         """Ensure that given fastapi routes are excluded."""
         self._client.get("/exclude/123")
@@ -67,6 +67,8 @@ class MySQLInstrumentor(BaseInstrumentor):
         https://dev.mysql.com/doc/connector-python/en/
         """
         tracer_provider = kwargs.get("tracer_provider")
+        statement_sanitizer = kwargs.get("statement_sanitizer")
+        record_fetches = kwargs.get("record_fetches", False)
 
         dbapi.wrap_connect(
             __name__,
@@ -76,6 +78,8 @@ class MySQLInstrumentor(BaseInstrumentor):
             self._CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
+            record_fetches=record_fetches,
         )
 
     def _uninstrument(self, **kwargs):
@@ -83,13 +87,23 @@ class MySQLInstrumentor(BaseInstrumentor):
         dbapi.unwrap_connect(mysql.connector, "connect")
 
     # pylint:disable=no-self-use
-    def instrument_connection(self, connection, tracer_provider=None):
+    def instrument_connection(
+        self,
+        connection,
+        tracer_provider=None,
+        statement_sanitizer=None,
+        record_fetches=False,
+    ):
         """Enable instrumentation in a MySQL connection.
 
         Args:
             connection: The connection to instrument.
             tracer_provider: The optional tracer provider to use. If omitted
                 the current globally configured one is used.
+            statement_sanitizer: Optional callable returning the value of the
+                db.statement attribute from the executed statement.
+            record_fetches: Whether the fetches of the results of a statement
+                are recorded in a span following the span of its execution.
 
         Returns:
             An instrumented connection.
@@ -101,6 +115,8 @@ class MySQLInstrumentor(BaseInstrumentor):
             self._CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
+            record_fetches=record_fetches,
         )
 
     def uninstrument_connection(self, connection):
@@ -76,6 +76,7 @@ class Psycopg2Instrumentor(BaseInstrumentor):
         Psycopg: http://initd.org/psycopg/
         """
         tracer_provider = kwargs.get("tracer_provider")
+        statement_sanitizer = kwargs.get("statement_sanitizer")
 
         dbapi.wrap_connect(
             __name__,
@@ -86,6 +87,7 @@ class Psycopg2Instrumentor(BaseInstrumentor):
             version=__version__,
             tracer_provider=tracer_provider,
             db_api_integration_factory=DatabaseApiIntegration,
+            statement_sanitizer=statement_sanitizer,
         )
 
     def _uninstrument(self, **kwargs):
@@ -94,7 +96,9 @@ class Psycopg2Instrumentor(BaseInstrumentor):
 
     # TODO(owais): check if core dbapi can do this for all dbapi implementations e.g, pymysql and mysql
     @staticmethod
-    def instrument_connection(connection, tracer_provider=None):
+    def instrument_connection(
+        connection, tracer_provider=None, statement_sanitizer=None
+    ):
         if not hasattr(connection, "_is_instrumented_by_opentelemetry"):
             connection._is_instrumented_by_opentelemetry = False
 
@@ -103,7 +107,8 @@ class Psycopg2Instrumentor(BaseInstrumentor):
                 connection, _OTEL_CURSOR_FACTORY_KEY, connection.cursor_factory
             )
             connection.cursor_factory = _new_cursor_factory(
-                tracer_provider=tracer_provider
+                tracer_provider=tracer_provider,
+                statement_sanitizer=statement_sanitizer,
             )
             connection._is_instrumented_by_opentelemetry = True
         else:
@@ -165,7 +170,12 @@ class CursorTracer(dbapi.CursorTracer):
         return statement
 
 
-def _new_cursor_factory(db_api=None, base_factory=None, tracer_provider=None):
+def _new_cursor_factory(
+    db_api=None,
+    base_factory=None,
+    tracer_provider=None,
+    statement_sanitizer=None,
+):
     if not db_api:
         db_api = DatabaseApiIntegration(
             __name__,
@@ -173,6 +183,7 @@ def _new_cursor_factory(db_api=None, base_factory=None, tracer_provider=None):
             connection_attributes=Psycopg2Instrumentor._CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
         )
 
     base_factory = base_factory or pg_cursor
@@ -185,7 +196,7 @@ def _new_cursor_factory(db_api=None, base_factory=None, tracer_provider=None):
             )
 
         def executemany(self, *args, **kwargs):
-            return _cursor_tracer.traced_execution(
+            return _cursor_tracer.traced_executemany(
                 self, super().executemany, *args, **kwargs
             )
 
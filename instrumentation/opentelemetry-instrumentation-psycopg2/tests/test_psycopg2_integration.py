@@ -19,7 +19,9 @@ import psycopg2
 
 import opentelemetry.instrumentation.psycopg2
 from opentelemetry.instrumentation.psycopg2 import Psycopg2Instrumentor
+from opentelemetry.instrumentation.sql import SqlSanitizer
 from opentelemetry.sdk import resources
+from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.test.test_base import TestBase
 
 
@@ -171,6 +173,33 @@ class TestPostgresqlIntegration(TestBase):
         spans_list = self.memory_exporter.get_finished_spans()
         self.assertEqual(len(spans_list), 1)
 
+    # pylint: disable=unused-argument
+    def test_statement_sanitizer(self):
+        Psycopg2Instrumentor().instrument(statement_sanitizer=SqlSanitizer())
+
+        cnx = psycopg2.connect(database="test")
+        cursor = cnx.cursor()
+        cursor.execute("SELECT * FROM test WHERE id IN (1, 2) AND name = 'a'")
+
+        cnx = Psycopg2Instrumentor().instrument_connection(
+            psycopg2.connect(database="test"),
+            statement_sanitizer=SqlSanitizer(),
+        )
+        cursor = cnx.cursor()
+        cursor.execute("SELECT * FROM test WHERE id = 3")
+
+        spans_list = self.memory_exporter.get_finished_spans()
+        self.assertEqual(
+            [
+                span.attributes[SpanAttributes.DB_STATEMENT]
+                for span in spans_list
+            ],
+            [
+                "SELECT * FROM test WHERE id IN (?) AND name = ?",
+                "SELECT * FROM test WHERE id = ?",
+            ],
+        )
+
     # pylint: disable=unused-argument
     def test_instrument_connection_with_instrument(self):
         cnx = psycopg2.connect(database="test")
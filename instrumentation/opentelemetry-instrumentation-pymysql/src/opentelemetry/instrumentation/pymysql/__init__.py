@@ -67,6 +67,8 @@ class PyMySQLInstrumentor(BaseInstrumentor):
         https://github.com/PyMySQL/PyMySQL/
         """
         tracer_provider = kwargs.get("tracer_provider")
+        statement_sanitizer = kwargs.get("statement_sanitizer")
+        record_fetches = kwargs.get("record_fetches", False)
 
         dbapi.wrap_connect(
             __name__,
@@ -76,6 +78,8 @@ class PyMySQLInstrumentor(BaseInstrumentor):
             _CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
+            record_fetches=record_fetches,
         )
 
     def _uninstrument(self, **kwargs):
@@ -83,13 +87,22 @@ class PyMySQLInstrumentor(BaseInstrumentor):
         dbapi.unwrap_connect(pymysql, "connect")
 
     @staticmethod
-    def instrument_connection(connection, tracer_provider=None):
+    def instrument_connection(
+        connection,
+        tracer_provider=None,
+        statement_sanitizer=None,
+        record_fetches=False,
+    ):
         """Enable instrumentation in a PyMySQL connection.
 
         Args:
             connection: The connection to instrument.
             tracer_provider: The optional tracer provider to use. If omitted
                 the current globally configured one is used.
+            statement_sanitizer: Optional callable returning the value of the
+                db.statement attribute from the executed statement.
+            record_fetches: Whether the fetches of the results of a statement
+                are recorded in a span following the span of its execution.
 
         Returns:
             An instrumented connection.
@@ -102,6 +115,8 @@ class PyMySQLInstrumentor(BaseInstrumentor):
             _CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
+            record_fetches=record_fetches,
         )
 
     @staticmethod
@@ -38,10 +38,22 @@ Usage
     client = redis.StrictRedis(host="localhost", port=6379)
     client.get("my-key")
 
+The commands of a pipeline are recorded in a single span. With the
+``aggregate_pipelines`` option, the span records the number of commands of
+each name, the total size in bytes of their arguments and the first commands
+only, so that the size of its attributes does not depend on the size of the
+pipeline:
+
+.. code:: python
+
+    RedisInstrumentor().instrument(aggregate_pipelines=True)
+
 API
 ---
 """
 
+import weakref
+from functools import partial
 from typing import Collection
 
 import redis
@@ -51,8 +63,11 @@ from opentelemetry import trace
 from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
 from opentelemetry.instrumentation.redis.package import _instruments
 from opentelemetry.instrumentation.redis.util import (
+    _count_pipeline_commands,
     _extract_conn_attributes,
     _format_command_args,
+    _format_pipeline_name,
+    _summarize_pipeline,
 )
 from opentelemetry.instrumentation.redis.version import __version__
 from opentelemetry.instrumentation.utils import unwrap
@@ -60,48 +75,66 @@ from opentelemetry.semconv.trace import SpanAttributes
 
 _DEFAULT_SERVICE = "redis"
 
+# attributes of the connections of each connection pool
+_pool_attributes = weakref.WeakKeyDictionary()
+
 
-def _set_connection_attributes(span, conn):
-    if not span.is_recording():
-        return
-    for key, value in _extract_conn_attributes(
-        conn.connection_pool.connection_kwargs
-    ).items():
-        span.set_attribute(key, value)
+def _get_connection_attributes(conn):
+    pool = conn.connection_pool
+    attributes = _pool_attributes.get(pool)
+    if attributes is None:
+        attributes = _pool_attributes[pool] = _extract_conn_attributes(
+            pool.connection_kwargs
+        )
+    return attributes
 
 
 def _traced_execute_command(func, instance, args, kwargs):
     tracer = getattr(redis, "_opentelemetry_tracer")
-    query = _format_command_args(args)
     name = ""
     if len(args) > 0 and args[0]:
         name = args[0]
     else:
         name = instance.connection_pool.connection_kwargs.get("db", 0)
     with tracer.start_as_current_span(
-        name, kind=trace.SpanKind.CLIENT
+        name,
+        kind=trace.SpanKind.CLIENT,
+        attributes=_get_connection_attributes(instance),
     ) as span:
         if span.is_recording():
-            span.set_attribute(SpanAttributes.DB_STATEMENT, query)
-            _set_connection_attributes(span, instance)
+            span.set_attribute(
+                SpanAttributes.DB_STATEMENT, _format_command_args(args)
+            )
             span.set_attribute("db.redis.args_length", len(args))
         return func(*args, **kwargs)
 
 
-def _traced_execute_pipeline(func, instance, args, kwargs):
+def _traced_execute_pipeline(func, instance, args, kwargs, aggregate=False):
     tracer = getattr(redis, "_opentelemetry_tracer")
 
-    cmds = [_format_command_args(c) for c, _ in instance.command_stack]
-    resource = "\n".join(cmds)
-
-    span_name = " ".join([args[0] for args, _ in instance.command_stack])
+    if aggregate:
+        counts = _count_pipeline_commands(instance.command_stack)
+        span_name = _format_pipeline_name(counts)
+    else:
+        span_name = " ".join([args[0] for args, _ in instance.command_stack])
 
     with tracer.start_as_current_span(
-        span_name, kind=trace.SpanKind.CLIENT
+        span_name,
+        kind=trace.SpanKind.CLIENT,
+        attributes=_get_connection_attributes(instance),
     ) as span:
         if span.is_recording():
-            span.set_attribute(SpanAttributes.DB_STATEMENT, resource)
-            _set_connection_attributes(span, instance)
+            if aggregate:
+                span.set_attributes(
+                    _summarize_pipeline(instance.command_stack, counts)
+                )
+            else:
+                cmds = [
+                    _format_command_args(c) for c, _ in instance.command_stack
+                ]
+                span.set_attribute(
+                    SpanAttributes.DB_STATEMENT, "\n".join(cmds)
+                )
             span.set_attribute(
                 "db.redis.pipeline_length", len(instance.command_stack)
             )
@@ -117,7 +150,19 @@ class RedisInstrumentor(BaseInstrumentor):
         return _instruments
 
     def _instrument(self, **kwargs):
+        """Instruments the redis clients and pipelines.
+
+        Args:
+            **kwargs: Optional arguments
+                ``tracer_provider``: a TracerProvider, defaults to global
+                ``aggregate_pipelines``: whether the commands of pipelines
+                are summarized in attributes of bounded size
+        """
         tracer_provider = kwargs.get("tracer_provider")
+        traced_execute_pipeline = partial(
+            _traced_execute_pipeline,
+            aggregate=kwargs.get("aggregate_pipelines", False),
+        )
         setattr(
             redis,
             "_opentelemetry_tracer",
@@ -133,7 +178,7 @@ class RedisInstrumentor(BaseInstrumentor):
             wrap_function_wrapper(
                 "redis.client",
                 "BasePipeline.execute",
-                _traced_execute_pipeline,
+                traced_execute_pipeline,
             )
             wrap_function_wrapper(
                 "redis.client",
@@ -145,7 +190,7 @@ class RedisInstrumentor(BaseInstrumentor):
                 "redis", "Redis.execute_command", _traced_execute_command
             )
             wrap_function_wrapper(
-                "redis.client", "Pipeline.execute", _traced_execute_pipeline
+                "redis.client", "Pipeline.execute", traced_execute_pipeline
             )
             wrap_function_wrapper(
                 "redis.client",
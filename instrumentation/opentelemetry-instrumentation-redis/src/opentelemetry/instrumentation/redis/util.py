@@ -15,12 +15,21 @@
 """
 Some utils used by the redis integration
 """
+from bisect import bisect_right
+from collections import Counter
+
 from opentelemetry.semconv.trace import (
     DbSystemValues,
     NetTransportValues,
     SpanAttributes,
 )
 
+# bounds of the attributes of the aggregated pipelines
+_PIPELINE_MAX_COMMAND_NAMES = 10
+_PIPELINE_STATEMENT_MAX_LENGTH = 1000
+# powers of ten counting the digits of the integer arguments of a pipeline
+_POWERS_OF_TEN = tuple(10 ** exponent for exponent in range(1, 20))
+
 
 def _extract_conn_attributes(conn_kwargs):
     """ Transform redis conn info into dict """
@@ -57,10 +66,15 @@ def _format_command_args(args):
     length = 0
     out = []
     for arg in args:
-        cmd = str(arg)
-
-        if len(cmd) > value_max_len:
-            cmd = cmd[:value_max_len] + value_too_long_mark
+        if isinstance(arg, (bytes, bytearray, memoryview)):
+            # only the part of the value that is kept is decoded
+            cmd = bytes(arg[:value_max_len]).decode("utf-8", "replace")
+            if len(arg) > value_max_len:
+                cmd += value_too_long_mark
+        else:
+            cmd = arg if isinstance(arg, str) else str(arg)
+            if len(cmd) > value_max_len:
+                cmd = cmd[:value_max_len] + value_too_long_mark
 
         if length + len(cmd) > cmd_max_len:
             prefix = cmd[: cmd_max_len - length]
@@ -71,3 +85,71 @@ def _format_command_args(args):
         length += len(cmd)
 
     return " ".join(out)
+
+
+def _count_pipeline_commands(command_stack):
+    """Count the commands of a pipeline by name, in order of appearance"""
+    return Counter(args[0] for args, _ in command_stack)
+
+
+def _format_pipeline_name(counts):
+    """Format the span name of an aggregated pipeline from its command names"""
+    names = [str(name) for name in counts]
+    if len(names) > _PIPELINE_MAX_COMMAND_NAMES:
+        names = names[:_PIPELINE_MAX_COMMAND_NAMES] + ["..."]
+    return " ".join(names)
+
+
+def _number_size(arg):
+    """Size in bytes of a number argument of a command once encoded by redis"""
+    if isinstance(arg, int):
+        # the digits are counted without formatting the integer
+        size = 1 if arg < 0 else 0
+        arg = abs(arg)
+        if arg >= _POWERS_OF_TEN[-1]:
+            return size + len(str(arg))
+        return size + bisect_right(_POWERS_OF_TEN, arg) + 1
+    return len(repr(arg))
+
+
+def _summarize_pipeline(command_stack, counts):
+    """Summarize the commands of a pipeline into attributes of bounded size
+
+    The commands are recorded as the number of commands of each name, the
+    total size in bytes of their arguments, and a statement made of the first
+    commands truncated to ``_PIPELINE_STATEMENT_MAX_LENGTH`` characters.
+    """
+    args_size = 0
+    statement = []
+    statement_length = 0
+    for args, _ in command_stack:
+        for arg in args:
+            if isinstance(arg, str):
+                args_size += len(arg.encode("utf-8"))
+            elif isinstance(arg, (bytes, bytearray, memoryview)):
+                args_size += len(arg)
+            else:
+                args_size += _number_size(arg)
+
+        if statement_length <= _PIPELINE_STATEMENT_MAX_LENGTH:
+            cmd = _format_command_args(args)
+            statement.append(cmd)
+            statement_length += len(cmd) + 1
+
+    truncated = len(statement) < len(command_stack)
+    statement = "\n".join(statement)
+    if truncated or len(statement) > _PIPELINE_STATEMENT_MAX_LENGTH:
+        statement = statement[:_PIPELINE_STATEMENT_MAX_LENGTH] + "..."
+
+    commands = [
+        "{} x{}".format(name, count)
+        for name, count in counts.most_common(_PIPELINE_MAX_COMMAND_NAMES)
+    ]
+    if len(counts) > _PIPELINE_MAX_COMMAND_NAMES:
+        commands.append("...")
+
+    return {
+        SpanAttributes.DB_STATEMENT: statement,
+        "db.redis.pipeline_commands": ", ".join(commands),
+        "db.redis.pipeline_args_size": args_size,
+    }
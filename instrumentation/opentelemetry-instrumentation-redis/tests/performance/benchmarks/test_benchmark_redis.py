@@ -0,0 +1,91 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import redis
+
+from opentelemetry.instrumentation.redis import (
+    _traced_execute_command,
+    _traced_execute_pipeline,
+)
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+COMMAND_COUNT = 100
+PIPELINE_LENGTH = 10000
+VALUE = b"x" * 1024 * 1024
+
+
+class Client:
+    connection_pool = redis.ConnectionPool(host="localhost", port=6379)
+
+
+class Pipeline(Client):
+    command_stack = [
+        (("SET", "key{}".format(index), "value"), {})
+        for index in range(PIPELINE_LENGTH)
+    ]
+
+
+def execute_command(*args, **kwargs):
+    return VALUE
+
+
+def set_and_get(client):
+    for index in range(COMMAND_COUNT):
+        key = "key{}".format(index)
+        _traced_execute_command(
+            execute_command, client, ("SET", key, VALUE), {}
+        )
+        _traced_execute_command(execute_command, client, ("GET", key), {})
+
+
+def test_set_get(benchmark):
+    setattr(
+        redis, "_opentelemetry_tracer", TracerProvider().get_tracer(__name__)
+    )
+    benchmark(set_and_get, Client())
+
+
+def test_set_get_not_recording(benchmark):
+    setattr(
+        redis,
+        "_opentelemetry_tracer",
+        TracerProvider(sampler=ALWAYS_OFF).get_tracer(__name__),
+    )
+    benchmark(set_and_get, Client())
+
+
+def execute_pipeline(*args, **kwargs):
+    pass
+
+
+def test_pipeline(benchmark):
+    setattr(
+        redis, "_opentelemetry_tracer", TracerProvider().get_tracer(__name__)
+    )
+    benchmark(_traced_execute_pipeline, execute_pipeline, Pipeline(), (), {})
+
+
+def test_pipeline_aggregated(benchmark):
+    setattr(
+        redis, "_opentelemetry_tracer", TracerProvider().get_tracer(__name__)
+    )
+    benchmark(
+        _traced_execute_pipeline,
+        execute_pipeline,
+        Pipeline(),
+        (),
+        {},
+        aggregate=True,
+    )
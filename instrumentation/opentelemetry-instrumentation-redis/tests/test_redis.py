@@ -16,6 +16,10 @@ from unittest import mock
 import redis
 
 from opentelemetry.instrumentation.redis import RedisInstrumentor
+from opentelemetry.instrumentation.redis.util import _format_command_args
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.test.test_base import TestBase
 from opentelemetry.trace import SpanKind
 
@@ -51,6 +55,27 @@ class TestRedis(TestBase):
                 self.assertFalse(mock_span.set_attribute.called)
                 self.assertFalse(mock_span.set_status.called)
 
+    def test_not_recording_command_not_formatted(self):
+        redis_client = redis.Redis()
+        RedisInstrumentor().instrument(tracer_provider=self.tracer_provider)
+
+        with mock.patch.object(
+            redis,
+            "_opentelemetry_tracer",
+            TracerProvider(sampler=ALWAYS_OFF).get_tracer(__name__),
+        ), mock.patch.object(redis_client, "connection"), mock.patch(
+            "opentelemetry.instrumentation.redis._format_command_args"
+        ) as format_command_args:
+            redis_client.get("key")
+            with redis_client.pipeline(transaction=False) as pipeline:
+                pipeline.set("key", "value")
+                with mock.patch.object(
+                    pipeline, "connection"
+                ), mock.patch.object(pipeline, "_execute_pipeline"):
+                    pipeline.execute()
+
+        self.assertFalse(format_command_args.called)
+
     def test_instrument_uninstrument(self):
         redis_client = redis.Redis()
         RedisInstrumentor().instrument(tracer_provider=self.tracer_provider)
@@ -80,3 +105,165 @@ class TestRedis(TestBase):
 
         spans = self.memory_exporter.get_finished_spans()
         self.assertEqual(len(spans), 1)
+
+    def test_connection_attributes(self):
+        pool = redis.ConnectionPool(host="redis.local", port=6380, db=2)
+        RedisInstrumentor().instrument(tracer_provider=self.tracer_provider)
+
+        for redis_client in (
+            redis.Redis(connection_pool=pool),
+            redis.Redis(connection_pool=pool),
+        ):
+            with mock.patch.object(redis_client, "connection"):
+                redis_client.get("key")
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 2)
+        for span in spans:
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_SYSTEM], "redis"
+            )
+            self.assertEqual(
+                span.attributes[SpanAttributes.NET_PEER_NAME], "redis.local"
+            )
+            self.assertEqual(
+                span.attributes[SpanAttributes.NET_PEER_PORT], 6380
+            )
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_REDIS_DATABASE_INDEX], 2
+            )
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_STATEMENT], "GET key"
+            )
+
+    def test_format_command_args(self):
+        self.assertEqual(
+            _format_command_args(("SET", "key", 42)), "SET key 42"
+        )
+        self.assertEqual(
+            _format_command_args(("SET", b"key", "é".encode())), "SET key é"
+        )
+        self.assertEqual(
+            _format_command_args(("SET", "key", "x" * 1000000)),
+            "SET key " + "x" * 100 + "...",
+        )
+        self.assertEqual(
+            _format_command_args(("SET", b"key", b"x" * 1000000)),
+            "SET key " + "x" * 100 + "...",
+        )
+        self.assertEqual(
+            _format_command_args(("SET", b"key", memoryview(b"x" * 200))),
+            "SET key " + "x" * 100 + "...",
+        )
+        self.assertEqual(
+            _format_command_args(["MGET"] + ["x" * 100] * 20),
+            "MGET " + " ".join(["x" * 100] * 9) + " " + "x" * 96 + "...",
+        )
+
+    def _execute_pipeline(self, redis_client, commands):
+        with redis_client.pipeline(transaction=False) as pipeline:
+            for command in commands:
+                pipeline.execute_command(*command)
+            with mock.patch.object(pipeline, "connection"), mock.patch.object(
+                pipeline, "_execute_pipeline"
+            ):
+                pipeline.execute()
+
+    def test_pipeline(self):
+        redis_client = redis.Redis()
+        RedisInstrumentor().instrument(tracer_provider=self.tracer_provider)
+
+        self._execute_pipeline(
+            redis_client, [("SET", "blah", 32), ("GET", "blah")]
+        )
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0].name, "SET GET")
+        self.assertEqual(
+            spans[0].attributes[SpanAttributes.DB_STATEMENT],
+            "SET blah 32\nGET blah",
+        )
+        self.assertEqual(spans[0].attributes["db.redis.pipeline_length"], 2)
+        self.assertNotIn("db.redis.pipeline_commands", spans[0].attributes)
+
+    def test_aggregated_pipeline(self):
+        redis_client = redis.Redis()
+        RedisInstrumentor().instrument(
+            tracer_provider=self.tracer_provider, aggregate_pipelines=True
+        )
+
+        commands = [("GET", "key{}".format(index)) for index in range(1000)]
+        commands += [
+            ("SET", "key{}".format(index), b"x" * 10) for index in range(9000)
+        ]
+        self._execute_pipeline(redis_client, commands)
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        span = spans[0]
+        self.assertEqual(span.name, "GET SET")
+        self.assertEqual(
+            span.attributes["db.redis.pipeline_commands"],
+            "SET x9000, GET x1000",
+        )
+        self.assertEqual(span.attributes["db.redis.pipeline_length"], 10000)
+        self.assertEqual(
+            span.attributes["db.redis.pipeline_args_size"],
+            sum(len(str(arg)) for command in commands for arg in command[:2])
+            + 9000 * 10,
+        )
+        statement = span.attributes[SpanAttributes.DB_STATEMENT]
+        self.assertEqual(len(statement), 1003)
+        self.assertTrue(statement.startswith("GET key0\nGET key1\n"))
+        self.assertTrue(statement.endswith("..."))
+
+    def test_aggregated_pipeline_args_size_in_bytes(self):
+        redis_client = redis.Redis()
+        RedisInstrumentor().instrument(
+            tracer_provider=self.tracer_provider, aggregate_pipelines=True
+        )
+
+        commands = [
+            ("SET", "café", 12345),
+            ("INCRBY", "count", -42),
+            ("INCRBYFLOAT", "total", 1.5),
+        ]
+        self._execute_pipeline(redis_client, commands)
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(
+            spans[0].attributes["db.redis.pipeline_args_size"],
+            len(
+                "SETcafé12345INCRBYcount-42INCRBYFLOATtotal1.5".encode("utf-8")
+            ),
+        )
+
+    def test_aggregated_pipeline_command_names(self):
+        redis_client = redis.Redis()
+        RedisInstrumentor().instrument(
+            tracer_provider=self.tracer_provider, aggregate_pipelines=True
+        )
+
+        self._execute_pipeline(
+            redis_client,
+            [("CMD{}".format(index), "key") for index in range(12)],
+        )
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        span = spans[0]
+        self.assertEqual(
+            span.name,
+            " ".join("CMD{}".format(index) for index in range(10)) + " ...",
+        )
+        self.assertEqual(
+            span.attributes["db.redis.pipeline_commands"],
+            ", ".join("CMD{} x1".format(index) for index in range(10))
+            + ", ...",
+        )
+        self.assertEqual(
+            span.attributes[SpanAttributes.DB_STATEMENT],
+            "\n".join("CMD{} key".format(index) for index in range(12)),
+        )
@@ -39,6 +39,7 @@ Usage
 API
 ---
 """
+from functools import partial
 from typing import Collection
 
 import sqlalchemy
@@ -70,18 +71,30 @@ class SQLAlchemyInstrumentor(BaseInstrumentor):
             **kwargs: Optional arguments
                 ``engine``: a SQLAlchemy engine instance
                 ``tracer_provider``: a TracerProvider, defaults to global
+                ``statement_sanitizer``: a callable returning the value of
+                the db.statement attribute from the executed statement
+                ``record_pool``: whether the time spent waiting for a
+                connection of the pool and the state of the pool are recorded
+                on the span of the first statement executed on it
 
         Returns:
             An instrumented engine if passed in as an argument, None otherwise.
         """
-        _w("sqlalchemy", "create_engine", _wrap_create_engine)
-        _w("sqlalchemy.engine", "create_engine", _wrap_create_engine)
+        wrap_create_engine = partial(
+            _wrap_create_engine,
+            statement_sanitizer=kwargs.get("statement_sanitizer"),
+            record_pool=kwargs.get("record_pool", False),
+        )
+        _w("sqlalchemy", "create_engine", wrap_create_engine)
+        _w("sqlalchemy.engine", "create_engine", wrap_create_engine)
         if kwargs.get("engine") is not None:
             return EngineTracer(
                 _get_tracer(
                     kwargs.get("engine"), kwargs.get("tracer_provider")
                 ),
                 kwargs.get("engine"),
+                statement_sanitizer=kwargs.get("statement_sanitizer"),
+                record_pool=kwargs.get("record_pool", False),
             )
         return None
 
@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from threading import local
+import logging
+import weakref
 
 from sqlalchemy.event import listen  # pylint: disable=no-name-in-module
 
@@ -20,6 +21,23 @@ from opentelemetry import trace
 from opentelemetry.instrumentation.sqlalchemy.version import __version__
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace.status import Status, StatusCode
+from opentelemetry.util._time import _time_ns
+
+logger = logging.getLogger(__name__)
+
+# attribute of the SQLAlchemy execution contexts holding the span of the
+# statement being executed
+_SPAN_KEY = "_otel_span"
+# keys of the info of the pooled connections holding the attributes of their
+# last checkout, and whether the DBAPI connection was created by it
+_POOL_ATTRIBUTES_KEY = "_otel_pool_attributes"
+_POOL_CONNECTED_KEY = "_otel_pool_connected"
+# attributes recorded on checkout and the methods of the pools returning them
+_POOL_STATUS = (
+    ("db.pool.size", "size"),
+    ("db.pool.overflow", "overflow"),
+    ("db.pool.checked_out", "checkedout"),
+)
 
 
 def _normalize_vendor(vendor):
@@ -45,34 +63,104 @@ def _get_tracer(engine, tracer_provider=None):
 
 
 # pylint: disable=unused-argument
-def _wrap_create_engine(func, module, args, kwargs):
+def _wrap_create_engine(
+    func, module, args, kwargs, statement_sanitizer=None, record_pool=False
+):
     """Trace the SQLAlchemy engine, creating an `EngineTracer`
     object that will listen to SQLAlchemy events.
     """
     engine = func(*args, **kwargs)
-    EngineTracer(_get_tracer(engine), engine)
+    EngineTracer(
+        _get_tracer(engine),
+        engine,
+        statement_sanitizer=statement_sanitizer,
+        record_pool=record_pool,
+    )
     return engine
 
 
 class EngineTracer:
-    def __init__(self, tracer, engine):
+    def __init__(
+        self, tracer, engine, statement_sanitizer=None, record_pool=False
+    ):
         self.tracer = tracer
         self.engine = engine
+        self.statement_sanitizer = statement_sanitizer
+        self.record_pool = record_pool
         self.vendor = _normalize_vendor(engine.name)
-        self.cursor_mapping = {}
-        self.local = local()
+
+        # the attributes of the connections are computed once per engine, or
+        # once per DBAPI connection when the URL has no host
+        self._url_attributes, self._url_has_host = _get_attributes_from_url(
+            engine.url
+        )
+        self._url_attributes[SpanAttributes.DB_SYSTEM] = self.vendor
+        self._dbapi_connection_attributes = weakref.WeakKeyDictionary()
 
         listen(engine, "before_cursor_execute", self._before_cur_exec)
         listen(engine, "after_cursor_execute", self._after_cur_exec)
         listen(engine, "handle_error", self._handle_error)
 
-    @property
-    def current_thread_span(self):
-        return getattr(self.local, "current_span", None)
+        if record_pool:
+            self._instrument_pool(engine.pool)
+            # the pool is replaced when the engine is disposed, the pool
+            # events listened on the engine are moved to the new pool
+            listen(engine, "engine_disposed", self._engine_disposed)
+            listen(engine, "connect", self._pool_connect)
+            listen(engine, "checkin", self._pool_checkin)
+
+    def _instrument_pool(self, pool):
+        """Measures the time spent waiting for the connections checked out
+        of the pool and the state of the pool once they are checked out. The
+        attributes are recorded on the span of the next statement executed on
+        the connection.
+
+        SQLAlchemy has no event sent before the checkout, so the connect
+        method of the pool is replaced.
+        """
+        connect = pool.connect
+        # some pools have attributes of the same names which are not methods,
+        # such as the size of a SingletonThreadPool
+        status = [
+            (attribute, getattr(pool, method))
+            for attribute, method in _POOL_STATUS
+            if callable(getattr(pool, method, None))
+        ]
+
+        def traced_connect():
+            start_time = _time_ns()
+            connection = connect()
+            # the connection is checked out, it must be returned to the caller
+            # whatever happens while recording the checkout
+            try:
+                attributes = {
+                    "db.pool.checkout.duration": _time_ns() - start_time
+                }
+                for attribute, method in status:
+                    attributes[attribute] = method()
+
+                info = connection.info
+                if info.pop(_POOL_CONNECTED_KEY, False):
+                    attributes["db.pool.connection.created"] = True
+                info[_POOL_ATTRIBUTES_KEY] = attributes
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Failed to record the pool checkout. %s", ex)
+            return connection
+
+        pool.connect = traced_connect
 
-    @current_thread_span.setter
-    def current_thread_span(self, span):
-        setattr(self.local, "current_span", span)
+    def _engine_disposed(self, engine):
+        self._instrument_pool(engine.pool)
+
+    @staticmethod
+    def _pool_connect(dbapi_connection, connection_record):
+        connection_record.info[_POOL_CONNECTED_KEY] = True
+
+    @staticmethod
+    def _pool_checkin(dbapi_connection, connection_record):
+        # the attributes of a checkout are only recorded on its statements
+        if connection_record is not None:
+            connection_record.info.pop(_POOL_ATTRIBUTES_KEY, None)
 
     def _operation_name(self, db_name, statement):
         parts = []
@@ -89,36 +177,59 @@ class EngineTracer:
             return self.vendor
         return " ".join(parts)
 
+    def _get_connection_attributes(self, cursor):
+        if self._url_has_host or self.vendor != "postgresql":
+            return self._url_attributes
+
+        connection = getattr(cursor, "connection", None)
+        try:
+            attrs = self._dbapi_connection_attributes.get(connection)
+        except TypeError:
+            # the connection cannot be weakly referenced
+            return _get_attributes_from_cursor(
+                self.vendor, cursor, dict(self._url_attributes)
+            )
+        if attrs is None:
+            attrs = _get_attributes_from_cursor(
+                self.vendor, cursor, dict(self._url_attributes)
+            )
+            self._dbapi_connection_attributes[connection] = attrs
+        return attrs
+
     # pylint: disable=unused-argument
-    def _before_cur_exec(self, conn, cursor, statement, *args):
-        attrs, found = _get_attributes_from_url(conn.engine.url)
-        if not found:
-            attrs = _get_attributes_from_cursor(self.vendor, cursor, attrs)
+    def _before_cur_exec(
+        self, conn, cursor, statement, params, context, executemany
+    ):
+        attrs = self._get_connection_attributes(cursor)
+        if self.record_pool:
+            pool_attributes = conn.info.pop(_POOL_ATTRIBUTES_KEY, None)
+            if pool_attributes is not None:
+                attrs = {**attrs, **pool_attributes}
 
         db_name = attrs.get(SpanAttributes.DB_NAME, "")
         span = self.tracer.start_span(
             self._operation_name(db_name, statement),
             kind=trace.SpanKind.CLIENT,
+            attributes=attrs,
         )
-        self.current_thread_span = self.cursor_mapping[cursor] = span
-        with trace.use_span(span, end_on_exit=False):
-            if span.is_recording():
-                span.set_attribute(SpanAttributes.DB_STATEMENT, statement)
-                span.set_attribute(SpanAttributes.DB_SYSTEM, self.vendor)
-                for key, value in attrs.items():
-                    span.set_attribute(key, value)
+        _attach_span(conn, context, span)
+        if span.is_recording():
+            if self.statement_sanitizer is not None:
+                statement = self.statement_sanitizer(statement)
+            span.set_attribute(SpanAttributes.DB_STATEMENT, statement)
 
     # pylint: disable=unused-argument
-    def _after_cur_exec(self, conn, cursor, statement, *args):
-        span = self.cursor_mapping.get(cursor, None)
+    def _after_cur_exec(
+        self, conn, cursor, statement, params, context, executemany
+    ):
+        span = _detach_span(conn, context)
         if span is None:
             return
 
         span.end()
-        self._cleanup(cursor)
 
     def _handle_error(self, context):
-        span = self.current_thread_span
+        span = _detach_span(context.connection, context.execution_context)
         if span is None:
             return
 
@@ -129,13 +240,23 @@ class EngineTracer:
                 )
         finally:
             span.end()
-            self._cleanup(context.cursor)
 
-    def _cleanup(self, cursor):
-        try:
-            del self.cursor_mapping[cursor]
-        except KeyError:
-            pass
+
+def _attach_span(conn, context, span):
+    """Stores the span of a statement on its execution context, so that it
+    is found by the events of the same execution whatever the thread or task
+    running it, and released with the context. Statements executed without
+    an execution context store it on their connection."""
+    setattr(conn if context is None else context, _SPAN_KEY, span)
+
+
+def _detach_span(conn, context):
+    """Removes and returns the span stored by `_attach_span`."""
+    target = conn if context is None else context
+    span = getattr(target, _SPAN_KEY, None)
+    if span is not None:
+        setattr(target, _SPAN_KEY, None)
+    return span
 
 
 def _get_attributes_from_url(url):
@@ -0,0 +1,81 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Thread
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from opentelemetry.instrumentation.sqlalchemy.engine import EngineTracer
+from opentelemetry.sdk.trace import TracerProvider
+
+QUERY_COUNT = 1000
+THREAD_COUNT = 8
+
+engine = create_engine("sqlite:///:memory:")
+EngineTracer(TracerProvider().get_tracer(__name__), engine)
+connection = engine.connect()
+
+
+def execute():
+    for _ in range(QUERY_COUNT):
+        connection.execute("SELECT 1").fetchall()
+
+
+def test_execute(benchmark):
+    benchmark(execute)
+
+
+def create_saturated_engine(record_pool):
+    # the threads wait for one of the two connections of the pool
+    saturated_engine = create_engine(
+        "sqlite:///:memory:",
+        poolclass=QueuePool,
+        pool_size=2,
+        max_overflow=0,
+        connect_args={"check_same_thread": False},
+    )
+    EngineTracer(
+        TracerProvider().get_tracer(__name__),
+        saturated_engine,
+        record_pool=record_pool,
+    )
+    return saturated_engine
+
+
+def checkout_and_execute(saturated_engine):
+    for _ in range(QUERY_COUNT // THREAD_COUNT):
+        with saturated_engine.connect() as saturated_connection:
+            saturated_connection.execute("SELECT 1").fetchall()
+
+
+def execute_saturated(saturated_engine):
+    threads = [
+        Thread(target=checkout_and_execute, args=(saturated_engine,))
+        for _ in range(THREAD_COUNT)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_execute_saturated_pool(benchmark):
+    saturated_engine = create_saturated_engine(False)
+    benchmark(execute_saturated, saturated_engine)
+
+
+def test_execute_saturated_pool_recorded(benchmark):
+    saturated_engine = create_saturated_engine(True)
+    benchmark(execute_saturated, saturated_engine)
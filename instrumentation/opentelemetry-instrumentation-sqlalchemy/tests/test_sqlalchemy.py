@@ -11,13 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
+import gc
 from unittest import mock
 
 from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
 
 from opentelemetry import trace
+from opentelemetry.instrumentation.sql import SqlSanitizer
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.instrumentation.sqlalchemy.engine import EngineTracer
+from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.test.test_base import TestBase
+from opentelemetry.trace import StatusCode
 
 
 class TestSqlalchemyInstrumentation(TestBase):
@@ -68,3 +75,238 @@ class TestSqlalchemyInstrumentation(TestBase):
         self.assertEqual(len(spans), 1)
         self.assertEqual(spans[0].name, "SELECT :memory:")
         self.assertEqual(spans[0].kind, trace.SpanKind.CLIENT)
+
+    def test_statement_sanitizer(self):
+        SQLAlchemyInstrumentor().instrument(statement_sanitizer=SqlSanitizer())
+        from sqlalchemy import create_engine  # pylint: disable-all
+
+        engine = create_engine("sqlite:///:memory:")
+        cnx = engine.connect()
+        cnx.execute("SELECT 1 + 1 WHERE 'a' IN ('a', 'b');").fetchall()
+        spans = self.memory_exporter.get_finished_spans()
+
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0].name, "SELECT :memory:")
+        self.assertEqual(
+            spans[0].attributes[SpanAttributes.DB_STATEMENT],
+            "SELECT ? + ? WHERE ? IN (?);",
+        )
+
+    def test_connection_attributes_cached(self):
+        class DBAPIConnection:
+            dsn = "dbname=database host=localhost port=5432"
+
+        engine = create_engine("sqlite:///:memory:")
+        engine_tracer = EngineTracer(
+            self.tracer_provider.get_tracer(__name__), engine
+        )
+        # the DSN of the DBAPI connections is parsed for postgresql engines
+        engine_tracer.vendor = "postgresql"
+        connections = [DBAPIConnection(), DBAPIConnection()]
+
+        with mock.patch(
+            "psycopg2.extensions.parse_dsn",
+            return_value={
+                "dbname": "database",
+                "host": "localhost",
+                "port": "5432",
+            },
+        ) as parse_dsn:
+            for connection in connections * 2:
+                cursor = mock.Mock(connection=connection)
+                context = mock.Mock(spec=[])
+                engine_tracer._before_cur_exec(
+                    None, cursor, "SELECT 1", (), context, False
+                )
+                engine_tracer._after_cur_exec(
+                    None, cursor, "SELECT 1", (), context, False
+                )
+
+        self.assertEqual(parse_dsn.call_count, 2)
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 4)
+        for span in spans:
+            self.assertEqual(span.name, "SELECT database")
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_NAME], "database"
+            )
+            self.assertEqual(
+                span.attributes[SpanAttributes.NET_PEER_NAME], "localhost"
+            )
+            self.assertEqual(
+                span.attributes[SpanAttributes.NET_PEER_PORT], 5432
+            )
+
+        del connections, connection, cursor, context
+        gc.collect()
+        self.assertEqual(len(engine_tracer._dbapi_connection_attributes), 0)
+
+    def test_error(self):
+        engine = create_engine("sqlite:///:memory:")
+        SQLAlchemyInstrumentor().instrument(
+            engine=engine, tracer_provider=self.tracer_provider,
+        )
+        cnx = engine.connect()
+        with self.assertRaises(Exception):
+            cnx.execute("SELECT * FROM missing_table")
+        cnx.execute("SELECT 1").fetchall()
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 2)
+        self.assertEqual(
+            spans[0].attributes[SpanAttributes.DB_STATEMENT],
+            "SELECT * FROM missing_table",
+        )
+        self.assertIs(spans[0].status.status_code, StatusCode.ERROR)
+        self.assertEqual(
+            spans[1].attributes[SpanAttributes.DB_STATEMENT], "SELECT 1"
+        )
+        self.assertIs(spans[1].status.status_code, StatusCode.UNSET)
+
+    def test_concurrent_statements(self):
+        engine = create_engine("sqlite:///:memory:")
+        engine_tracer = EngineTracer(
+            self.tracer_provider.get_tracer(__name__), engine
+        )
+        # the statements of an async engine run on the same thread and share
+        # their connection and cursor while they are interleaved
+        conn = mock.Mock(spec=[])
+        cursor = mock.Mock(spec=[])
+        contexts = [mock.Mock(spec=[]) for _ in range(10000)]
+
+        async def execute(index, context):
+            statement = "SELECT {}".format(index)
+            engine_tracer._before_cur_exec(
+                conn, cursor, statement, (), context, False
+            )
+            await asyncio.sleep(0)
+            if index % 2:
+                engine_tracer._handle_error(
+                    mock.Mock(
+                        connection=conn,
+                        execution_context=context,
+                        original_exception=ValueError(statement),
+                    )
+                )
+            else:
+                engine_tracer._after_cur_exec(
+                    conn, cursor, statement, (), context, False
+                )
+
+        async def execute_all():
+            await asyncio.gather(
+                *(
+                    execute(index, context)
+                    for index, context in enumerate(contexts)
+                )
+            )
+
+        asyncio.get_event_loop().run_until_complete(execute_all())
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), len(contexts))
+        for span in spans:
+            index = int(span.attributes[SpanAttributes.DB_STATEMENT][7:])
+            if index % 2:
+                self.assertIs(span.status.status_code, StatusCode.ERROR)
+                self.assertEqual(
+                    span.status.description, "SELECT {}".format(index)
+                )
+            else:
+                self.assertIs(span.status.status_code, StatusCode.UNSET)
+        # no span is left on the contexts once their statements ended
+        for context in contexts:
+            self.assertIsNone(getattr(context, "_otel_span"))
+        self.assertFalse(hasattr(conn, "_otel_span"))
+
+    def test_record_pool(self):
+        engine = create_engine(
+            "sqlite:///:memory:", poolclass=QueuePool, pool_size=2
+        )
+        SQLAlchemyInstrumentor().instrument(
+            engine=engine,
+            tracer_provider=self.tracer_provider,
+            record_pool=True,
+        )
+        cnx = engine.connect()
+        cnx.execute("SELECT 1").fetchall()
+        cnx.execute("SELECT 2").fetchall()
+        cnx.close()
+        cnx = engine.connect()
+        cnx.execute("SELECT 3").fetchall()
+        cnx.close()
+        engine.dispose()
+        cnx = engine.connect()
+        cnx.execute("SELECT 4").fetchall()
+        cnx.close()
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 4)
+        first, second, third, fourth = (span.attributes for span in spans)
+
+        self.assertGreaterEqual(first["db.pool.checkout.duration"], 0)
+        self.assertEqual(first["db.pool.size"], 2)
+        self.assertEqual(first["db.pool.overflow"], -1)
+        self.assertEqual(first["db.pool.checked_out"], 1)
+        self.assertTrue(first["db.pool.connection.created"])
+        # the attributes are only recorded on the first statement
+        self.assertNotIn("db.pool.checkout.duration", second)
+        # the connection was returned to the pool
+        self.assertIn("db.pool.checkout.duration", third)
+        self.assertNotIn("db.pool.connection.created", third)
+        # the pool was replaced by a new pool
+        self.assertIn("db.pool.checkout.duration", fourth)
+        self.assertTrue(fourth["db.pool.connection.created"])
+
+    def test_record_singleton_thread_pool(self):
+        # the default pool of in-memory SQLite databases, whose size is an
+        # attribute rather than a method
+        engine = create_engine("sqlite:///:memory:")
+        SQLAlchemyInstrumentor().instrument(
+            engine=engine,
+            tracer_provider=self.tracer_provider,
+            record_pool=True,
+        )
+        cnx = engine.connect()
+        cnx.execute("SELECT 1").fetchall()
+        cnx.close()
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        attributes = spans[0].attributes
+        self.assertGreaterEqual(attributes["db.pool.checkout.duration"], 0)
+        self.assertNotIn("db.pool.size", attributes)
+
+    def test_record_pool_status_error(self):
+        engine = create_engine(
+            "sqlite:///:memory:", poolclass=QueuePool, pool_size=2
+        )
+        engine.pool.checkedout = mock.Mock(side_effect=ValueError)
+        SQLAlchemyInstrumentor().instrument(
+            engine=engine,
+            tracer_provider=self.tracer_provider,
+            record_pool=True,
+        )
+        cnx = engine.connect()
+        cnx.execute("SELECT 1").fetchall()
+        cnx.close()
+
+        # the connection was checked out and returned to the pool
+        self.assertEqual(engine.pool.checkedin(), 1)
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        self.assertNotIn("db.pool.checkout.duration", spans[0].attributes)
+
+    def test_pool_not_recorded(self):
+        engine = create_engine(
+            "sqlite:///:memory:", poolclass=QueuePool, pool_size=2
+        )
+        SQLAlchemyInstrumentor().instrument(
+            engine=engine, tracer_provider=self.tracer_provider,
+        )
+        cnx = engine.connect()
+        cnx.execute("SELECT 1").fetchall()
+
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        self.assertNotIn("db.pool.checkout.duration", spans[0].attributes)
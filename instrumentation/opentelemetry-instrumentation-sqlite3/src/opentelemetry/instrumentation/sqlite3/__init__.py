@@ -63,6 +63,8 @@ class SQLite3Instrumentor(BaseInstrumentor):
         https://docs.python.org/3/library/sqlite3.html
         """
         tracer_provider = kwargs.get("tracer_provider")
+        statement_sanitizer = kwargs.get("statement_sanitizer")
+        record_fetches = kwargs.get("record_fetches", False)
 
         dbapi.wrap_connect(
             __name__,
@@ -72,6 +74,8 @@ class SQLite3Instrumentor(BaseInstrumentor):
             _CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
+            record_fetches=record_fetches,
         )
 
     def _uninstrument(self, **kwargs):
@@ -79,13 +83,22 @@ class SQLite3Instrumentor(BaseInstrumentor):
         dbapi.unwrap_connect(sqlite3, "connect")
 
     @staticmethod
-    def instrument_connection(connection, tracer_provider=None):
+    def instrument_connection(
+        connection,
+        tracer_provider=None,
+        statement_sanitizer=None,
+        record_fetches=False,
+    ):
         """Enable instrumentation in a SQLite connection.
 
         Args:
             connection: The connection to instrument.
             tracer_provider: The optional tracer provider to use. If omitted
                 the current globally configured one is used.
+            statement_sanitizer: Optional callable returning the value of the
+                db.statement attribute from the executed statement.
+            record_fetches: Whether the fetches of the results of a statement
+                are recorded in a span following the span of its execution.
 
         Returns:
             An instrumented connection.
@@ -98,6 +111,8 @@ class SQLite3Instrumentor(BaseInstrumentor):
             _CONNECTION_ATTRIBUTES,
             version=__version__,
             tracer_provider=tracer_provider,
+            statement_sanitizer=statement_sanitizer,
+            record_fetches=record_fetches,
         )
 
     @staticmethod
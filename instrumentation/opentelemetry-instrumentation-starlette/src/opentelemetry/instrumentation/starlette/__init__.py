@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import weakref
+from functools import lru_cache
 from typing import Collection
 
 from starlette import applications
-from starlette.routing import Match
+from starlette.routing import Match, Mount, Route, WebSocketRoute
 
 from opentelemetry.instrumentation.asgi import OpenTelemetryMiddleware
 from opentelemetry.instrumentation.asgi.package import _instruments
@@ -71,6 +73,109 @@ class _InstrumentedStarlette(applications.Starlette):
         )
 
 
+# routes matched only on the scope type, method and path, for which the
+# matched route can be cached by these values
+_PATH_MATCHES = (Route.matches, WebSocketRoute.matches, Mount.matches)
+_REGEX_CHARS = frozenset("{}.^$*+?[]()|\\")
+
+
+class _RouteIndex:
+    """Index of the routes of an application by the first segment of their
+    path, so that only the routes that can match a path are tried.
+
+    Routes whose first path segment has a parameter, or whose type is not
+    known, are tried for every path. The route matched for the most recent
+    paths is cached unless one of the routes may also match other parts of
+    the scope, like the host.
+    """
+
+    _MAX_CACHE_SIZE = 1024
+
+    def __init__(self, routes):
+        # copy of the routes the index was built from, compared with the
+        # routes of the application to detect routes added, replaced or
+        # reordered
+        self._routes = list(routes)
+
+        indexed_routes = {}
+        wildcard_routes = []
+        cacheable = True
+        for index, route in enumerate(routes):
+            if type(route).matches not in _PATH_MATCHES:
+                cacheable = False
+            segment = _get_static_segment(getattr(route, "path", ""))
+            if segment is None:
+                wildcard_routes.append((index, route))
+            else:
+                indexed_routes.setdefault(segment, []).append((index, route))
+
+        # routes tried for paths starting with each segment, in their order
+        # in the application
+        self._routes_by_segment = {
+            segment: [
+                route for _, route in sorted(segment_routes + wildcard_routes)
+            ]
+            for segment, segment_routes in indexed_routes.items()
+        }
+        self._wildcard_routes = [route for _, route in wildcard_routes]
+
+        if cacheable:
+            self._match_path = lru_cache(maxsize=self._MAX_CACHE_SIZE)(
+                self._match_path
+            )
+        self._cacheable = cacheable
+
+    def is_current(self, routes):
+        # the routes are compared by identity first, and a replaced route
+        # equal to the original one matches the same paths
+        return routes == self._routes
+
+    def get_route(self, scope):
+        if self._cacheable:
+            return self._match_path(
+                scope["type"], scope.get("method"), scope["path"]
+            )
+        return self._match(scope)
+
+    def _match_path(self, scope_type, method, path):
+        return self._match(
+            {"type": scope_type, "method": method, "path": path}
+        )
+
+    def _match(self, scope):
+        path = scope.get("path", "")
+        routes = self._routes_by_segment.get(
+            _get_path_segment(path), self._wildcard_routes
+        )
+        route = None
+        for starlette_route in routes:
+            match, _ = starlette_route.matches(scope)
+            if match == Match.FULL:
+                return starlette_route.path
+            if match == Match.PARTIAL:
+                route = starlette_route.path
+        return route
+
+
+def _get_path_segment(path):
+    return path[1:].split("/", 1)[0]
+
+
+def _get_static_segment(route_path):
+    """Returns the first segment of the path of a route, or ``None`` if it is
+    empty or may match other segments."""
+    if not route_path.startswith("/"):
+        return None
+    segment = _get_path_segment(route_path)
+    # starlette does not escape the static parts of the path in its regex
+    if not segment or any(char in _REGEX_CHARS for char in segment):
+        return None
+    return segment
+
+
+_route_indexes = weakref.WeakKeyDictionary()
+
+
 def _get_route_details(scope):
     """Callback to retrieve the starlette route being served.
 
@@ -80,14 +185,12 @@ def _get_route_details(scope):
     See: https://github.com/encode/starlette/pull/804
     """
     app = scope["app"]
-    route = None
-    for starlette_route in app.routes:
-        match, _ = starlette_route.matches(scope)
-        if match == Match.FULL:
-            route = starlette_route.path
-            break
-        if match == Match.PARTIAL:
-            route = starlette_route.path
+    routes = app.routes
+    # the index is rebuilt when the routes are changed
+    route_index = _route_indexes.get(app)
+    if route_index is None or not route_index.is_current(routes):
+        route_index = _route_indexes[app] = _RouteIndex(routes)
+    route = route_index.get_route(scope)
     # method only exists for http, if websocket
     # leave it blank.
     span_name = route or scope.get("method", "")
@@ -0,0 +1,79 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from starlette import applications
+from starlette.responses import PlainTextResponse
+from starlette.routing import Match, Route
+
+from opentelemetry.instrumentation.starlette import _get_route_details
+
+REQUEST_COUNT = 1000
+
+
+def endpoint(_):
+    return PlainTextResponse("hi")
+
+
+def create_app(route_count):
+    # half static routes, half routes with a path parameter
+    routes = []
+    for index in range(route_count // 2):
+        routes.append(Route("/static%d/items" % index, endpoint))
+        routes.append(Route("/resource%d/{item_id:int}" % index, endpoint))
+    return applications.Starlette(routes=routes)
+
+
+def create_scopes(app, route_count):
+    scopes = []
+    for index in range(REQUEST_COUNT):
+        route = index % (route_count // 2)
+        if index % 2:
+            path = "/static%d/items" % route
+        else:
+            path = "/resource%d/%d" % (route, index)
+        scopes.append(
+            {"type": "http", "method": "GET", "path": path, "app": app}
+        )
+    return scopes
+
+
+def scan_route_details(scope):
+    """The linear scan over all the routes replaced by the route index."""
+    route = None
+    for starlette_route in scope["app"].routes:
+        match, _ = starlette_route.matches(scope)
+        if match == Match.FULL:
+            route = starlette_route.path
+            break
+        if match == Match.PARTIAL:
+            route = starlette_route.path
+    return route
+
+
+@pytest.mark.parametrize("route_count", [10, 100, 1000])
+@pytest.mark.parametrize(
+    "get_route_details",
+    [scan_route_details, _get_route_details],
+    ids=["scan", "index"],
+)
+def test_route_details(benchmark, get_route_details, route_count):
+    app = create_app(route_count)
+    scopes = create_scopes(app, route_count)
+
+    def get_routes():
+        for scope in scopes:
+            get_route_details(scope)
+
+    benchmark(get_routes)
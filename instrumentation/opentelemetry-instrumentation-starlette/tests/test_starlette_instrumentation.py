@@ -17,7 +17,7 @@ from unittest.mock import patch
 
 from starlette import applications
 from starlette.responses import PlainTextResponse
-from starlette.routing import Route
+from starlette.routing import Host, Match, Mount, Route, WebSocketRoute
 from starlette.testclient import TestClient
 
 import opentelemetry.instrumentation.starlette as otel_starlette
@@ -148,3 +148,121 @@ class TestAutoInstrumentationLogic(unittest.TestCase):
 
         should_be_original = applications.Starlette
         self.assertIs(original, should_be_original)
+
+
+def _scan_route(app, scope):
+    route = None
+    for starlette_route in app.routes:
+        match, _ = starlette_route.matches(scope)
+        if match == Match.FULL:
+            return starlette_route.path
+        if match == Match.PARTIAL:
+            route = starlette_route.path
+    return route
+
+
+class TestRouteDetails(unittest.TestCase):
+    @staticmethod
+    def _endpoint(_):
+        return PlainTextResponse("hi")
+
+    def _create_app(self):
+        return applications.Starlette(
+            routes=[
+                Route("/", self._endpoint),
+                Route("/user/{username}", self._endpoint, methods=["POST"]),
+                Route("/user/me", self._endpoint),
+                Route("/user/{username}", self._endpoint),
+                Route("/v1.0/status", self._endpoint),
+                Mount("/api", routes=[Route("/items", self._endpoint)]),
+                WebSocketRoute("/ws/{room}", self._endpoint),
+                Route("/{page}", self._endpoint),
+            ]
+        )
+
+    @staticmethod
+    def _create_scope(app, path, method="GET", scope_type="http"):
+        scope = {"type": scope_type, "path": path, "app": app}
+        if scope_type == "http":
+            scope["method"] = method
+        return scope
+
+    def test_same_route_as_scan(self):
+        app = self._create_app()
+        requests = [
+            ("/", "GET", "http"),
+            ("/user/me", "GET", "http"),
+            ("/user/me", "POST", "http"),
+            ("/user/bob", "GET", "http"),
+            ("/user/bob", "POST", "http"),
+            ("/user/bob/extra", "GET", "http"),
+            ("/v1.0/status", "GET", "http"),
+            ("/v1x0/status", "GET", "http"),
+            ("/api/items", "GET", "http"),
+            ("/api/unknown", "GET", "http"),
+            ("/ws/lobby", None, "websocket"),
+            ("/ws/lobby", "GET", "http"),
+            ("/about", "GET", "http"),
+            ("/about/us", "GET", "http"),
+        ]
+        for path, method, scope_type in requests:
+            with self.subTest(path=path, method=method, type=scope_type):
+                # the second lookup is served from the cache
+                for _ in range(2):
+                    scope = self._create_scope(app, path, method, scope_type)
+                    route = _scan_route(app, scope)
+                    self.assertEqual(
+                        otel_starlette._get_route_details(scope),
+                        (
+                            route or (method or ""),
+                            {SpanAttributes.HTTP_ROUTE: route}
+                            if route
+                            else {},
+                        ),
+                    )
+
+    def test_routes_added(self):
+        app = self._create_app()
+        scope = self._create_scope(app, "/new/route")
+        self.assertEqual(otel_starlette._get_route_details(scope)[0], "GET")
+
+        app.add_route("/new/route", self._endpoint)
+        self.assertEqual(
+            otel_starlette._get_route_details(scope)[0], "/new/route"
+        )
+
+    def test_routes_replaced_or_reordered(self):
+        app = self._create_app()
+        scope = self._create_scope(app, "/user/me")
+        self.assertEqual(
+            otel_starlette._get_route_details(scope)[0], "/user/me"
+        )
+
+        app.routes[2] = Route("/user/self", self._endpoint)
+        self.assertEqual(
+            otel_starlette._get_route_details(scope)[0], "/user/{username}"
+        )
+
+        app = self._create_app()
+        scope = self._create_scope(app, "/user/me")
+        self.assertEqual(
+            otel_starlette._get_route_details(scope)[0], "/user/me"
+        )
+
+        app.routes.insert(1, app.routes.pop(3))
+        self.assertEqual(
+            otel_starlette._get_route_details(scope)[0], "/user/{username}"
+        )
+
+    def test_host_routes(self):
+        app = applications.Starlette(
+            routes=[
+                Host("api.example.com", Route("/", self._endpoint)),
+                Route("/", self._endpoint),
+            ]
+        )
+        # Host routes are never cached as they match on the host header
+        scope = self._create_scope(app, "/")
+        scope["headers"] = [(b"host", b"www.example.com")]
+        self.assertEqual(otel_starlette._get_route_details(scope)[0], "/")
+        self.assertFalse(otel_starlette._route_indexes[app]._cacheable)
@@ -260,11 +260,14 @@ class OpenTelemetryMiddleware:
         token = context.attach(extract(environ, getter=wsgi_getter))
 
         span = self.tracer.start_span(
-            get_default_span_name(environ),
-            kind=trace.SpanKind.SERVER,
-            attributes=collect_request_attributes(environ),
+            get_default_span_name(environ), kind=trace.SpanKind.SERVER,
         )
 
+        # request attributes are only collected for spans that are recorded
+        recording = span.is_recording()
+        if recording:
+            span.set_attributes(collect_request_attributes(environ))
+
         if self.request_hook:
             self.request_hook(span, environ)
 
@@ -274,9 +277,10 @@ class OpenTelemetryMiddleware:
 
         try:
             with trace.use_span(span):
-                start_response = self._create_start_response(
-                    span, start_response, response_hook
-                )
+                if recording or response_hook:
+                    start_response = self._create_start_response(
+                        span, start_response, response_hook
+                    )
                 iterable = self.wsgi(environ, start_response)
                 return _end_span_after_iterating(
                     iterable, span, self.tracer, token
@@ -0,0 +1,49 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+from opentelemetry.instrumentation.wsgi import OpenTelemetryMiddleware
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import TraceIdRatioBased
+
+REQUEST_COUNT = 1000
+
+
+def simple_wsgi(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"*"]
+
+
+def start_response(status, response_headers, exc_info=None):
+    return lambda data: None
+
+
+@pytest.mark.parametrize("rate", [0.0, 0.01, 1.0], ids=["0%", "1%", "100%"])
+def test_wsgi_middleware(benchmark, rate):
+    app = OpenTelemetryMiddleware(
+        simple_wsgi,
+        tracer_provider=TracerProvider(sampler=TraceIdRatioBased(rate)),
+    )
+    environ = {"HTTP_USER_AGENT": "benchmark", "REMOTE_ADDR": "127.0.0.1"}
+    setup_testing_defaults(environ)
+
+    def handle_requests():
+        for _ in range(REQUEST_COUNT):
+            for _ in app(dict(environ), start_response):
+                pass
+
+    benchmark(handle_requests)
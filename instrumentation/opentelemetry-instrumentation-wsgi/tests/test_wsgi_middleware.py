@@ -172,8 +172,30 @@ class TestWsgiApplication(WsgiTestBase):
             self.assertFalse(mock_span.is_recording())
             self.assertTrue(mock_span.is_recording.called)
             self.assertFalse(mock_span.set_attribute.called)
+            self.assertFalse(mock_span.set_attributes.called)
             self.assertFalse(mock_span.set_status.called)
 
+    def test_wsgi_not_recording_start_response(self):
+        mock_tracer = mock.Mock()
+        mock_span = mock.Mock()
+        mock_span.is_recording.return_value = False
+        mock_tracer.start_span.return_value = mock_span
+        start_responses = []
+
+        def start_response_wsgi(environ, start_response):
+            start_responses.append(start_response)
+            return simple_wsgi(environ, start_response)
+
+        with mock.patch("opentelemetry.trace.get_tracer") as tracer:
+            tracer.return_value = mock_tracer
+            app = otel_wsgi.OpenTelemetryMiddleware(start_response_wsgi)
+            list(app(self.environ, self.start_response))
+
+            # start_response is not wrapped as there is nothing to record
+            self.assertEqual(start_responses, [self.start_response])
+            self.assertEqual(self.status, "200 OK")
+            self.assertTrue(mock_span.end.called)
+
     def test_wsgi_iterable(self):
         original_response = Response()
         iter_wsgi = create_iter_wsgi(original_response)
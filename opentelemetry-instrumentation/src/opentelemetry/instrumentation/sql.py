@@ -0,0 +1,253 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers shared by the instrumentations of SQL databases.
+
+The database instrumentations accept a ``statement_sanitizer`` option, a
+callable returning the value of the ``db.statement`` attribute from the
+executed statement. `SqlSanitizer` replaces the literals of the statement
+with placeholders so that the attribute does not contain sensitive values and
+is the same for all executions of a statement:
+
+.. code-block:: python
+
+    from opentelemetry.instrumentation.psycopg2 import Psycopg2Instrumentor
+    from opentelemetry.instrumentation.sql import SqlSanitizer
+
+    Psycopg2Instrumentor().instrument(
+        statement_sanitizer=SqlSanitizer(max_length=1024)
+    )
+"""
+
+import re
+import typing
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import islice
+
+# literals quoted with single quotes, where quotes are escaped by a backslash
+# or doubled
+_SINGLE_QUOTED = r"[bBeEnNxX]?'(?:[^'\\]|\\.|'')*(?:'|\Z)"
+_DOUBLE_QUOTED_STRING = r'"(?:[^"\\]|\\.|"")*(?:"|\Z)'
+_DOUBLE_QUOTED_IDENTIFIER = r'"(?:[^"]|"")*(?:"|\Z)'
+_BACK_QUOTED_IDENTIFIER = r"`[^`]*(?:`|\Z)"
+_TOKEN_REGEX = r"""
+    (?P<space>\s+)
+    |(?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+    |(?P<string>{string})
+    |(?P<dollar>\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?(?:\$(?P=tag)\$|\Z))
+    |(?P<identifier>{identifier})
+    |(?P<placeholder>\?|%s|%\([^)]*\)s|\$\d+|:[A-Za-z_]\w*)
+    |(?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<word>[A-Za-z_][\w$]*)
+    |(?P<other>.)
+"""
+_TOKEN_PATTERN = re.compile(
+    _TOKEN_REGEX.format(
+        string=_SINGLE_QUOTED,
+        identifier=_DOUBLE_QUOTED_IDENTIFIER + "|" + _BACK_QUOTED_IDENTIFIER,
+    ),
+    re.VERBOSE | re.DOTALL,
+)
+# double quotes delimit string literals rather than identifiers, as in MySQL
+_DOUBLE_QUOTED_STRINGS_TOKEN_PATTERN = re.compile(
+    _TOKEN_REGEX.format(
+        string=_SINGLE_QUOTED + "|" + _DOUBLE_QUOTED_STRING,
+        identifier=_BACK_QUOTED_IDENTIFIER,
+    ),
+    re.VERBOSE | re.DOTALL,
+)
+
+_LITERALS = frozenset(("string", "dollar", "number"))
+_PLACEHOLDER = "?"
+
+DEFAULT_MAX_PARAMETERS_LENGTH = 1024
+# number of rows of a batch recorded in db.statement.parameters
+_MAX_SAMPLE_ROWS = 10
+_TRUNCATED = "..."
+
+
+class SqlSanitizer:
+    """Sanitizes SQL statements to be recorded as span attributes.
+
+    Statements are scanned in a single pass where string and numeric
+    literals are replaced with ``?``, comments are removed and whitespace
+    is collapsed. Placeholders like ``%s``, ``$1`` or ``:name`` are kept.
+
+    Text quoted with double quotes is kept as it is an identifier in standard
+    SQL. Databases accepting string literals quoted with double quotes, like
+    MySQL by default, need ``double_quoted_strings`` so that they are
+    sanitized.
+
+    Args:
+        max_length: Optional maximum length in bytes of the sanitized
+            statement, longer statements are truncated.
+        collapse_lists: Whether lists of literals or placeholders following
+            ``IN`` are collapsed to ``(?)``, so that the statement does not
+            depend on the number of values.
+        max_cache_size: Number of sanitized statements cached.
+        double_quoted_strings: Whether text quoted with double quotes is a
+            string literal rather than an identifier.
+    """
+
+    # longer statements are not cached as they are unlikely to be repeated
+    _MAX_CACHED_STATEMENT_LENGTH = 8192
+
+    def __init__(
+        self,
+        max_length: typing.Optional[int] = None,
+        collapse_lists: bool = True,
+        max_cache_size: int = 512,
+        double_quoted_strings: bool = False,
+    ):
+        if max_length is not None and max_length <= 0:
+            raise ValueError("max_length must be a positive integer.")
+
+        self.max_length = max_length
+        self.collapse_lists = collapse_lists
+        self._token_pattern = (
+            _DOUBLE_QUOTED_STRINGS_TOKEN_PATTERN
+            if double_quoted_strings
+            else _TOKEN_PATTERN
+        )
+        self._cached_sanitize = lru_cache(maxsize=max_cache_size)(
+            self._sanitize
+        )
+
+    def __call__(self, statement: str) -> str:
+        if len(statement) > self._MAX_CACHED_STATEMENT_LENGTH:
+            return self._sanitize(statement)
+        return self._cached_sanitize(statement)
+
+    def _sanitize(self, statement: str) -> str:
+        max_length = self.max_length
+        output = []
+        length = 0
+        # whether the previous token is the IN keyword
+        after_in = False
+        # index in output of the opening parenthesis of a list of values
+        # following IN, while it only contains values
+        list_start = None
+
+        for match in self._token_pattern.finditer(statement):
+            kind = match.lastgroup
+
+            if kind in ("space", "comment"):
+                if output and output[-1] != " ":
+                    output.append(" ")
+                    length += 1
+                continue
+
+            if kind in _LITERALS:
+                text = _PLACEHOLDER
+            else:
+                text = match.group()
+
+            if list_start is not None:
+                if text == ")":
+                    length -= sum(map(len, output[list_start:]))
+                    del output[list_start:]
+                    text = "(?)"
+                    list_start = None
+                elif not (
+                    kind in _LITERALS or kind == "placeholder" or text == ","
+                ):
+                    list_start = None
+            elif after_in and text == "(" and self.collapse_lists:
+                list_start = len(output)
+
+            after_in = kind == "word" and text.upper() == "IN"
+            output.append(text)
+            length += len(text)
+
+            # a list being collapsed is not truncated as its values are
+            # replaced once it ends
+            if (
+                max_length is not None
+                and length > max_length
+                and list_start is None
+            ):
+                break
+
+        sanitized = "".join(output).strip()
+        if max_length is not None:
+            encoded = sanitized.encode("utf-8")
+            if len(encoded) > max_length:
+                sanitized = encoded[:max_length].decode("utf-8", "ignore")
+        return sanitized
+
+
+def _truncate(text: str, max_length: int) -> str:
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_length:
+        return text
+    if max_length <= len(_TRUNCATED):
+        # no room for the mark
+        return encoded[:max_length].decode("utf-8", "ignore")
+    return (
+        encoded[: max_length - len(_TRUNCATED)].decode("utf-8", "ignore")
+        + _TRUNCATED
+    )
+
+
+def get_parameters_attributes(
+    parameters: typing.Any,
+    many: bool = False,
+    max_length: int = DEFAULT_MAX_PARAMETERS_LENGTH,
+) -> typing.Dict[str, typing.Any]:
+    """Returns the attributes describing the parameters of a statement.
+
+    The parameters are recorded in ``db.statement.parameters``, truncated to
+    ``max_length`` bytes. When ``many`` is true the parameters are the rows of
+    a batch, as passed to ``executemany``: only the first rows are formatted,
+    and the number of rows and the total formatted length of the batch are
+    recorded in ``db.statement.parameters.batch_size`` and
+    ``db.statement.parameters.size``. When the batch has more rows than the
+    sample, its length is estimated from the average length of the sampled
+    rows, so that the cost does not depend on the size of the batch.
+    """
+    if not many or not isinstance(parameters, Sequence):
+        # other iterables are not consumed as the database needs them
+        return {
+            "db.statement.parameters": _truncate(str(parameters), max_length)
+        }
+
+    sample = []
+    sample_length = 2  # brackets
+    for row in islice(parameters, _MAX_SAMPLE_ROWS):
+        text = repr(row)
+        sample.append(text)
+        sample_length += len(text) + 2
+        if sample_length > max_length:
+            break
+
+    if len(sample) < len(parameters):
+        rows_length = sample_length - 2 - 2 * len(sample)
+        size = round(rows_length / len(sample) * len(parameters)) + 2 * len(
+            parameters
+        )
+    else:
+        size = sample_length - 2 if sample else 2
+
+    formatted = ", ".join(sample)
+    if len(sample) < len(parameters):
+        formatted += ", " + _TRUNCATED
+    return {
+        "db.statement.parameters": _truncate(
+            "[" + formatted + "]", max_length
+        ),
+        "db.statement.parameters.batch_size": len(parameters),
+        "db.statement.parameters.size": size,
+    }
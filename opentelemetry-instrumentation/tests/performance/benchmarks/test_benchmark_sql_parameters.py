@@ -0,0 +1,56 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tracemalloc
+
+from opentelemetry.instrumentation.sql import get_parameters_attributes
+
+# a bulk insert of 100k rows
+rows = [
+    (index, "name %d" % index, "user%d@example.com" % index, index * 1.5)
+    for index in range(100000)
+]
+
+
+def test_get_parameters_attributes_batch(benchmark):
+    benchmark(get_parameters_attributes, rows, many=True)
+
+
+def test_get_parameters_attributes_larger_batch(benchmark):
+    # the cost does not depend on the number of rows of the batch
+    benchmark(get_parameters_attributes, rows * 10, many=True)
+
+
+def test_str_batch(benchmark):
+    # formatting the whole batch, for comparison
+    benchmark(str, rows)
+
+
+def _peak_memory(function, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_get_parameters_attributes_batch_memory():
+    peak = _peak_memory(get_parameters_attributes, rows, many=True)
+    print(
+        "\npeak memory: %d bytes, formatting the batch: %d bytes"
+        % (peak, _peak_memory(str, rows))
+    )
+    # the batch is formatted row by row
+    assert peak < 64 * 1024
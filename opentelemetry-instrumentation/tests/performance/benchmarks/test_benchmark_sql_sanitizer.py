@@ -0,0 +1,65 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry.instrumentation.sql import SqlSanitizer
+
+# a hundred distinct statements executed repeatedly by an application
+statements = [
+    "SELECT id, name, email FROM users_%d WHERE id = %d AND name = 'user %d' "
+    "AND status IN (1, 2, 3) ORDER BY created_at DESC LIMIT 10"
+    % (index % 100, index % 100, index % 100)
+    for index in range(1000)
+]
+
+# a bulk statement of about 1MB
+large_statement = "INSERT INTO events (id, payload) VALUES %s" % ", ".join(
+    "(%d, 'payload of the event number %d')" % (index, index)
+    for index in range(25000)
+)
+
+large_in_statement = "SELECT * FROM events WHERE id IN (%s)" % ", ".join(
+    map(str, range(100000))
+)
+
+
+def test_sanitize_statements(benchmark):
+    sanitize = SqlSanitizer()
+
+    def sanitize_statements():
+        for statement in statements:
+            sanitize(statement)
+
+    benchmark(sanitize_statements)
+
+
+def test_sanitize_statements_uncached(benchmark):
+    sanitize = SqlSanitizer(max_cache_size=0)
+
+    def sanitize_statements():
+        for statement in statements:
+            sanitize(statement)
+
+    benchmark(sanitize_statements)
+
+
+def test_sanitize_large_statement(benchmark):
+    benchmark(SqlSanitizer(), large_statement)
+
+
+def test_sanitize_large_statement_truncated(benchmark):
+    benchmark(SqlSanitizer(max_length=2048), large_statement)
+
+
+def test_sanitize_large_in_statement(benchmark):
+    benchmark(SqlSanitizer(max_length=2048), large_in_statement)
@@ -0,0 +1,233 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+from opentelemetry.instrumentation.sql import (
+    SqlSanitizer,
+    get_parameters_attributes,
+)
+
+
+class TestSqlSanitizer(TestCase):
+    def test_literals(self):
+        sanitize = SqlSanitizer()
+
+        for statement, expected in (
+            ("SELECT * FROM t WHERE a = 'x'", "SELECT * FROM t WHERE a = ?"),
+            ("SELECT 'it''s', 'it\\'s'", "SELECT ?, ?"),
+            ("SELECT E'\\n', N'x', X'0F'", "SELECT ?, ?, ?"),
+            (
+                "SELECT 1, -2.5, .5, 1e10, 3.2E-4, 0xFF",
+                "SELECT ?, -?, ?, ?, ?, ?",
+            ),
+            ("SELECT $$text$$, $tag$a $ b$tag$", "SELECT ?, ?"),
+            ("SELECT 'unterminated", "SELECT ?"),
+        ):
+            with self.subTest(statement=statement):
+                self.assertEqual(sanitize(statement), expected)
+
+    def test_escaped_quotes(self):
+        self.assertEqual(
+            SqlSanitizer()(
+                "UPDATE t SET a = 'it\\'s secret', b = 'C:\\\\' WHERE c = 'x'"
+            ),
+            "UPDATE t SET a = ?, b = ? WHERE c = ?",
+        )
+
+    def test_double_quoted_strings(self):
+        statement = 'SELECT "it\\"s secret", `b` FROM "t" WHERE c = "x"'
+        # identifiers by default
+        self.assertEqual(SqlSanitizer()(statement), statement)
+        self.assertEqual(
+            SqlSanitizer(double_quoted_strings=True)(statement),
+            "SELECT ?, `b` FROM ? WHERE c = ?",
+        )
+        self.assertEqual(
+            SqlSanitizer(double_quoted_strings=True)('SELECT "a""b", "c'),
+            "SELECT ?, ?",
+        )
+
+    def test_kept_tokens(self):
+        sanitize = SqlSanitizer()
+
+        for statement in (
+            "SELECT table1.col2 FROM schema3.table1",
+            'SELECT "column 1", `column 2` FROM "table\'s"',
+            "SELECT a$b, x::int FROM t",
+            "SELECT ?, %s, %(name)s, :name, $1 FROM t",
+        ):
+            with self.subTest(statement=statement):
+                self.assertEqual(sanitize(statement), statement)
+
+    def test_whitespace_and_comments(self):
+        self.assertEqual(
+            SqlSanitizer()(
+                "  SELECT a, -- the a column\n\tb /* the b column */\n"
+                "FROM t /* unterminated"
+            ),
+            "SELECT a, b FROM t",
+        )
+
+    def test_collapse_lists(self):
+        sanitize = SqlSanitizer()
+
+        for statement, expected in (
+            (
+                "SELECT * FROM t WHERE a IN (1, 2, 3)",
+                "SELECT * FROM t WHERE a IN (?)",
+            ),
+            (
+                "SELECT * FROM t WHERE a in ( %s,%s )",
+                "SELECT * FROM t WHERE a in (?)",
+            ),
+            (
+                "SELECT * FROM t WHERE a IN ('a') AND b = 1",
+                "SELECT * FROM t WHERE a IN (?) AND b = ?",
+            ),
+            (
+                "SELECT * FROM t WHERE a IN (SELECT b FROM u WHERE c = 1)",
+                "SELECT * FROM t WHERE a IN (SELECT b FROM u WHERE c = ?)",
+            ),
+            (
+                "SELECT * FROM t WHERE a IN (1, b)",
+                "SELECT * FROM t WHERE a IN (?, b)",
+            ),
+            ("INSERT INTO t VALUES (1, 2)", "INSERT INTO t VALUES (?, ?)"),
+        ):
+            with self.subTest(statement=statement):
+                self.assertEqual(sanitize(statement), expected)
+
+        self.assertEqual(
+            SqlSanitizer(collapse_lists=False)(
+                "SELECT * FROM t WHERE a IN (1, 2)"
+            ),
+            "SELECT * FROM t WHERE a IN (?, ?)",
+        )
+
+    def test_max_length(self):
+        self.assertEqual(
+            SqlSanitizer(max_length=20)("SELECT aaaa, bbbb, cccc FROM t"),
+            "SELECT aaaa, bbbb, c",
+        )
+        self.assertEqual(
+            SqlSanitizer(max_length=20)("SELECT a FROM t WHERE é = 1"),
+            "SELECT a FROM t WHER",
+        )
+        # truncated at a character boundary
+        self.assertEqual(SqlSanitizer(max_length=9)("SELECT aé"), "SELECT a")
+        # the list is collapsed before truncating
+        values = ", ".join(map(str, range(5000)))
+        self.assertEqual(
+            SqlSanitizer(max_length=40)(
+                "SELECT a FROM t WHERE b IN (%s) AND c = 1" % values
+            ),
+            "SELECT a FROM t WHERE b IN (?) AND c = ?",
+        )
+
+        with self.assertRaises(ValueError):
+            SqlSanitizer(max_length=0)
+
+    def test_cache(self):
+        sanitize = SqlSanitizer(max_cache_size=2)
+        # pylint: disable=protected-access
+        sanitize("SELECT 1")
+        sanitize("SELECT 1")
+        sanitize("SELECT 'x' FROM t%s" % ("a" * 10000))
+
+        info = sanitize._cached_sanitize.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.currsize, 1)
+
+
+class TestGetParametersAttributes(TestCase):
+    def test_parameters(self):
+        self.assertEqual(
+            get_parameters_attributes(("a", 1)),
+            {"db.statement.parameters": "('a', 1)"},
+        )
+        self.assertEqual(
+            get_parameters_attributes(("a" * 100,), max_length=10),
+            {"db.statement.parameters": "('aaaaa..."},
+        )
+        for max_length in (1, 2, 3):
+            with self.subTest(max_length=max_length):
+                self.assertEqual(
+                    get_parameters_attributes(
+                        ("a" * 100,), max_length=max_length
+                    ),
+                    {"db.statement.parameters": "('a"[:max_length]},
+                )
+
+    def test_batch(self):
+        rows = [("a", 1), ("b", 2)]
+        self.assertEqual(
+            get_parameters_attributes(rows, many=True),
+            {
+                "db.statement.parameters": str(rows),
+                "db.statement.parameters.batch_size": 2,
+                "db.statement.parameters.size": len(str(rows)),
+            },
+        )
+        self.assertEqual(
+            get_parameters_attributes([], many=True),
+            {
+                "db.statement.parameters": "[]",
+                "db.statement.parameters.batch_size": 0,
+                "db.statement.parameters.size": 2,
+            },
+        )
+
+    def test_large_batch(self):
+        rows = [(index, "value") for index in range(1000)]
+
+        attributes = get_parameters_attributes(rows, many=True)
+        self.assertEqual(
+            attributes["db.statement.parameters"],
+            str(rows[:10])[:-1] + ", ...]",
+        )
+        self.assertEqual(
+            attributes["db.statement.parameters.batch_size"], 1000
+        )
+        # estimated from the first 10 rows
+        self.assertEqual(
+            attributes["db.statement.parameters.size"], 12 * 1000 + 2 * 1000
+        )
+
+        attributes = get_parameters_attributes(rows, many=True, max_length=32)
+        self.assertEqual(
+            attributes["db.statement.parameters"],
+            "[(0, 'value'), (1, 'value'), ...",
+        )
+        self.assertEqual(
+            attributes["db.statement.parameters.size"], 12 * 1000 + 2 * 1000
+        )
+
+    def test_large_batch_size_estimated(self):
+        rows = [("a" * 10,)] * 5 + [("a" * 20,)] * 5 + [("a",)] * 90
+
+        attributes = get_parameters_attributes(rows, many=True)
+        self.assertEqual(
+            attributes["db.statement.parameters.size"],
+            # the average length of the first 10 rows is 20
+            20 * 100 + 2 * 100,
+        )
+
+    def test_batch_iterator_not_consumed(self):
+        rows = iter([("a", 1)])
+
+        attributes = get_parameters_attributes(rows, many=True)
+
+        self.assertEqual(attributes, {"db.statement.parameters": str(rows)})
+        self.assertEqual(list(rows), [("a", 1)])
@@ -136,6 +136,62 @@ class TestFunctionalAsyncPG(TestBase):
         )
         self.assertIs(StatusCode.UNSET, spans[2].status.status_code)
 
+    def test_instrumented_prepared_statement(self, *_, **__):
+        async def _prepare_and_fetch():
+            statement = await self._connection.prepare("SELECT $1::int;")
+            for value in range(3):
+                await statement.fetchval(value)
+
+        async_call(_prepare_and_fetch())
+        spans = self.memory_exporter.get_finished_spans()
+        self.assertEqual(len(spans), 3)
+        for span in spans:
+            self.check_span(span)
+            self.assertEqual(span.name, "SELECT $1::int;")
+            self.assertEqual(
+                span.attributes[SpanAttributes.DB_STATEMENT],
+                "SELECT $1::int;",
+            )
+
+    def test_instrumented_cursor(self, *_, **__):
+        async def _iterate_cursor():
+            async with self._connection.transaction():
+                async for _ in self._connection.cursor(
+                    "SELECT generate_series(1, 10);", prefetch=4
+                ):
+                    pass
+
+        async_call(_iterate_cursor())
+        spans = self.memory_exporter.get_finished_spans()
+        cursor_spans = [
+            span
+            for span in spans
+            if span.name == "SELECT generate_series(1, 10);"
+        ]
+        # the rows are fetched 4 by 4
+        self.assertEqual(len(cursor_spans), 3)
+        for span in cursor_spans:
+            self.check_span(span)
+
+    def test_instrumented_copy_records_to_table(self, *_, **__):
+        async def _copy_records():
+            async with self._connection.transaction():
+                await self._connection.execute(
+                    "CREATE TEMPORARY TABLE copy_test (id int);"
+                )
+                await self._connection.copy_records_to_table(
+                    "copy_test", records=[(1,), (2,)]
+                )
+
+        async_call(_copy_records())
+        spans = self.memory_exporter.get_finished_spans()
+        copy_spans = [span for span in spans if span.name == "COPY copy_test"]
+        self.assertEqual(len(copy_spans), 1)
+        self.check_span(copy_spans[0])
+        self.assertEqual(
+            copy_spans[0].attributes[SpanAttributes.DB_SQL_TABLE], "copy_test"
+        )
+
     def test_instrumented_method_doesnt_capture_parameters(self, *_, **__):
         async_call(self._connection.execute("SELECT $1;", "1"))
         spans = self.memory_exporter.get_finished_spans()
@@ -226,7 +282,13 @@ class TestFunctionalAsyncPG_CaptureParameters(TestBase):
             spans[0].attributes[SpanAttributes.DB_STATEMENT], "SELECT $1;"
         )
         self.assertEqual(
-            spans[0].attributes["db.statement.parameters"], "([['1'], ['2']],)"
+            spans[0].attributes["db.statement.parameters"], "[['1'], ['2']]"
+        )
+        self.assertEqual(
+            spans[0].attributes["db.statement.parameters.batch_size"], 2
+        )
+        self.assertEqual(
+            spans[0].attributes["db.statement.parameters.size"], 14
         )
 
     def test_instrumented_execute_interface_error_method(self, *_, **__):
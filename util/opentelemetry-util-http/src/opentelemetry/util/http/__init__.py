@@ -12,22 +12,97 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import lru_cache
 from os import environ
 from re import compile as re_compile
-from re import search
 from urllib.parse import urlparse, urlunparse
 
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]|()")
+
+
+def _parse_literal(pattern):
+    """Returns the string matched by a regex without any special character,
+    or ``None`` if the regex is not such a literal."""
+    chars = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            # escapes like \d or \b are character classes or assertions
+            if char.isalnum() or char == "_":
+                return None
+            chars.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char in _REGEX_METACHARACTERS:
+            return None
+        else:
+            chars.append(char)
+    if escaped:
+        return None
+    return "".join(chars)
+
 
 class ExcludeList:
-    """Class to exclude certain paths (given as a list of regexes) from tracing requests"""
+    """Class to exclude certain paths (given as a list of regexes) from tracing requests
+
+    Regexes matching a literal string, optionally anchored with ``^`` or
+    ``$``, are checked with string comparisons and only the other ones are
+    combined in a single regex. The decisions for the most recently checked
+    urls are cached.
+    """
+
+    _MAX_CACHE_SIZE = 1024
 
     def __init__(self, excluded_urls):
         self._excluded_urls = excluded_urls
-        if self._excluded_urls:
-            self._regex = re_compile("|".join(excluded_urls))
+        self._exact = set()
+        self._prefixes = []
+        self._suffixes = []
+        self._substrings = []
+        patterns = []
+        for excluded_url in excluded_urls or ():
+            anchored_start = excluded_url.startswith("^")
+            # a $ preceded by an odd number of backslashes is escaped
+            anchored_end = (
+                excluded_url.endswith("$")
+                and (len(excluded_url) - len(excluded_url[:-1].rstrip("\\")))
+                % 2
+                == 1
+            )
+            literal = _parse_literal(
+                excluded_url[
+                    int(anchored_start) : len(excluded_url) - int(anchored_end)
+                ]
+            )
+            if literal is None:
+                patterns.append(excluded_url)
+            elif anchored_start and anchored_end:
+                self._exact.add(literal)
+            elif anchored_start:
+                self._prefixes.append(literal)
+            elif anchored_end:
+                self._suffixes.append(literal)
+            else:
+                self._substrings.append(literal)
+        self._prefixes = tuple(self._prefixes)
+        self._suffixes = tuple(self._suffixes)
+        self._regex = re_compile("|".join(patterns)) if patterns else None
+        self._url_disabled = lru_cache(maxsize=self._MAX_CACHE_SIZE)(
+            self._match
+        )
+
+    def _match(self, url: str) -> bool:
+        return (
+            url in self._exact
+            or url.startswith(self._prefixes)
+            or url.endswith(self._suffixes)
+            or any(substring in url for substring in self._substrings)
+            or (self._regex is not None and bool(self._regex.search(url)))
+        )
 
     def url_disabled(self, url: str) -> bool:
-        return bool(self._excluded_urls and search(self._regex, url))
+        return bool(self._excluded_urls) and self._url_disabled(url)
 
 
 _root = r"OTEL_PYTHON_{}"
@@ -0,0 +1,54 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry.util.http import ExcludeList
+
+URL_COUNT = 10000
+
+# 50 exclusion patterns: exact urls, prefixes, suffixes, substrings and a few
+# actual regexes
+excluded_urls = (
+    ["^https://api.example.com/internal/%d$" % index for index in range(10)]
+    + ["^https://admin%d.example.com/" % index for index in range(10)]
+    + ["/static/asset%d.css$" % index for index in range(10)]
+    + ["healthcheck%d" % index for index in range(10)]
+    + [r"/api/v%d/users/\d+/avatar" % index for index in range(5)]
+    + [r"^https?://metrics%d\." % index for index in range(5)]
+)
+
+# a thousand distinct urls requested several times, as seen by a service
+urls = [
+    "https://api.example.com/api/v%d/%s/%d"
+    % (key % 5, ("users", "orders", "items")[key % 3], key)
+    for key in (index % 1000 for index in range(URL_COUNT))
+]
+
+exclude_list = ExcludeList(excluded_urls)
+
+
+def test_url_disabled(benchmark):
+    def check_urls():
+        for url in urls:
+            exclude_list.url_disabled(url)
+
+    benchmark(check_urls)
+
+
+def test_url_disabled_uncached(benchmark):
+    # pylint: disable=protected-access
+    def check_urls():
+        for url in urls:
+            exclude_list._match(url)
+
+    benchmark(check_urls)
@@ -0,0 +1,103 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import unittest
+
+from opentelemetry.util.http import ExcludeList, parse_excluded_urls
+
+
+class TestExcludeList(unittest.TestCase):
+    def test_empty(self):
+        self.assertFalse(ExcludeList([]).url_disabled("http://host/path"))
+        self.assertFalse(
+            parse_excluded_urls("").url_disabled("http://host/path")
+        )
+
+    def test_literals(self):
+        exclude_list = parse_excluded_urls(
+            "^http://host/exact$,^https://host/prefix,/suffix$,healthcheck"
+        )
+        # pylint: disable=protected-access
+        self.assertIsNone(exclude_list._regex)
+
+        self.assertTrue(exclude_list.url_disabled("http://host/exact"))
+        self.assertFalse(exclude_list.url_disabled("http://host/exact/"))
+        self.assertTrue(exclude_list.url_disabled("https://host/prefix/1"))
+        self.assertFalse(exclude_list.url_disabled("http://host/prefix"))
+        self.assertTrue(exclude_list.url_disabled("http://host/a/suffix"))
+        self.assertFalse(exclude_list.url_disabled("http://host/suffix/a"))
+        self.assertTrue(exclude_list.url_disabled("http://a/healthcheck/b"))
+        self.assertFalse(exclude_list.url_disabled("http://host/health"))
+
+    def test_escaped_literals(self):
+        exclude_list = ExcludeList([r"^http://host\.com/\?a$", r"cost\$"])
+        # pylint: disable=protected-access
+        self.assertIsNone(exclude_list._regex)
+
+        self.assertTrue(exclude_list.url_disabled("http://host.com/?a"))
+        self.assertFalse(exclude_list.url_disabled("http://hostxcom/?a"))
+        self.assertTrue(exclude_list.url_disabled("http://host/cost$/a"))
+
+    def test_patterns(self):
+        exclude_list = ExcludeList(
+            [r"/users/\d+$", "^https?://internal", "ping", r"price\$$"]
+        )
+
+        self.assertTrue(exclude_list.url_disabled("http://host/users/42"))
+        self.assertFalse(exclude_list.url_disabled("http://host/users/me"))
+        self.assertTrue(exclude_list.url_disabled("https://internal/a"))
+        self.assertTrue(exclude_list.url_disabled("http://internal/a"))
+        self.assertTrue(exclude_list.url_disabled("http://host/ping"))
+        self.assertTrue(exclude_list.url_disabled("http://host/price$"))
+        self.assertFalse(exclude_list.url_disabled("http://host/price"))
+
+    def test_same_result_as_regex(self):
+        excluded_urls = [
+            "^http://host/exact$",
+            "^https://host/prefix",
+            "/suffix$",
+            "healthcheck",
+            r"/users/\d+",
+            r"\\$",
+            "",
+        ]
+        urls = [
+            "http://host/exact",
+            "https://host/prefix/users/1",
+            "http://host/suffix",
+            "http://host/path\\",
+            "http://host/other",
+        ]
+
+        for excluded_url in excluded_urls:
+            exclude_list = ExcludeList([excluded_url])
+            for url in urls:
+                with self.subTest(excluded_url=excluded_url, url=url):
+                    self.assertEqual(
+                        exclude_list.url_disabled(url),
+                        bool(re.search(excluded_url, url)),
+                    )
+
+    def test_cached_decision(self):
+        exclude_list = ExcludeList([r"/users/\d+"])
+
+        self.assertTrue(exclude_list.url_disabled("http://host/users/1"))
+        self.assertTrue(exclude_list.url_disabled("http://host/users/1"))
+        self.assertFalse(exclude_list.url_disabled("http://host/users/me"))
+
+        # pylint: disable=protected-access
+        cache_info = exclude_list._url_disabled.cache_info()
+        self.assertEqual(cache_info.hits, 1)
+        self.assertEqual(cache_info.misses, 2)